@@ -7,7 +7,7 @@ from django.db.models.expressions import RawSQL
 from django.db.models.functions import Cast, Now
 
 from administration.helpers import validators as admin_validators
-from administration.models import IpBlacklist
+from administration.models import IpBlacklist, MediaGarbageCollectionRun
 
 
 class IpBlacklistAdminForm(forms.ModelForm):
@@ -136,3 +136,30 @@ class BlackListAdmin(admin.ModelAdmin):
 
     is_network_or_ip.short_description = 'IP or Network'
     is_network_or_ip.admin_order_field = RawSQL("ip = Cast(HOST(ip) as inet)", params=())
+
+
+@admin.register(MediaGarbageCollectionRun)
+class MediaGarbageCollectionRunAdmin(admin.ModelAdmin):
+    """
+    Read only admin for statistics of media root garbage collector runs.
+    """
+    date_hierarchy = 'started_at'
+    list_display = (
+        'started_at',
+        'finished_at',
+        'is_dry_run',
+        'phase',
+        'images_deleted',
+        'files_scanned',
+        'files_deleted',
+        'bytes_deleted',
+        'folders_deleted',
+    )
+    list_filter = ('is_dry_run', 'phase',)
+    ordering = ('-started_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
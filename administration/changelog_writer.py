@@ -0,0 +1,151 @@
+import functools
+import operator
+from typing import List
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+
+from administration.models import EntriesChangeLog, OperationTypeChoices
+
+IMMEDIATE = 'immediate'
+ON_COMMIT = 'on_commit'
+CELERY = 'celery'
+
+FULL = 'full'
+DELTA = 'delta'
+
+#  Object can have only one entry of each of these operations (see 'multiple_delete_or_update_exclusion').
+UNIQUE_OPERATIONS = (OperationTypeChoices.DELETE, OperationTypeChoices.CREATE, )
+
+
+class ChangeLogBuffer:
+    """
+    Collects 'EntriesChangeLog' entries of one transaction (or savepoint) and writes them on commit
+    in one batch. Registered as 'on_commit' callback, therefore discarded along with rolled back
+    transaction or savepoint.
+    """
+
+    def __init__(self, using: str) -> None:
+        self.using = using
+        self.entries = []
+
+    def __call__(self) -> None:
+        flush(self.entries, self.using)
+
+
+def add_entry(entry: EntriesChangeLog, using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Adds entry to the buffer of current transaction. Outside of transaction entry is written at once.
+    """
+    connection = transaction.get_connection(using)
+
+    if settings.CHANGELOG_WRITE_MODE == IMMEDIATE or not connection.in_atomic_block:
+        return flush([entry], using)
+
+    #  Buffer is bound to the innermost savepoint in order to be discarded together with it.
+    savepoint_ids = set(connection.savepoint_ids)
+    for callback_savepoint_ids, callback in connection.run_on_commit:
+        if isinstance(callback, ChangeLogBuffer) and callback_savepoint_ids == savepoint_ids:
+            callback.entries.append(entry)
+            return None
+
+    buffer = ChangeLogBuffer(using)
+    buffer.entries.append(entry)
+    transaction.on_commit(buffer, using=using)
+
+
+def flush(entries: List[EntriesChangeLog], using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Writes entries with one query or hands them over to Celery task.
+    """
+    if settings.CHANGELOG_WRITE_MODE == CELERY:
+        from administration.tasks import write_changelog_entries
+
+        fields = [
+            field.attname for field in EntriesChangeLog._meta.concrete_fields if not field.primary_key
+        ]
+        write_changelog_entries.delay(
+            [{field: getattr(entry, field) for field in fields} for entry in entries],
+            using,
+        )
+    else:
+        write_entries(entries, using)
+
+
+def exclude_duplicates(entries: List[EntriesChangeLog], using: str = DEFAULT_DB_ALIAS) -> List[EntriesChangeLog]:
+    """
+    Leaves out 'DELETE' and 'CREATE' entries of objects which already have such entry stored or
+    earlier in the batch. Should be called under locks of the objects.
+    """
+    keys = {
+        (entry.content_type_id, entry.object_id, entry.operation_type)
+        for entry in entries if entry.operation_type in UNIQUE_OPERATIONS
+    }
+    if not keys:
+        return entries
+
+    condition = functools.reduce(
+        operator.or_,
+        (
+            Q(content_type_id=content_type_id, object_id=object_id, operation_type=operation_type)
+            for content_type_id, object_id, operation_type in keys
+        ),
+    )
+    seen = set(
+        EntriesChangeLog.objects.db_manager(using).filter(condition).values_list(
+            'content_type_id', 'object_id', 'operation_type',
+        ))
+
+    unique_entries = []
+    for entry in entries:
+        key = (entry.content_type_id, entry.object_id, entry.operation_type)
+        if entry.operation_type in UNIQUE_OPERATIONS:
+            if key in seen:
+                continue
+            seen.add(key)
+        unique_entries.append(entry)
+
+    return unique_entries
+
+
+def write_entries(entries: List[EntriesChangeLog], using: str = DEFAULT_DB_ALIAS) -> List[EntriesChangeLog]:
+    """
+    Inserts entries and sends 'post_save' for each of them as 'bulk_create' does not. Returns
+    written entries.
+    Uniqueness of 'DELETE' and 'CREATE' entries is enforced by trigger on partitioned table which
+    'ON CONFLICT' does not take into account, therefore duplicates are left out beforehand under
+    the same advisory locks the trigger takes. They are skipped as changes they describe are
+    already committed.
+    In 'delta' storage mode states are encoded under the locks against previous states of the same
+    objects by access time (see 'encode_deltas').
+    """
+    manager = EntriesChangeLog.objects.db_manager(using)
+    is_delta = settings.CHANGELOG_STORAGE_MODE == DELTA
+    locked_keys = {
+        (entry.content_type_id, entry.object_id)
+        for entry in entries if is_delta or entry.operation_type in UNIQUE_OPERATIONS
+    }
+
+    if locked_keys:
+        with transaction.atomic(using=using):
+            manager.lock_objects(locked_keys)
+            entries = exclude_duplicates(entries, using)
+            if is_delta:
+                manager.encode_deltas(entries)
+            manager.bulk_create(entries)
+    else:
+        manager.bulk_create(entries)
+
+    for entry in entries:
+        post_save.send(
+            sender=EntriesChangeLog,
+            instance=entry,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=using,
+        )
+
+    return entries
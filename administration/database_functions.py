@@ -0,0 +1,43 @@
+from django.db.models import F, Func, JSONField
+
+
+class FullState(Func):
+    """
+    Returns full state of 'EntriesChangeLog' entry. Keyframe entries (keyframe_distance = 0) store
+    full state, other entries store only changed fields, so their state is merged from keyframe and
+    following deltas up to the entry.
+
+    CREATE OR REPLACE FUNCTION changelog_full_state(
+        v_content_type_id INTEGER, v_object_id INTEGER, v_access_time TIMESTAMPTZ, v_id INTEGER,
+        v_state JSONB, v_keyframe_distance INTEGER) RETURNS JSONB AS
+    $$
+    SELECT CASE WHEN v_keyframe_distance = 0 THEN v_state ELSE (
+        SELECT jsonb_merge_agg(versions.state ORDER BY versions.access_time, versions.id)
+        FROM (
+            SELECT state, access_time, id FROM administration_entrieschangelog
+            WHERE content_type_id = v_content_type_id AND object_id = v_object_id
+                AND (access_time, id) <= (v_access_time, v_id)
+                AND (access_time, id) >= ALL (
+                    SELECT access_time, id FROM administration_entrieschangelog
+                    WHERE content_type_id = v_content_type_id AND object_id = v_object_id
+                        AND keyframe_distance = 0 AND (access_time, id) <= (v_access_time, v_id)
+                    ORDER BY access_time DESC, id DESC
+                    LIMIT 1)
+        ) AS versions) END;
+    $$
+    LANGUAGE sql STABLE;
+    """
+    function = 'changelog_full_state'
+    arity = 6
+    output_field = JSONField()
+
+    def __init__(self, **extra):
+        super().__init__(
+            F('content_type_id'),
+            F('object_id'),
+            F('access_time'),
+            F('pk'),
+            F('state'),
+            F('keyframe_distance'),
+            **extra,
+        )
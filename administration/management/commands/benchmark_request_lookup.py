@@ -0,0 +1,63 @@
+import inspect
+import timeit
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from series import request_context
+
+
+def stack_lookup():
+    """
+    Former way of fetching request in 'create_log' signal handler.
+    """
+    for frame_record in reversed(inspect.stack()):
+        if frame_record.function == 'get_response':
+            return frame_record.frame.f_locals['request']
+
+
+def context_lookup():
+    """
+    Current way of fetching request user in 'create_log' signal handler.
+    """
+    return request_context.get_current_user_id()
+
+
+class Command(BaseCommand):
+    """
+    Measures per save overhead of request lookup in 'create_log' signal handler.
+    """
+    help = 'Compares request lookup via inspect.stack() with lookup via request context.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=60,
+            help='Number of frames between "get_response" and signal handler. About 60 in real request.',
+        )
+        parser.add_argument(
+            '--number',
+            type=int,
+            default=200,
+            help='Number of lookups to measure.',
+        )
+
+    def handle(self, *args, **options):
+        depth, number = options['depth'], options['number']
+        request = SimpleNamespace(user=SimpleNamespace(pk=1, is_authenticated=True))
+
+        def descend(level, lookup):
+            if level:
+                return descend(level - 1, lookup)
+            return timeit.timeit(lookup, number=number) / number
+
+        def get_response(request, lookup):
+            with request_context.bind(request=request):
+                return descend(depth, lookup)
+
+        results = {lookup.__name__: get_response(request, lookup) for lookup in (stack_lookup, context_lookup)}
+
+        for name, seconds in results.items():
+            self.stdout.write(f'{name}: {seconds * 10 ** 6:.2f} µs per save')
+        self.stdout.write(f'speedup: x{results["stack_lookup"] / results["context_lookup"]:.0f}')
@@ -1,6 +1,20 @@
-from django.db import models
-from django.db.models import F
-from django.db.models.functions import Now
+import datetime
+import functools
+import gzip
+import json
+import operator
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models import F, Q, Subquery, Window
+from django.db.models.functions import Coalesce, Lag, Lead, Now
+from django.utils import timezone
+
+from administration.database_functions import FullState
+from administration.encoders import CustomEncoder
+from users.database_functions import JSONDiff
 
 
 class IpBlacklistManager(models.Manager):
@@ -19,3 +33,282 @@ class IpBlacklistQueryset(models.QuerySet):
         Select only 'active' blacklist records, whose stretch is still has not ran out.
         """
         return self.filter(record_time__gt=Now() - F('stretch'))
+
+
+class EntriesChangeLogQueryset(models.QuerySet):
+    """
+    EntriesChangeLog custom queryset.
+    """
+    def with_full_state(self) -> models.QuerySet:
+        """
+        Annotates entries with reconstructed full state in 'full_state' attribute.
+        """
+        return self.annotate(full_state=FullState())
+
+    def around(self, pk: int) -> models.QuerySet:
+        """
+        Narrows entries down to entry with given pk and its closest previous and next entries.
+        Neighbours are sought by index on ('content_type', 'object_id', 'access_time'), therefore
+        number of selected entries does not depend on length of history.
+        """
+        access_time = Subquery(self.filter(pk=pk).values('access_time')[:1])
+        prev_access_time = Subquery(
+            self.filter(access_time__lt=access_time).order_by('-access_time').values('access_time')[:1]
+        )
+        next_access_time = Subquery(
+            self.filter(access_time__gt=access_time).order_by('access_time').values('access_time')[:1]
+        )
+        return self.filter(
+            access_time__gte=Coalesce(prev_access_time, access_time),
+            access_time__lte=Coalesce(next_access_time, access_time),
+        )
+
+    def with_neighbour_states(self) -> models.QuerySet:
+        """
+        Annotates entries with full states of previous and next entries of the same object in
+        'prev_state' and 'next_state' and with fields changed between them in 'prev_changes' and
+        'next_changes'. Window is computed after 'WHERE' clause, so neighbours are sought among
+        selected entries only.
+        """
+        window = dict(
+            partition_by=(F('content_type_id'), F('object_id'), ),
+            order_by=(F('access_time').asc(), F('pk').asc(), ),
+        )
+        return self.with_full_state().annotate(
+            prev_state=Window(Lag('full_state'), **window),
+            next_state=Window(Lead('full_state'), **window),
+        ).annotate(
+            prev_changes=JSONDiff(F('full_state'), F('prev_state')),
+            next_changes=JSONDiff(F('next_state'), F('full_state')),
+        )
+
+
+class EntriesChangeLogManager(models.Manager):
+    """
+    EntriesChangeLog model custom manager.
+    """
+    def get_full_state(self, pk: int) -> dict:
+        """
+        Reconstructs full state of an object at the moment of given entry.
+        """
+        return self.filter(pk=pk).with_full_state().values_list('full_state', flat=True).get()
+
+    def get_state_at(self, content_type_id: int, object_id: int, moment) -> Optional[dict]:
+        """
+        Reconstructs full state of an object at given moment of time. Returns None if object had not
+        any entries before this moment.
+        """
+        return self.filter(
+            content_type_id=content_type_id,
+            object_id=object_id,
+            access_time__lte=moment,
+        ).order_by('-access_time', '-pk').with_full_state().values_list('full_state', flat=True).first()
+
+    def lock_objects(self, keys: Iterable[Tuple[int, int]]) -> None:
+        """
+        Takes transaction level advisory locks on (content_type_id, object_id) pairs in order to
+        serialize concurrent writes of history of the same objects.
+        """
+        with connections[self.db].cursor() as cursor:
+            for content_type_id, object_id in sorted(keys):
+                cursor.execute('SELECT pg_advisory_xact_lock(%s, %s);', (content_type_id, object_id, ))
+
+    def encode_deltas(self, entries: List[models.Model], keyframe_interval: int = None) -> None:
+        """
+        Replaces full states of not saved yet entries with changed fields only. Each
+        'keyframe_interval' entry of an object keeps full state. Entries take place in history of
+        their objects by (access_time, pk), after stored entries with the same access time and in
+        order of the list among themselves.
+        Entries are stamped on change but written on commit, therefore entry of transaction committed
+        later can precede already stored entries. Stored entry which follows such an entry is turned
+        into keyframe, as its delta was made against other previous state.
+        Should be called under locks of the objects and all entries should be inserted.
+        """
+        keyframe_interval = keyframe_interval or settings.CHANGELOG_KEYFRAME_INTERVAL
+        #  {(content_type_id, object_id): earliest access time of entries}
+        keys = {}
+        for entry in entries:
+            key = (entry.content_type_id, entry.object_id)
+            keys[key] = min(keys.get(key, entry.access_time), entry.access_time)
+        if not keys:
+            return None
+
+        def condition(lookup: str) -> Q:
+            return functools.reduce(
+                operator.or_,
+                (
+                    Q(content_type_id=content_type_id, object_id=object_id, **{lookup: access_time})
+                    for (content_type_id, object_id), access_time in keys.items()
+                ),
+            )
+
+        previous_entries = self.filter(condition('access_time__lte')).order_by(
+            'content_type_id', 'object_id', '-access_time', '-pk',
+        ).distinct(
+            'content_type_id', 'object_id',
+        ).with_full_state().values_list(
+            'content_type_id', 'object_id', 'full_state', 'keyframe_distance',
+        )
+        previous = {
+            (content_type_id, object_id): (full_state, distance)
+            for content_type_id, object_id, full_state, distance in previous_entries
+        }
+
+        #  History of each object from the earliest entry on, stored entries go first on equal access time.
+        timelines = {key: [] for key in keys}
+        stored_entries = self.filter(condition('access_time__gt')).with_full_state().values_list(
+            'pk', 'content_type_id', 'object_id', 'access_time', 'full_state', 'keyframe_distance',
+        )
+        for pk, content_type_id, object_id, access_time, full_state, distance in stored_entries:
+            timelines[(content_type_id, object_id)].append(((access_time, 0, pk), (pk, full_state, distance)))
+        for position, entry in enumerate(entries):
+            timelines[(entry.content_type_id, entry.object_id)].append(((entry.access_time, 1, position), entry))
+
+        keyframes = []
+        for key, timeline in timelines.items():
+            previous_state, distance = previous.get(key, (None, None))
+            follows_new_entry = False
+            for (access_time, is_new, _), item in sorted(timeline, key=operator.itemgetter(0)):
+                if not is_new:
+                    pk, previous_state, distance = item
+                    if follows_new_entry:
+                        keyframes.append((pk, access_time, previous_state))
+                        distance = 0
+                    follows_new_entry = False
+                    continue
+
+                #  States are compared as they would be stored in JSON.
+                full_state = json.loads(json.dumps(item.state, cls=CustomEncoder))
+                if previous_state is None or distance + 1 >= keyframe_interval:
+                    item.state, item.keyframe_distance = full_state, 0
+                else:
+                    item.state = {
+                        field: value for field, value in full_state.items()
+                        if field not in previous_state or previous_state[field] != value
+                    }
+                    item.keyframe_distance = distance + 1
+                previous_state, distance = full_state, item.keyframe_distance
+                follows_new_entry = True
+
+        for pk, access_time, full_state in keyframes:
+            #  Access time leads to partition of the entry.
+            self.filter(pk=pk, access_time=access_time).update(state=full_state, keyframe_distance=0)
+
+    @staticmethod
+    def add_months(month: datetime.date, months: int) -> datetime.date:
+        """
+        Returns first day of the month which is 'months' months away from given month.
+        """
+        year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+        return datetime.date(year, month_index + 1, 1)
+
+    def get_partitions(self) -> List[Tuple[str, datetime.date]]:
+        """
+        Returns names and months of monthly partitions in chronological order. Default partition
+        is not included.
+        """
+        prefix = f'{self.model._meta.db_table}_p'
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT partition.relname
+                FROM pg_inherits JOIN pg_class AS partition ON partition.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = %s::regclass AND partition.relname LIKE %s
+                ORDER BY partition.relname;
+                """,
+                (self.model._meta.db_table, f'{prefix}%', ))
+            names = [name for name, in cursor.fetchall()]
+
+        return [
+            (name, datetime.datetime.strptime(name[len(prefix):], '%Y_%m').date()) for name in names
+        ]
+
+    def create_partitions(self, months_ahead: int = None) -> List[str]:
+        """
+        Creates missing monthly partitions from current month up to 'months_ahead' months ahead.
+        Entries of these months are moved to them from default partition. Returns names of
+        created partitions.
+        """
+        months_ahead = settings.CHANGELOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+        current_month = timezone.now().date().replace(day=1)
+        created = []
+
+        with transaction.atomic(using=self.db):
+            #  Fires deferred foreign key checks, otherwise table can't be altered in this transaction.
+            connections[self.db].check_constraints()
+            with connections[self.db].cursor() as cursor:
+                for months in range(months_ahead + 1):
+                    cursor.execute(
+                        'SELECT changelog_create_partition(%s);',
+                        (self.add_months(current_month, months), ))
+                    [name] = cursor.fetchone()
+                    if name is not None:
+                        created.append(name)
+
+        return created
+
+    def archive_partition(self, name: str, month: datetime.date, directory: str) -> str:
+        """
+        Detaches partition, exports its entries to gzip compressed csv file in given directory and
+        drops it. Returns path of the file. In 'delta' storage mode states of later entries are
+        reconstructed from entries being archived, therefore first later entry of each object
+        becomes keyframe beforehand.
+        """
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        partition = connection.ops.quote_name(name)
+        path = os.path.join(directory, f'{name}.csv.gz')
+        os.makedirs(directory, exist_ok=True)
+
+        with transaction.atomic(using=self.db):
+            connection.check_constraints()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    UPDATE {table} AS log
+                    SET
+                        state = changelog_full_state(
+                            log.content_type_id, log.object_id, log.access_time,
+                            log.id, log.state, log.keyframe_distance
+                        ),
+                        keyframe_distance = 0
+                    FROM (SELECT DISTINCT content_type_id, object_id FROM {partition}) AS objects
+                    CROSS JOIN LATERAL (
+                        SELECT later.id, later.access_time
+                        FROM {table} AS later
+                        WHERE
+                            later.content_type_id = objects.content_type_id AND
+                            later.object_id = objects.object_id AND
+                            later.access_time >= %s
+                        ORDER BY later.access_time, later.id
+                        LIMIT 1
+                    ) AS first_entries
+                    WHERE
+                        log.id = first_entries.id AND
+                        log.access_time = first_entries.access_time AND
+                        log.keyframe_distance > 0;
+                    """,
+                    (self.add_months(month, 1), ))
+                cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {partition};')
+
+                with gzip.open(f'{path}.part', 'wb') as file:
+                    cursor.copy_expert(f'COPY {partition} TO STDOUT WITH (FORMAT csv, HEADER);', file)
+                os.replace(f'{path}.part', path)
+
+                cursor.execute(f'DROP TABLE {partition};')
+
+        return path
+
+    def archive_old_partitions(self, keep_months: int = None, directory: str = None) -> List[str]:
+        """
+        Archives partitions older than 'keep_months' months starting from the oldest one.
+        Returns paths of the archive files.
+        """
+        keep_months = settings.CHANGELOG_RETENTION_MONTHS if keep_months is None else keep_months
+        directory = directory or settings.CHANGELOG_ARCHIVE_DIR
+        threshold = self.add_months(timezone.now().date().replace(day=1), -keep_months)
+
+        return [
+            self.archive_partition(name, month, directory)
+            for name, month in self.get_partitions() if month < threshold
+        ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1 on 2026-10-17 07:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    dependencies = [
+        ('administration', '0010_auto_20200830_1225'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='entrieschangelog',
+            index=models.Index(fields=['content_type', 'object_id', 'access_time'], name='object_access_time_index'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.1 on 2026-10-17 07:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0011_object_access_time_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='entrieschangelog',
+            name='access_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='access_time'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.1 on 2026-10-17 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    table_name = 'administration_entrieschangelog'
+    aggregate_name = 'jsonb_merge_agg'
+    function_name = 'changelog_full_state'
+
+    dependencies = [
+        ('administration', '0012_changelog_access_time_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entrieschangelog',
+            name='keyframe_distance',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Number of entries since the last entry with full state.'),
+        ),
+        migrations.RunSQL(sql=
+                          f"""
+                            CREATE AGGREGATE {aggregate_name}(JSONB) (
+                                SFUNC = jsonb_concat,
+                                STYPE = JSONB,
+                                INITCOND = '{{}}'
+                            );
+
+                            CREATE OR REPLACE FUNCTION {function_name}(
+                                v_content_type_id INTEGER,
+                                v_object_id INTEGER,
+                                v_access_time TIMESTAMPTZ,
+                                v_id INTEGER,
+                                v_state JSONB,
+                                v_keyframe_distance INTEGER
+                            ) RETURNS JSONB AS
+                            $full_state$
+                                SELECT CASE WHEN v_keyframe_distance = 0 THEN v_state ELSE (
+                                    SELECT
+                                        {aggregate_name}(versions.state ORDER BY versions.access_time, versions.id)
+                                    FROM (
+                                        SELECT state, access_time, id
+                                        FROM {table_name}
+                                        WHERE
+                                            content_type_id = v_content_type_id AND
+                                            object_id = v_object_id AND
+                                            (access_time, id) <= (v_access_time, v_id)
+                                        ORDER BY access_time DESC, id DESC
+                                        LIMIT v_keyframe_distance + 1
+                                    ) AS versions) END;
+                            $full_state$
+                                LANGUAGE sql STABLE;
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP FUNCTION IF EXISTS {function_name};
+                            DROP AGGREGATE IF EXISTS {aggregate_name}(JSONB);
+                            """
+                          ),
+    ]
@@ -0,0 +1,185 @@
+from django.db import migrations
+
+
+def collect_definitions_sql(source: str, target: str) -> str:
+    """
+    Returns SQL which saves definitions of indexes and foreign keys of table 'source' (except unique
+    ones) retargeted to table 'target' in temporary table.
+    """
+    return f"""
+        CREATE TEMPORARY TABLE changelog_definitions ON COMMIT DROP AS
+            SELECT regexp_replace(
+                pg_get_indexdef(indexrelid), ' ON (ONLY )?(\\S+\\.)?{source} ', ' ON {target} '
+            ) AS definition
+            FROM pg_index
+            WHERE indrelid = '{source}'::regclass AND NOT indisunique
+            UNION ALL
+            SELECT format('ALTER TABLE {target} ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid))
+            FROM pg_constraint
+            WHERE conrelid = '{source}'::regclass AND contype = 'f';
+        """
+
+
+def apply_definitions_sql(source: str, target: str) -> str:
+    """
+    Returns SQL which drops table 'source' and recreates its saved indexes and foreign keys on table
+    'target'. Primary key sequence is handed over to 'target'.
+    """
+    return f"""
+        DO $apply_definitions$
+        DECLARE
+            v_sequence TEXT := pg_get_serial_sequence('{source}', 'id');
+            v_definition TEXT;
+        BEGIN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', v_sequence);
+            DROP TABLE {source};
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY {target}.id', v_sequence);
+
+            FOR v_definition IN SELECT definition FROM changelog_definitions LOOP
+                EXECUTE v_definition;
+            END LOOP;
+        END;
+        $apply_definitions$;
+        DROP TABLE changelog_definitions;
+        """
+
+
+class Migration(migrations.Migration):
+    """
+    Turns 'EntriesChangeLog' table into monthly range partitioned on 'access_time' table.
+    Primary key of partitioned table has to include partition key, therefore it is (id, access_time).
+    Unique constraint 'multiple_delete_or_update_exclusion' can't be global on partitioned table and
+    is enforced by trigger which raises the same error. Constraint is removed from model state as
+    'ON CONFLICT' does not take the trigger into account.
+    """
+    atomic = True
+
+    table_name = 'administration_entrieschangelog'
+    old_table_name = 'administration_entrieschangelog_old'
+    default_partition_name = 'administration_entrieschangelog_default'
+    create_partition_function_name = 'changelog_create_partition'
+    unique_function_name = 'changelog_unique_operation'
+    trigger_name = 'changelog_unique_operation'
+    constraint_name = 'multiple_delete_or_update_exclusion'
+    months_ahead = 3
+
+    dependencies = [
+        ('administration', '0013_changelog_keyframe_distance'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=
+                          f"""
+                            ALTER TABLE {table_name} RENAME TO {old_table_name};
+                            CREATE TABLE {table_name} (LIKE {old_table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+                                PARTITION BY RANGE (access_time);
+                            {collect_definitions_sql(old_table_name, table_name)}
+                            CREATE TABLE {default_partition_name} PARTITION OF {table_name} DEFAULT;
+
+                            -- Creates partition for the month of 'v_month' if it does not exist yet.
+                            -- Rows of this month are moved to it from default partition.
+                            CREATE OR REPLACE FUNCTION {create_partition_function_name}(
+                                v_month TIMESTAMPTZ
+                            ) RETURNS TEXT AS
+                            $create_partition$
+                            DECLARE
+                                v_lower TIMESTAMPTZ := date_trunc('month', v_month);
+                                v_upper TIMESTAMPTZ := date_trunc('month', v_month) + INTERVAL '1 month';
+                                v_name TEXT := '{table_name}_p' || to_char(v_lower, 'YYYY_MM');
+                            BEGIN
+                                IF to_regclass(v_name) IS NOT NULL THEN
+                                    RETURN NULL;
+                                END IF;
+
+                                EXECUTE format(
+                                    'CREATE TABLE %I (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                                    v_name
+                                );
+                                EXECUTE format(
+                                    'WITH moved AS ('
+                                    '   DELETE FROM {default_partition_name} '
+                                    '   WHERE access_time >= %L AND access_time < %L RETURNING *'
+                                    ') INSERT INTO %I SELECT * FROM moved',
+                                    v_lower, v_upper, v_name
+                                );
+                                EXECUTE format(
+                                    'ALTER TABLE {table_name} ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                                    v_name, v_lower, v_upper
+                                );
+                                RETURN v_name;
+                            END;
+                            $create_partition$
+                                LANGUAGE plpgsql;
+
+                            SELECT {create_partition_function_name}(month)
+                            FROM generate_series(
+                                date_trunc('month', coalesce((SELECT min(access_time) FROM {old_table_name}), now())),
+                                date_trunc('month', now()) + INTERVAL '{months_ahead} months',
+                                INTERVAL '1 month'
+                            ) AS month;
+
+                            INSERT INTO {table_name} SELECT * FROM {old_table_name};
+                            {apply_definitions_sql(old_table_name, table_name)}
+                            ALTER TABLE {table_name} ADD PRIMARY KEY (id, access_time);
+
+                            CREATE OR REPLACE FUNCTION {unique_function_name}() RETURNS TRIGGER AS
+                            $unique_operation$
+                            BEGIN
+                                -- prevent concurrent inserts from multiple transactions
+                                PERFORM pg_advisory_xact_lock(NEW.content_type_id, NEW.object_id);
+
+                                IF EXISTS (
+                                    SELECT 1
+                                    FROM {table_name}
+                                    WHERE
+                                        content_type_id = NEW.content_type_id AND
+                                        object_id = NEW.object_id AND
+                                        operation_type = NEW.operation_type AND
+                                        (id, access_time) <> (NEW.id, NEW.access_time)
+                                ) THEN
+                                    RAISE EXCEPTION USING
+                                        ERRCODE = 'unique_violation',
+                                        CONSTRAINT = '{constraint_name}',
+                                        MESSAGE = 'duplicate key value violates unique constraint "{constraint_name}"',
+                                        DETAIL = format(
+                                            'Key (object_id, operation_type, content_type_id)=(%s, %s, %s) already exists.',
+                                            NEW.object_id, NEW.operation_type, NEW.content_type_id
+                                        );
+                                END IF;
+
+                                RETURN NULL;
+                            END;
+                            $unique_operation$
+                                LANGUAGE plpgsql;
+
+                            CREATE TRIGGER {trigger_name}
+                                AFTER INSERT OR UPDATE OF content_type_id, object_id, operation_type
+                                ON {table_name}
+                                FOR EACH ROW
+                                WHEN (NEW.operation_type IN ('DELETE', 'CREATE'))
+                                EXECUTE PROCEDURE {unique_function_name}();
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
+                            DROP FUNCTION IF EXISTS {unique_function_name};
+                            DROP FUNCTION IF EXISTS {create_partition_function_name};
+                            ALTER TABLE {table_name} RENAME TO {old_table_name};
+                            CREATE TABLE {table_name} (LIKE {old_table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+                            {collect_definitions_sql(old_table_name, table_name)}
+                            INSERT INTO {table_name} SELECT * FROM {old_table_name};
+                            {apply_definitions_sql(old_table_name, table_name)}
+                            ALTER TABLE {table_name} ADD PRIMARY KEY (id);
+                            CREATE UNIQUE INDEX {constraint_name} ON {table_name} (object_id, operation_type, content_type_id)
+                                WHERE operation_type IN ('DELETE', 'CREATE');
+                            """
+                          ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name='entrieschangelog',
+                    name=constraint_name,
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.1 on 2026-10-17 07:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0014_changelog_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaGarbageCollectionRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='Start time of the run.')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finish time of the run.')),
+                ('is_dry_run', models.BooleanField(default=False, verbose_name='Only report garbage without deleting it.')),
+                ('phase', models.CharField(choices=[('IMAGES', 'Images'), ('FILES', 'Files'), ('DONE', 'Done')], default='IMAGES', max_length=6, verbose_name='Current phase of the run.')),
+                ('last_image_pk', models.PositiveIntegerField(default=0, verbose_name='Last checked image pk.')),
+                ('last_path', models.TextField(blank=True, verbose_name='Last checked file path relative to media root.')),
+                ('images_deleted', models.PositiveIntegerField(default=0, verbose_name='Number of deleted images which files do not exist.')),
+                ('files_scanned', models.PositiveIntegerField(default=0, verbose_name='Number of checked files.')),
+                ('files_deleted', models.PositiveIntegerField(default=0, verbose_name='Number of deleted files.')),
+                ('bytes_deleted', models.PositiveBigIntegerField(default=0, verbose_name='Size of deleted files in bytes.')),
+                ('folders_deleted', models.PositiveIntegerField(default=0, verbose_name='Number of deleted empty folders.')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Paths of files which could not be deleted.')),
+            ],
+            options={
+                'verbose_name': 'Media garbage collection run.',
+                'verbose_name_plural': 'Media garbage collection runs.',
+                'get_latest_by': ('started_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+from django.db import migrations
+
+
+def full_state_function_sql(function_name: str, table_name: str, aggregate_name: str, versions: str) -> str:
+    """
+    Returns SQL which (re)creates function reconstructing full state of changelog entry from
+    entries selected by 'versions' condition.
+    """
+    return f"""
+        CREATE OR REPLACE FUNCTION {function_name}(
+            v_content_type_id INTEGER,
+            v_object_id INTEGER,
+            v_access_time TIMESTAMPTZ,
+            v_id INTEGER,
+            v_state JSONB,
+            v_keyframe_distance INTEGER
+        ) RETURNS JSONB AS
+        $full_state$
+            SELECT CASE WHEN v_keyframe_distance = 0 THEN v_state ELSE (
+                SELECT
+                    {aggregate_name}(versions.state ORDER BY versions.access_time, versions.id)
+                FROM (
+                    {versions}
+                ) AS versions) END;
+        $full_state$
+            LANGUAGE sql STABLE;
+        """
+
+
+class Migration(migrations.Migration):
+    """
+    Full state of delta entry is merged from the nearest keyframe at or before the entry instead of
+    fixed number of preceding entries, which was wrong if entries were not inserted in order of
+    access.
+    """
+    table_name = 'administration_entrieschangelog'
+    aggregate_name = 'jsonb_merge_agg'
+    function_name = 'changelog_full_state'
+
+    dependencies = [
+        ('administration', '0015_media_gc_run'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=full_state_function_sql(
+                function_name,
+                table_name,
+                aggregate_name,
+                f"""
+                SELECT state, access_time, id
+                FROM {table_name}
+                WHERE
+                    content_type_id = v_content_type_id AND
+                    object_id = v_object_id AND
+                    (access_time, id) <= (v_access_time, v_id) AND
+                    -- ALL over no rows is true, so without keyframe all preceding entries are merged
+                    (access_time, id) >= ALL (
+                        SELECT access_time, id
+                        FROM {table_name}
+                        WHERE
+                            content_type_id = v_content_type_id AND
+                            object_id = v_object_id AND
+                            keyframe_distance = 0 AND
+                            (access_time, id) <= (v_access_time, v_id)
+                        ORDER BY access_time DESC, id DESC
+                        LIMIT 1
+                    )
+                """,
+            ),
+            reverse_sql=full_state_function_sql(
+                function_name,
+                table_name,
+                aggregate_name,
+                f"""
+                SELECT state, access_time, id
+                FROM {table_name}
+                WHERE
+                    content_type_id = v_content_type_id AND
+                    object_id = v_object_id AND
+                    (access_time, id) <= (v_access_time, v_id)
+                ORDER BY access_time DESC, id DESC
+                LIMIT v_keyframe_distance + 1
+                """,
+            ),
+        ),
+    ]
@@ -33,7 +33,11 @@ class OperationTypeChoices(models.TextChoices):
 class EntriesChangeLog(models.Model):
     """
     Keeps information about by whom changes being made in series and seasons.
+    Table is partitioned by months on 'access_time', see migration 0014.
     """
+    queryset = administration.managers.EntriesChangeLogQueryset
+    objects = administration.managers.EntriesChangeLogManager.from_queryset(queryset)()
+
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE,
@@ -52,9 +56,11 @@ class EntriesChangeLog(models.Model):
         blank=True,
         related_name='access_logs',
     )
+    #  Not 'auto_now_add' as entries are written in batches after the access itself.
     access_time = models.DateTimeField(
         verbose_name='access_time',
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
     )
     as_who = models.CharField(
         verbose_name='Status of the accessed user.',
@@ -70,6 +76,11 @@ class EntriesChangeLog(models.Model):
         verbose_name='Model state before save or delete.',
         encoder=CustomEncoder,
     )
+    #  In 'delta' storage mode only keyframes keep full state, other entries keep changed fields only.
+    keyframe_distance = models.PositiveSmallIntegerField(
+        verbose_name='Number of entries since the last entry with full state.',
+        default=0,
+    )
 
     class Meta:
         verbose_name = 'Entries log'
@@ -78,6 +89,11 @@ class EntriesChangeLog(models.Model):
         indexes = [
             BrinIndex(fields=('access_time',), autosummarize=True, ),
             GinIndex(fields=('state',)),
+            #  Seeks previous and next states of an object.
+            models.Index(
+                fields=('content_type', 'object_id', 'access_time',),
+                name='object_access_time_index',
+            ),
         ]
         constraints = [
             #  'as_who' might be only one of the options from UserStatusChoices.
@@ -90,15 +106,10 @@ class EntriesChangeLog(models.Model):
                 name='operation_type_check',
                 check=models.Q(operation_type__in=OperationTypeChoices.values)
             ),
-            #  One model entry can have only one 'DELETE' or only one 'CREATE'.
-            models.constraints.UniqueConstraint(
-                name='multiple_delete_or_update_exclusion',
-                fields=('object_id', 'operation_type', 'content_type_id'),
-                condition=models.Q(
-                    operation_type__in=(
-                        OperationTypeChoices.DELETE,
-                        OperationTypeChoices.CREATE,
-                    )), )]
+            #  One model entry can have only one 'DELETE' or only one 'CREATE'. Unique index can't be global
+            #  on partitioned table, therefore it is enforced by trigger 'changelog_unique_operation' which
+            #  raises 'multiple_delete_or_update_exclusion' unique violation (see migration 0014).
+        ]
 
     def save(self, fc=True, *args, **kwargs):
         if fc:
@@ -188,3 +199,76 @@ class IpBlacklist(models.Model):
         if fc:
             self.full_clean(validate_unique=True)
         super().save(*args, **kwargs)
+
+
+class MediaGCPhaseChoices(models.TextChoices):
+    IMAGES = 'IMAGES'
+    FILES = 'FILES'
+    DONE = 'DONE'
+
+
+class MediaGarbageCollectionRun(models.Model):
+    """
+    Statistics and checkpoint of the run of media root garbage collector.
+    """
+    started_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Start time of the run.',
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Finish time of the run.',
+    )
+    is_dry_run = models.BooleanField(
+        default=False,
+        verbose_name='Only report garbage without deleting it.',
+    )
+    phase = models.CharField(
+        choices=MediaGCPhaseChoices.choices,
+        default=MediaGCPhaseChoices.IMAGES,
+        max_length=6,
+        verbose_name='Current phase of the run.',
+    )
+    #  Run is resumed after these checkpoints.
+    last_image_pk = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Last checked image pk.',
+    )
+    last_path = models.TextField(
+        blank=True,
+        verbose_name='Last checked file path relative to media root.',
+    )
+    images_deleted = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of deleted images which files do not exist.',
+    )
+    files_scanned = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of checked files.',
+    )
+    files_deleted = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of deleted files.',
+    )
+    bytes_deleted = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Size of deleted files in bytes.',
+    )
+    folders_deleted = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of deleted empty folders.',
+    )
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Paths of files which could not be deleted.',
+    )
+
+    class Meta:
+        verbose_name = 'Media garbage collection run.'
+        verbose_name_plural = 'Media garbage collection runs.'
+        get_latest_by = ('started_at',)
+
+    def __str__(self):
+        return f'{"dry " if self.is_dry_run else ""}run {self.started_at} - {self.phase}'
@@ -80,6 +80,9 @@ class HistoryDetailSerializer(HistorySerializer):
     """
     prev_state = serializers.JSONField(
     )
+    state = serializers.JSONField(
+        source='full_state',
+    )
     prev_changes = serializers.SerializerMethodField(
     )
     next_state = serializers.JSONField(
@@ -106,37 +109,50 @@ class HistoryDetailSerializer(HistorySerializer):
         """
         Returns changes in 'state' between current state and previous state.
         """
-        return self.calculate_difference(obj.state, prev_state=obj.prev_state)
+        return self.changed_fields(obj.prev_state, obj.prev_changes)
 
     def get_next_changes(self, obj: Meta.model) -> Optional[set]:
         """
         Returns changes in 'state' between current state and next state.
         """
-        return self.calculate_difference(obj.state, next_state=obj.next_state)
+        return self.changed_fields(obj.next_state, obj.next_changes)
 
     @staticmethod
-    def calculate_difference(
-            state: dict,
-            *,
-            prev_state: dict = None,
-            next_state: dict = None,
-    ) -> Optional[set]:
+    def changed_fields(other_state: Optional[dict], changes: Optional[dict]) -> Optional[set]:
         """
-        Calculates a difference between 2 states.
+        Returns names of fields from difference calculated in DB or None if there is no other state
+        to compare with or no changes.
         """
-        assert not (prev_state and next_state),\
-            'Need to have either "prev_state" or "next_state", not both simultaneously.'
-
-        next_or_prev_state = prev_state or next_state
-        if next_or_prev_state is None:
+        if other_state is None or not changes:
             return None
 
-        changed_keys = set()
+        return set(changes)
 
-        for (key, next_or_prev_state_val), (key, curr_val) in zip(next_or_prev_state.items(), state.items()):
-            if next_or_prev_state_val != curr_val:
-                changed_keys.add(key)
 
-        return changed_keys or None
+class HistoryTimelineSerializer(HistorySerializer):
+    """
+    Serializer for 'EntriesChangeLog' model in 'timeline' action of 'HistoryViewSet'.
+    """
+    state = serializers.JSONField(
+        source='full_state',
+    )
+    changes = serializers.SerializerMethodField(
+    )
 
+    class Meta:
+        model = administration.models.EntriesChangeLog
+        fields = (
+            'pk',
+            'access_time',
+            'as_who',
+            'operation_type',
+            'user',
+            'state',
+            'changes',
+        )
 
+    def get_changes(self, obj: Meta.model) -> Optional[set]:
+        """
+        Returns changes in 'state' between previous state and current state.
+        """
+        return HistoryDetailSerializer.changed_fields(obj.prev_state, obj.prev_changes)
@@ -1,8 +1,8 @@
-import inspect
 from typing import Optional
 
 from django.conf import settings
 from django.core.cache import cache, caches
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models.base import ModelBase
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
@@ -10,9 +10,10 @@ from django.forms.models import model_to_dict
 from django.http import HttpRequest
 from django.utils import timezone
 
+from administration import changelog_writer
 from administration.models import EntriesChangeLog, OperationTypeChoices, \
     UserStatusChoices
-from series import constants
+from series import constants, request_context
 
 default_timeout = constants.TIMEOUTS['default']
 
@@ -73,15 +74,14 @@ def create_log(sender: ModelBase,
     if kwargs.get('raw', None):
         return None
 
-    #  Get 'request' objects from stack trace if possible. Found on iteration 49 from 62, so that
-    #  should be faster with reversed().
-    if request is None:
-        for frame_record in reversed(inspect.stack()):
-            if frame_record.function == 'get_response':
-                request = frame_record.frame.f_locals['request']
-                break
-        else:
-            return None
+    #  Request user is bound to context by 'RequestContextMiddleware' or passed to Celery task in headers.
+    if request is not None:
+        user_id = request.user.pk
+    else:
+        user_id = request_context.get_current_user_id()
+
+    if user_id is None:
+        return None
 
     # 'created' isn't present in *_delete signals.
     try:
@@ -93,9 +93,11 @@ def create_log(sender: ModelBase,
         operation_type = OperationTypeChoices.DELETE
 
     # 'accessed_as_who' attribute is assigned in permissions.
-    instance.access_logs.create(
-        user=request.user,
+    entry = EntriesChangeLog(
+        content_object=instance,
+        user_id=user_id,
         as_who=getattr(instance, 'accessed_as_who', UserStatusChoices.CREATOR),
         operation_type=operation_type,
         state=model_to_dict(instance),
     )
+    changelog_writer.add_entry(entry, using=kwargs.get('using') or DEFAULT_DB_ALIAS)
@@ -1,6 +1,7 @@
 from __future__ import absolute_import, unicode_literals
 
 import smtplib
+from typing import List
 
 from celery import shared_task
 from django.conf import settings
@@ -65,3 +66,33 @@ def delete_non_active_blacklisted_ips() -> tuple:
     return administration.models.IpBlacklist.objects.exclude(
         record_time__gt=Now() - F('stretch')
     ).delete()
+
+
+@shared_task
+def write_changelog_entries(entries: List[dict], using: str) -> None:
+    """
+    Writes batch of 'EntriesChangeLog' entries collected during transaction.
+    """
+    from administration.changelog_writer import write_entries
+
+    write_entries(
+        [administration.models.EntriesChangeLog(**fields) for fields in entries],
+        using,
+    )
+
+
+@shared_task
+def create_changelog_partitions(months_ahead: int = None) -> List[str]:
+    """
+    Creates monthly partitions of 'EntriesChangeLog' for upcoming months.
+    """
+    return administration.models.EntriesChangeLog.objects.create_partitions(months_ahead)
+
+
+@shared_task
+def archive_old_changelog_partitions(keep_months: int = None) -> List[str]:
+    """
+    Exports 'EntriesChangeLog' partitions older than retention period to compressed files and
+    drops them.
+    """
+    return administration.models.EntriesChangeLog.objects.archive_old_partitions(keep_months)
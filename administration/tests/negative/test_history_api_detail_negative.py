@@ -1,24 +1,61 @@
-from rest_framework.test import APISimpleTestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
 
-import administration.serielizers
+from administration.helpers.initial_data import generate_changelog
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
 
 
-class HistoryAPIDetailNegativeTest(APISimpleTestCase):
+class HistoryAPIDetailNegativeTest(APITestCase):
     """
-    Negative tests on models change history api detail action
+    Negative tests on models change history api detail and timeline actions
     administration/history/<model name>/<instance_pk>/<pk>/.
     """
     maxDiff = None
 
-    def test_calculate_difference(self):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        self.logs = generate_changelog(self.series_1, self.user_1)
+
+    def test_404_on_entry_of_other_instance(self):
         """
-        Check that 'calculate_difference' method in 'HistoryDetailSerializer' serializer raises
-        exception in case 'prev_state' and 'next_state' both None.
+        Check that entry of another instance can't be retrieved via history of given instance.
         """
-        expected_error_message = \
-            'Need to have either "prev_state" or "next_state", not both simultaneously.'
-        serializer = administration.serielizers.HistoryDetailSerializer()
-        state = prev_state = next_state = {'test': 'test'}
+        other_log, *rest = generate_changelog(self.series_2, self.user_1)
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+        response = self.client.get(
+            reverse('history-detail', args=['tvseriesmodel', self.series_1.pk, other_log.pk]),
+            data=None,
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_timeline_access_forbidden_for_random_users(self):
+        """
+        Check that users who dont have defined permissions can not access timeline action.
+        """
+        self.client.force_authenticate(user=self.series_2.entry_author)
+
+        response = self.client.get(
+            reverse('history-timeline', args=['tvseriesmodel', self.series_1.pk]),
+            data=None,
+            format='json',
+        )
 
-        with self.assertRaisesMessage(AssertionError, expected_error_message):
-            serializer.calculate_difference(state, prev_state=prev_state, next_state=next_state)
\ No newline at end of file
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
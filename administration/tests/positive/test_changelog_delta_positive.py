@@ -0,0 +1,157 @@
+import datetime
+import json
+
+from django.forms.models import model_to_dict
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+import administration.models
+from administration import changelog_writer
+from administration.encoders import CustomEncoder
+from archives.tests.data import initial_data
+from series import request_context
+from users.helpers import create_test_users
+
+
+@override_settings(
+    CHANGELOG_STORAGE_MODE=changelog_writer.DELTA,
+    CHANGELOG_KEYFRAME_INTERVAL=3,
+)
+class ChangeLogDeltaPositiveTest(APITestCase):
+    """
+    Positive test on delta encoded 'EntriesChangeLog' states and their reconstruction.
+    """
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        self.snapshots = []
+        with request_context.bind(user_id=self.series_1.entry_author_id):
+            for rating in range(1, 8):
+                self.series_1.rating = rating
+                self.series_1.save(fc=False)
+                self.snapshots.append(json.loads(json.dumps(model_to_dict(self.series_1), cls=CustomEncoder)))
+
+        self.logs = list(
+            administration.models.EntriesChangeLog.objects.filter(
+                object_id=self.series_1.pk,
+                content_type__model='tvseriesmodel',
+            ).order_by('access_time', 'pk')
+        )
+
+    def test_deltas_and_keyframes(self):
+        """
+        Check that only each 3-rd entry keeps full state and other entries keep changed fields only.
+        """
+        self.assertListEqual(
+            [log.keyframe_distance for log in self.logs],
+            [0, 1, 2, 0, 1, 2, 0],
+        )
+        for log, snapshot in zip(self.logs, self.snapshots):
+            with self.subTest(log=log):
+                self.assertDictEqual(
+                    log.state,
+                    snapshot if log.keyframe_distance == 0 else {'rating': snapshot['rating']},
+                )
+
+    def test_reconstruction(self):
+        """
+        Check that full state of each entry is reconstructed correctly.
+        """
+        manager = administration.models.EntriesChangeLog.objects
+
+        for log, snapshot in zip(self.logs, self.snapshots):
+            with self.subTest(log=log):
+                self.assertDictEqual(
+                    manager.get_full_state(log.pk),
+                    snapshot,
+                )
+        self.assertDictEqual(
+            manager.get_state_at(self.logs[4].content_type_id, self.series_1.pk, self.logs[4].access_time),
+            self.snapshots[4],
+        )
+
+    def test_history_detail(self):
+        """
+        Check that history detail api shows full states.
+        """
+        test_log = self.logs[4]
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+        response = self.client.get(test_log.get_absolute_url, data=None, format='json')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        for state, snapshot in zip(('prev_state', 'state', 'next_state'), self.snapshots[3:6]):
+            with self.subTest(state=state):
+                self.assertDictEqual(
+                    response.data[state],
+                    snapshot,
+                )
+        self.assertSetEqual(
+            response.data['prev_changes'],
+            {'rating'},
+        )
+
+    def test_out_of_order_flush(self):
+        """
+        Check that entries stamped on change but written in other order, as concurrent transactions
+        commit, keep their access time and states of all entries are reconstructed correctly.
+        """
+        manager = administration.models.EntriesChangeLog.objects
+        changed_at = timezone.now()
+        entries, snapshots = [], []
+        for rating in (8, 9):
+            self.series_1.rating = rating
+            snapshots.append(json.loads(json.dumps(model_to_dict(self.series_1), cls=CustomEncoder)))
+            entries.append(administration.models.EntriesChangeLog(
+                content_object=self.series_1,
+                user=self.user_1,
+                access_time=changed_at + datetime.timedelta(seconds=rating),
+                as_who=administration.models.UserStatusChoices.CREATOR,
+                operation_type=administration.models.OperationTypeChoices.UPDATE,
+                state=model_to_dict(self.series_1),
+            ))
+        earlier, later = entries
+        changelog_writer.write_entries([later])
+        changelog_writer.write_entries([earlier])
+
+        for entry, snapshot, seconds in zip(entries, snapshots, (8, 9)):
+            with self.subTest(entry=entry):
+                entry.refresh_from_db()
+                self.assertEqual(
+                    entry.access_time,
+                    changed_at + datetime.timedelta(seconds=seconds),
+                )
+                self.assertDictEqual(
+                    manager.get_full_state(entry.pk),
+                    snapshot,
+                )
+        #  Stored entries before written ones are not affected.
+        for log, snapshot in zip(self.logs, self.snapshots):
+            with self.subTest(log=log):
+                self.assertDictEqual(
+                    manager.get_full_state(log.pk),
+                    snapshot,
+                )
+        for seconds, snapshot in zip((8.5, 10), snapshots):
+            with self.subTest(seconds=seconds):
+                self.assertDictEqual(
+                    manager.get_state_at(
+                        later.content_type_id,
+                        self.series_1.pk,
+                        changed_at + datetime.timedelta(seconds=seconds),
+                    ),
+                    snapshot,
+                )
@@ -0,0 +1,142 @@
+import csv
+import datetime
+import gzip
+import shutil
+import tempfile
+
+from django.db import connection
+from django.forms.models import model_to_dict
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+import administration.models
+from administration import changelog_writer
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class ChangeLogPartitionsPositiveTest(APITestCase):
+    """
+    Positive test on monthly partitions of 'EntriesChangeLog' and their archival.
+    """
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        self.manager = administration.models.EntriesChangeLog.objects
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        current_month = timezone.now().date().replace(day=1)
+        self.old_month = self.manager.add_months(current_month, -30)
+        self.old_time = datetime.datetime(self.old_month.year, self.old_month.month, 2, tzinfo=timezone.utc)
+
+    def create_entry(self, access_time, rating: int) -> administration.models.EntriesChangeLog:
+        self.series_1.rating = rating
+        entry = administration.models.EntriesChangeLog(
+            content_object=self.series_1,
+            user=self.user_1,
+            access_time=access_time,
+            as_who=administration.models.UserStatusChoices.CREATOR,
+            operation_type=administration.models.OperationTypeChoices.UPDATE,
+            state=model_to_dict(self.series_1),
+        )
+        changelog_writer.write_entries([entry])
+        return entry
+
+    def create_old_partition(self) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT changelog_create_partition(%s);', (self.old_month, ))
+            [name] = cursor.fetchone()
+        return name
+
+    def test_create_partitions(self):
+        """
+        Check that missing partitions are created ahead and existing ones are skipped.
+        """
+        current_month = timezone.now().date().replace(day=1)
+        months_ahead = len(
+            [month for name, month in self.manager.get_partitions() if month > current_month]
+        )
+
+        created = self.manager.create_partitions(months_ahead + 2)
+
+        self.assertEqual(
+            len(created),
+            2,
+        )
+        self.assertListEqual(
+            self.manager.create_partitions(months_ahead + 2),
+            [],
+        )
+
+    def test_entries_moved_from_default_partition(self):
+        """
+        Check that entries of the month without partition are moved to its partition once it is
+        created.
+        """
+        entry = self.create_entry(self.old_time, 1)
+
+        name = self.create_old_partition()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM {connection.ops.quote_name(name)};')
+            self.assertListEqual(
+                [pk for pk, in cursor.fetchall()],
+                [entry.pk],
+            )
+        self.assertEqual(
+            self.manager.get(pk=entry.pk).state['rating'],
+            1,
+        )
+
+    @override_settings(
+        CHANGELOG_STORAGE_MODE=changelog_writer.DELTA,
+        CHANGELOG_KEYFRAME_INTERVAL=10,
+    )
+    def test_archive_old_partitions(self):
+        """
+        Check that partitions older than retention period are exported to compressed files and
+        dropped, and that states of remaining entries are still reconstructed correctly.
+        """
+        old_entries = [self.create_entry(self.old_time, rating) for rating in (1, 2)]
+        recent_entry = self.create_entry(timezone.now(), 3)
+        expected_state = self.manager.get_full_state(recent_entry.pk)
+
+        name = self.create_old_partition()
+
+        paths = self.manager.archive_old_partitions(keep_months=24, directory=self.directory)
+
+        self.assertEqual(
+            len(paths),
+            1,
+        )
+        with gzip.open(paths[0], 'rt') as file:
+            self.assertListEqual(
+                [int(row['id']) for row in csv.DictReader(file)],
+                [entry.pk for entry in old_entries],
+            )
+        self.assertNotIn(
+            name,
+            [partition_name for partition_name, month in self.manager.get_partitions()],
+        )
+        self.assertFalse(
+            self.manager.filter(pk__in=[entry.pk for entry in old_entries]).exists(),
+        )
+        recent_entry.refresh_from_db()
+        self.assertEqual(
+            recent_entry.keyframe_distance,
+            0,
+        )
+        self.assertDictEqual(
+            self.manager.get_full_state(recent_entry.pk),
+            expected_state,
+        )
@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+import administration.models
+import administration.tasks
+import archives.models
+from administration import changelog_writer
+from archives.tests.data import initial_data
+from series import request_context
+from users.helpers import create_test_users
+
+
+@override_settings(CHANGELOG_WRITE_MODE=changelog_writer.ON_COMMIT)
+class ChangeLogWriterPositiveTest(APITestCase):
+    """
+    Positive test on batched transaction-deferred 'EntriesChangeLog' writer.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        self.seasons = initial_data.create_seasons(self.series)
+        self.logs = administration.models.EntriesChangeLog.objects.filter(
+            content_type__model=archives.models.SeasonModel._meta.model_name,
+        )
+
+    @staticmethod
+    def run_commit_hooks() -> None:
+        """
+        Runs 'on_commit' callbacks as test case transaction is never committed.
+        """
+        connection = transaction.get_connection()
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
+
+    def save_seasons(self) -> None:
+        with request_context.bind(user_id=self.user_1.pk):
+            for season in self.seasons:
+                season.save(fc=False)
+
+    def test_entries_written_on_commit(self):
+        """
+        Check that entries are collected in one buffer and written in one query on commit.
+        """
+        self.save_seasons()
+
+        self.assertFalse(self.logs.exists())
+
+        with self.assertNumQueries(1):
+            self.run_commit_hooks()
+
+        self.assertEqual(
+            self.logs.count(),
+            len(self.seasons),
+        )
+
+    def test_savepoint_rollback(self):
+        """
+        Check that entries of rolled back savepoint are discarded.
+        """
+        with request_context.bind(user_id=self.user_1.pk):
+            self.seasons[0].save(fc=False)
+            try:
+                with transaction.atomic():
+                    self.seasons[1].save(fc=False)
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.run_commit_hooks()
+
+        self.assertListEqual(
+            list(self.logs.values_list('object_id', flat=True)),
+            [self.seasons[0].pk],
+        )
+
+    @override_settings(CHANGELOG_WRITE_MODE=changelog_writer.CELERY)
+    def test_celery_mode(self):
+        """
+        Check that in 'celery' mode batch is handed over to Celery task.
+        """
+        self.save_seasons()
+
+        with patch('administration.tasks.write_changelog_entries.delay') as delay:
+            self.run_commit_hooks()
+
+        [entries, using] = delay.call_args.args
+        self.assertListEqual(
+            [entry['object_id'] for entry in entries],
+            [season.pk for season in self.seasons],
+        )
+        administration.tasks.write_changelog_entries(entries, using)
+
+        self.assertEqual(
+            self.logs.count(),
+            len(self.seasons),
+        )
+
+    def test_duplicate_operations_skipped(self):
+        """
+        Check that 'CREATE' entries of objects which already have one stored or earlier in the batch
+        are skipped instead of violating 'multiple_delete_or_update_exclusion'.
+        """
+        def create_entry(season: archives.models.SeasonModel) -> administration.models.EntriesChangeLog:
+            return administration.models.EntriesChangeLog(
+                content_object=season,
+                user=self.user_1,
+                as_who=administration.models.UserStatusChoices.CREATOR,
+                operation_type=administration.models.OperationTypeChoices.CREATE,
+                state={'pk': season.pk},
+            )
+
+        changelog_writer.write_entries([create_entry(self.seasons[0])])
+        written = changelog_writer.write_entries(
+            [create_entry(self.seasons[0]), create_entry(self.seasons[1]), create_entry(self.seasons[1])]
+        )
+
+        self.assertListEqual(
+            [entry.object_id for entry in written],
+            [self.seasons[1].pk],
+        )
+        self.assertListEqual(
+            sorted(self.logs.values_list('object_id', flat=True)),
+            sorted([self.seasons[0].pk, self.seasons[1].pk]),
+        )
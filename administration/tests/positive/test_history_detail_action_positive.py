@@ -1,4 +1,5 @@
 from rest_framework import status
+from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
 from administration.helpers.initial_data import generate_changelog
@@ -131,3 +132,40 @@ class HistoryAPIDetailPositiveTest(APITestCase):
         self.assertIsNone(
             response.data['next_changes']
         )
+
+    def test_timeline_action(self):
+        """
+        Check that timeline action returns all entries of the instance in order of access with
+        full states and changes made by each of them.
+        """
+        changed_log = self.logs[len(self.logs) // 2]
+        changed_log.state['name'] = 'changed_state'
+        changed_log.save()
+
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+        response = self.client.get(
+            reverse('history-timeline', args=['tvseriesmodel', self.series_1.pk]),
+            data={'limit': len(self.logs)},
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertListEqual(
+            [entry['pk'] for entry in response.data['results']],
+            [log.pk for log in self.logs],
+        )
+        self.assertEqual(
+            response.data['results'][len(self.logs) // 2]['state']['name'],
+            'changed_state',
+        )
+        self.assertListEqual(
+            [entry['changes'] for entry in response.data['results']],
+            [
+                {'name', } if index in (len(self.logs) // 2, len(self.logs) // 2 + 1) else None
+                for index in range(len(self.logs))
+            ],
+        )
@@ -3,7 +3,8 @@ import tempfile
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db.models import OuterRef, Q, Subquery
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import decorators, generics, permissions, viewsets
 from rest_framework.request import Request
@@ -66,6 +67,7 @@ class HistoryViewSet(ListCacheResponseMixin, DetailSerializerMixin, viewsets.Rea
     search_fields = ('user',)
     serializer_class = administration.serielizers.HistorySerializer
     serializer_detail_class = administration.serielizers.HistoryDetailSerializer
+    lookup_value_regex = r'\d+'
 
     list_cache_key_func = key_constructors.HistoryViewSetListActionKeyConstructor()
     list_cache_timeout = constants.TIMEOUTS[administration.models.EntriesChangeLog._meta.model_name]
@@ -109,35 +111,53 @@ class HistoryViewSet(ListCacheResponseMixin, DetailSerializerMixin, viewsets.Rea
         """
         Enforce permissions check here as by default list action does not do it.
         """
+        self.check_model_instance_permissions()
+
+        return super().list(request, *args, **kwargs)
+
+    def check_model_instance_permissions(self) -> None:
+        """
+        Checks object permissions against model instance which history is requested.
+        """
         #  Pass series related to image in case object is image, as image doesn't have entry_author.
         model_instance_to_check = getattr(self.model_instance, 'content_object', self.model_instance)
         self.check_object_permissions(self.request, model_instance_to_check)
 
-        return super().list(request, *args, **kwargs)
-
     def get_object(self):
         queryset = self.filter_queryset(self.get_queryset())
+        pk = int(self.kwargs['pk'])
 
-        queryset = queryset.annotate(
-            next_state=Subquery(
-                administration.models.EntriesChangeLog.objects.filter(
-                    self.condition,
-                    access_time__gt=OuterRef('access_time'),
-                ).order_by('access_time').values('state', )[:1]
-            ),
-            prev_state=Subquery(
-                administration.models.EntriesChangeLog.objects.filter(
-                    self.condition,
-                    access_time__lt=OuterRef('access_time'),
-                ).order_by('-access_time').values('state', )[:1]
-            ))
-
-        obj = get_object_or_404(queryset, pk=self.kwargs['pk'])
-        model_instance_to_check = getattr(self.model_instance, 'content_object', self.model_instance)
-        self.check_object_permissions(self.request, model_instance_to_check)
+        #  Single 'LAG'/'LEAD' window over the entry and its closest neighbours only.
+        entries = queryset.around(pk).with_neighbour_states()
+        obj = next((entry for entry in entries if entry.pk == pk), None)
+        if obj is None:
+            raise Http404
+
+        self.check_model_instance_permissions()
 
         return obj
 
+    @decorators.action(
+        detail=False,
+        methods=['get'],
+        serializer_class=administration.serielizers.HistoryTimelineSerializer,
+    )
+    def timeline(self, request, *args, **kwargs):
+        """
+        Shows all entries of the object in order of access with full states and changed fields.
+        """
+        self.check_model_instance_permissions()
+
+        queryset = self.get_queryset().with_neighbour_states().order_by('access_time', 'pk')
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
 
 @decorators.api_view(http_method_names=['GET'])
 @decorators.permission_classes([permissions.IsAdminUser, ])
@@ -99,17 +99,17 @@ class TvSeriesListCreateViewFilter(rest_framework_filters.FilterSet):
     Filter for 'TvSeriesListCreateView'.
     """
     is_empty = rest_framework_filters.BooleanFilter(
-        field_name='seasons_cnt',
+        field_name='statistics__seasons_cnt',
         lookup_expr='isnull',
         label='Is series empty?',
     )
     seasons_cnt__lte = rest_framework_filters.NumberFilter(
-        field_name='seasons_cnt',
+        field_name='statistics__seasons_cnt',
         lookup_expr='lte',
         label='Number of seasons in series lte...',
     )
     seasons_cnt__gte = rest_framework_filters.NumberFilter(
-        field_name='seasons_cnt',
+        field_name='statistics__seasons_cnt',
         lookup_expr='gte',
         label='Number of seasons in series gte...',
     )
@@ -175,8 +175,13 @@ class FractionField(serializers.Field):
         return value
 
 
+class StreamedImageField(serializers.ImageField):
+    """
+    Image field which doesn't open image with PIL once again if it was already decoded while it
+    was received by 'StreamingImageUploadHandler'.
+    """
 
-
-
-
-
+    def to_internal_value(self, data):
+        if getattr(data, 'image_hash', None) is None:
+            return super().to_internal_value(data)
+        return serializers.FileField.to_internal_value(self, data)
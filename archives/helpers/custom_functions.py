@@ -40,6 +40,17 @@ def filter_positive_int_or_digit(container: Iterable, to_integer: bool = True) -
     return final_list_of_positive_numbers_gte_zero
 
 
+#  Image hash algorithms by name. 'image_hash' field is made by PRIMARY_HASH_ALGORITHM, hashes made by
+#  other algorithms are kept in 'hashes' field side by side.
+HASH_ALGORITHMS = {
+    'average': imagehash.average_hash,
+    'phash': imagehash.phash,
+    'dhash': imagehash.dhash,
+    'whash': imagehash.whash,
+}
+PRIMARY_HASH_ALGORITHM = 'average'
+
+
 def create_image_hash(
         image: Union[BinaryIO, File],
         raise_errors: bool = False,
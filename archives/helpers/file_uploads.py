@@ -1,13 +1,69 @@
+import hashlib
 import os
 
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
 from archives import models
 
+#  'path' - images are stored by series name and season number, 'content' - by content digest.
+PATH = 'path'
+CONTENT = 'content'
+
+
+def file_digest(file) -> str:
+    """
+    Returns sha256 digest of the file content.
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_path(digest: str, filename: str) -> str:
+    """
+    Path of the file in content addressed layout, sharded by first 2 bytes of digest.
+    'a1b2c3...' -> 'content/a1/b2/a1b2c3....jpg'
+    """
+    _, extension = os.path.splitext(filename)
+    return os.path.join(settings.IMAGE_CONTENT_DIR, digest[:2], digest[2:4], digest + extension.lower())
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage which stores file with content addressed path only once. Such a file is
+    shared by all images with the same content, therefore it is neither renamed nor overwritten.
+    File is content addressed if it is marked by image blob and is saved to the path of the blob, as
+    series directory of 'path' layout can be named like IMAGE_CONTENT_DIR.
+    """
+
+    @staticmethod
+    def is_content_addressed(name: str, content) -> bool:
+        blob = getattr(content, 'blob', None)
+        return blob is not None and os.path.normpath(name) == os.path.normpath(blob.path)
+
+    def save(self, name, content, max_length=None):
+        if self.is_content_addressed(name, content):
+            if self.exists(name):
+                return name
+            return self._save(name, content)
+        return super().save(name, content, max_length)
+
+
+image_storage = ContentAddressedStorage()
+
 
 def save_image_path(instance: 'models.ImageModel', filename: str) -> str:
     """
         Custom path for saving images depend on a series name or season number.
         """
-    if isinstance(instance.content_object, models.TvSeriesModel):
+    if instance.blob_id is not None:
+        _path = instance.blob.path
+    elif isinstance(instance.content_object, models.TvSeriesModel):
         _path = os.path.join(
             instance.content_object.name,
             filename
@@ -0,0 +1,125 @@
+import contextlib
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+
+logger = logging.getLogger(__name__)
+
+#  Text searched with each configuration in order to make Postgres load its dictionaries.
+WARM_UP_TEXT = 'warm up'
+
+#  {configuration: {'connections': number of warmed up connections, 'last_ms', 'max_ms', 'total_ms'}}
+#  of this process.
+timings = {}
+#  (DB name, configuration) pairs of configurations missing in DB which were already reported by this process.
+#  Configurations are looked up anew in each connection as DB can get them later, e.g. by migration.
+reported_missing = set()
+#  Connections created while 'is_cold' is set are not warmed up.
+_local = threading.local()
+
+
+def load_configuration(connection, configuration: str) -> float:
+    """
+    Makes backend of the connection load dictionaries of FTS configuration. Returns time in ms.
+    """
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_tsvector(%s::regconfig, %s);', [configuration, WARM_UP_TEXT])
+    return (time.perf_counter() - started) * 1000
+
+
+def warm_up(connection, configurations: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Preloads dictionaries of FTS configurations in new DB connection. Hunspell dictionaries are
+    loaded lazily by each backend on first use which takes hundreds of ms, therefore otherwise
+    first FTS query on each new connection is slow. Returns {configuration: time in ms}.
+    """
+    result = {}
+    if getattr(_local, 'is_cold', False):
+        return result
+
+    configurations = list(configurations or settings.FTS_WARM_UP_CONFIGURATIONS)
+    if not configurations:
+        return result
+
+    #  Checked beforehand as error would break transaction connection might be in.
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT cfgname FROM pg_ts_config WHERE cfgname = ANY(%s);', [configurations])
+        existing = {name for name, in cursor.fetchall()}
+
+    for configuration in configurations:
+        if configuration not in existing:
+            key = (connection.settings_dict['NAME'], configuration)
+            if key not in reported_missing:
+                reported_missing.add(key)
+                logger.warning(
+                    f'FTS configuration {configuration} does not exist in DB {key[0]} and can not be warmed up.'
+                )
+            continue
+
+        result[configuration] = elapsed = load_configuration(connection, configuration)
+        stats = timings.setdefault(configuration, {'connections': 0, 'last_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0})
+        stats['connections'] += 1
+        stats['last_ms'] = elapsed
+        stats['max_ms'] = max(stats['max_ms'], elapsed)
+        stats['total_ms'] += elapsed
+
+    if result:
+        logger.info(
+            'FTS dictionaries are warmed up: ' + ', '.join(f'{name} {ms:.1f} ms' for name, ms in result.items())
+        )
+    return result
+
+
+@contextlib.contextmanager
+def cold_connection(alias: str = DEFAULT_DB_ALIAS) -> Iterator:
+    """
+    New DB connection which dictionaries are not preloaded. Used to measure cold start cost.
+    """
+    settings_dict = connections.databases[alias]
+    connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+
+    _local.is_cold = True
+    try:
+        connection.ensure_connection()
+    finally:
+        _local.is_cold = False
+
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def install_shared_dictionaries(connection) -> None:
+    """
+    Replaces hunspell dictionaries of configurations in FTS_SHARED_DICTIONARIES with 'shared_ispell'
+    ones which are loaded once into shared memory and used by all backends.
+    Requires 'shared_ispell' in 'shared_preload_libraries' of Postgres.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS shared_ispell;')
+        for configuration, (dictionary, dict_file, stop_words) in settings.FTS_SHARED_DICTIONARIES.items():
+            shared_dictionary = f'shared_{dictionary}'
+            cursor.execute('SELECT EXISTS(SELECT 1 FROM pg_ts_dict WHERE dictname = %s);', [shared_dictionary])
+            [exists] = cursor.fetchone()
+            if not exists:
+                cursor.execute(
+                    f"""
+                    CREATE TEXT SEARCH DICTIONARY {shared_dictionary} (
+                        TEMPLATE = shared_ispell,
+                        DictFile = {dict_file},
+                        AffFile = {dict_file},
+                        StopWords = {stop_words}
+                    );
+                    """)
+            cursor.execute(
+                f"""
+                ALTER TEXT SEARCH CONFIGURATION {configuration}
+                    ALTER MAPPING REPLACE {dictionary} WITH {shared_dictionary};
+                """)
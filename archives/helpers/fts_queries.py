@@ -0,0 +1,62 @@
+import hashlib
+import json
+from typing import Dict, NamedTuple, Sequence
+
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from series import constants
+
+QUERY_ANALYSIS_CACHE_KEY = 'fts_query_analysis'
+
+
+class QueryAnalysis(NamedTuple):
+    """
+    Search text parsed and normalized to tsquery by FTS configuration.
+    'numnode' is 0 if text consists only of stop words.
+    """
+    config: str
+    tsquery: str
+    numnode: int
+
+
+def analysis_cache_key(config: str, search_type: str, search: str) -> str:
+    digest = hashlib.md5(json.dumps([config, search_type, search]).encode()).hexdigest()
+    return f'{QUERY_ANALYSIS_CACHE_KEY}:{digest}'
+
+
+def analyze(search: str, search_type: str, configs: Sequence[str]) -> Dict[str, QueryAnalysis]:
+    """
+    Returns {config: analysis} of search text for each of FTS configurations. Analysis depends only
+    on text and dictionaries of configuration, therefore it is cached and text is parsed by DB once
+    per (config, search_type, text). Analyses missing in cache are made by one parameterized query.
+    Raises 'ProgrammingError' on wrong raw search formatting.
+    """
+    keys = {config: analysis_cache_key(config, search_type, search) for config in configs}
+    cached = cache.get_many(keys.values())
+    result = {config: QueryAnalysis(*cached[key]) for config, key in keys.items() if key in cached}
+
+    missing = [config for config in configs if config not in result]
+    if missing:
+        #  Function name is taken from whitelist, not from user input.
+        function = SearchQuery.SEARCH_TYPES[search_type]
+        #  Savepoint keeps outer transaction usable if raw search can't be parsed.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT config.name, query::TEXT, numnode(query)
+                FROM unnest(%s::VARCHAR[]) AS config(name),
+                     LATERAL {function}(config.name::regconfig, %s) AS query;
+                """,
+                [missing, search],
+            )
+            analyses = [QueryAnalysis(*row) for row in cursor.fetchall()]
+
+        cache.set_many(
+            {keys[analysis.config]: tuple(analysis) for analysis in analyses},
+            timeout=constants.TIMEOUTS['fts_query_analysis'],
+        )
+        result.update((analysis.config, analysis) for analysis in analyses)
+
+    return result
@@ -0,0 +1,63 @@
+import os
+from io import BytesIO
+from typing import Dict, List
+
+import PIL.Image
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+
+
+def derivative_path(path: str, name: str, image_format: str) -> str:
+    """
+    Storage path of derivative of the image stored at 'path'.
+    'Series/poster.jpg' -> 'Series/derivatives/poster_thumbnail.jpeg'
+    """
+    directory, filename = os.path.split(path)
+    stem, _ = os.path.splitext(filename)
+    return os.path.join(directory, 'derivatives', f'{stem}_{name}.{image_format.lower()}')
+
+
+def derivative_paths(path: str) -> List[str]:
+    """
+    Storage paths of all derivatives listed in IMAGE_DERIVATIVES of the image stored at 'path'.
+    """
+    return [
+        derivative_path(path, name, config['format']) for name, config in settings.IMAGE_DERIVATIVES.items()
+    ]
+
+
+def make_derivative(image: PIL.Image.Image, size, image_format: str, **options) -> ContentFile:
+    """
+    Resizes copy of the image to fit in 'size' (if provided) keeping aspect ratio and encodes it
+    in given format.
+    """
+    derivative = image.copy()
+    if size is not None:
+        derivative.thumbnail(size)
+
+    allowed_modes = ('RGB', 'L') if image_format == 'JPEG' else ('RGB', 'RGBA', 'L')
+    if derivative.mode not in allowed_modes:
+        derivative = derivative.convert(allowed_modes[0] if image_format == 'JPEG' else 'RGBA')
+
+    buffer = BytesIO()
+    derivative.save(buffer, format=image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_derivatives(image: PIL.Image.Image, path: str, storage: Storage) -> Dict[str, str]:
+    """
+    Saves derivatives listed in IMAGE_DERIVATIVES of the image stored at 'path' to storage.
+    Returns {derivative name: storage path}.
+    """
+    paths = {}
+    for name, config in settings.IMAGE_DERIVATIVES.items():
+        target = derivative_path(path, name, config['format'])
+        #  Derivatives are overwritten when image is processed once again.
+        storage.delete(target)
+        paths[name] = storage.save(
+            target,
+            make_derivative(image, config['size'], config['format'], **config.get('options', {})),
+        )
+
+    return paths
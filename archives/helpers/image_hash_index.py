@@ -0,0 +1,155 @@
+import functools
+import itertools
+from collections import defaultdict
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+import imagehash
+
+
+def hash_to_int(image_hash: Union[imagehash.ImageHash, int]) -> int:
+    """
+    Converts 64 bit image hash to integer.
+    """
+    return image_hash if isinstance(image_hash, int) else int(str(image_hash), 16)
+
+
+def int_to_hash(value: int) -> imagehash.ImageHash:
+    """
+    Converts integer back to 64 bit image hash.
+    """
+    return imagehash.hex_to_hash(f'{value:016x}')
+
+
+@functools.lru_cache(maxsize=None)
+def flip_masks(bits: int, radius: int) -> Tuple[int, ...]:
+    """
+    All masks which flip up to 'radius' bits of 'bits' bits long integer.
+    """
+    return tuple(
+        functools.reduce(lambda mask, bit: mask | (1 << bit), flipped, 0)
+        for distance in range(radius + 1)
+        for flipped in itertools.combinations(range(bits), distance)
+    )
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Number of different bits in 2 integers.
+    """
+    return bin(first ^ second).count('1')
+
+
+class MultiIndexHashing:
+    """
+    Multi-index hashing of 64 bit hashes for search of hashes within given Hamming distance.
+    Hash is split on 'chunks' substrings and each substring is indexed in it's own hash table.
+    If 2 hashes are within distance r, then at least one pair of their substrings is within
+    distance r // chunks (pigeonhole principle), therefore only buckets of substrings which are
+    that close to the query substrings are checked instead of all hashes.
+    """
+    def __init__(self, bits: int = 64, chunks: int = 4) -> None:
+        assert bits % chunks == 0, 'Number of bits should be divisible by number of chunks.'
+        self.chunks = chunks
+        self.chunk_bits = bits // chunks
+        self.chunk_mask = (1 << self.chunk_bits) - 1
+        self.tables = [defaultdict(set) for _ in range(chunks)]
+        self.hashes = {}
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def split(self, value: int) -> Iterator[int]:
+        """
+        Splits hash on substrings.
+        """
+        for chunk in range(self.chunks):
+            yield (value >> (chunk * self.chunk_bits)) & self.chunk_mask
+
+    def add(self, key: int, value: int) -> None:
+        """
+        Adds or replaces hash with given key.
+        """
+        self.discard(key)
+        self.hashes[key] = value
+        for table, substring in zip(self.tables, self.split(value)):
+            table[substring].add(key)
+
+    def discard(self, key: int) -> None:
+        """
+        Removes hash with given key if it exists.
+        """
+        value = self.hashes.pop(key, None)
+        if value is None:
+            return None
+
+        for table, substring in zip(self.tables, self.split(value)):
+            bucket = table[substring]
+            bucket.discard(key)
+            if not bucket:
+                del table[substring]
+
+    def candidates(self, value: int, max_distance: int) -> Set[int]:
+        """
+        Keys of hashes which might be within 'max_distance' from given hash.
+        """
+        masks = flip_masks(self.chunk_bits, max_distance // self.chunks)
+        keys = set()
+        for table, substring in zip(self.tables, self.split(value)):
+            for mask in masks:
+                keys.update(table.get(substring ^ mask, ()))
+
+        return keys
+
+    def search(self, value: int, max_distance: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (key, distance) of hashes within 'max_distance' from given hash.
+        """
+        for key in self.candidates(value, max_distance):
+            distance = hamming_distance(value, self.hashes[key])
+            if distance <= max_distance:
+                yield key, distance
+
+
+class ImageHashIndex(MutableMapping):
+    """
+    Mapping of image pk to image hash with near-duplicate search.
+    """
+    def __init__(self, items: Iterable[Tuple[int, Optional[imagehash.ImageHash]]] = ()) -> None:
+        self.index = MultiIndexHashing()
+        self.update(items)
+
+    def __getitem__(self, pk: int) -> imagehash.ImageHash:
+        return int_to_hash(self.index.hashes[pk])
+
+    def __setitem__(self, pk: int, image_hash: Optional[imagehash.ImageHash]) -> None:
+        if image_hash is None:
+            self.index.discard(pk)
+        else:
+            self.index.add(pk, hash_to_int(image_hash))
+
+    def __delitem__(self, pk: int) -> None:
+        if pk not in self.index.hashes:
+            raise KeyError(pk)
+        self.index.discard(pk)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.index.hashes)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, pk) -> bool:
+        return pk in self.index.hashes
+
+    def near_duplicates(self, image_hash: imagehash.ImageHash, distance: int) -> Dict[int, int]:
+        """
+        Returns {pk: distance} of stored hashes with Hamming distance less than 'distance' from given one.
+        """
+        return dict(self.index.search(hash_to_int(image_hash), distance - 1))
+
+    def has_near_duplicate(self, image_hash: imagehash.ImageHash, distance: int) -> bool:
+        """
+        Whether any stored hash has Hamming distance less than 'distance' from given one.
+        """
+        return next(self.index.search(hash_to_int(image_hash), distance - 1), None) is not None
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import PIL.Image
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+import archives.models
+from archives.helpers import file_uploads
+from archives.helpers.custom_functions import HASH_ALGORITHMS, PRIMARY_HASH_ALGORITHM
+
+
+def hash_file(path: str, algorithm: str) -> Optional[str]:
+    """
+    Returns hex hash of the image file made by given algorithm or None if file is not an image.
+    Runs in workers of the pool.
+    """
+    try:
+        with PIL.Image.open(path) as image:
+            return str(HASH_ALGORITHMS[algorithm](image))
+    except (OSError, SyntaxError, ValueError, PIL.Image.DecompressionBombError):
+        return None
+
+
+class ImageRehasher:
+    """
+    Makes image hashes by given algorithm in bulk. Images are read in batches in pk order, hashes are
+    made in process pool (or in thread pool if given) and written back by one UPDATE per batch. Primary algorithm hash is
+    written to 'image_hash' field unless the same hash is already taken by other image, hashes made
+    by other algorithms are written to 'hashes' field.
+    Daemonic processes like Celery prefork workers can't have children, therefore they should use
+    'ThreadPoolExecutor'.
+    """
+
+    def __init__(
+            self,
+            algorithm: str = PRIMARY_HASH_ALGORITHM,
+            only_missing: bool = True,
+            batch_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            progress: Optional[Callable[[Dict[str, float]], None]] = None,
+            executor_class: Optional[Type[Executor]] = None,
+    ) -> None:
+        assert algorithm in HASH_ALGORITHMS, f'Algorithm should be one of {", ".join(HASH_ALGORITHMS)}.'
+        self.algorithm = algorithm
+        self.only_missing = only_missing
+        self.batch_size = batch_size or settings.IMAGE_REHASH_BATCH_SIZE
+        self.workers = workers or settings.IMAGE_REHASH_WORKERS
+        self.progress = progress
+        self.executor_class = executor_class or ProcessPoolExecutor
+        self.is_primary = algorithm == PRIMARY_HASH_ALGORITHM
+        self.stats = {'processed': 0, 'updated': 0, 'failed': 0, 'duplicates': 0, 'seconds': 0.0}
+
+    def get_queryset(self):
+        queryset = archives.models.ImageModel.objects.order_by('pk').values_list('pk', 'image')
+        if self.only_missing:
+            queryset = queryset.filter(
+                Q(image_hash__isnull=True) if self.is_primary else ~Q(hashes__has_key=self.algorithm)
+            )
+        return queryset
+
+    def __call__(self) -> Dict[str, float]:
+        started = time.monotonic()
+        queryset = self.get_queryset()
+        last_pk = 0
+
+        with self.executor_class(max_workers=self.workers) as executor:
+            while batch := list(queryset.filter(pk__gt=last_pk)[:self.batch_size]):
+                pks, names = zip(*batch)
+                hashes = executor.map(
+                    hash_file,
+                    [file_uploads.image_storage.path(name) for name in names],
+                    [self.algorithm] * len(names),
+                    chunksize=max(1, len(names) // (self.workers * 4)),
+                )
+                results = [(pk, value) for pk, value in zip(pks, hashes) if value is not None]
+
+                self.stats['processed'] += len(pks)
+                self.stats['failed'] += len(pks) - len(results)
+                updated = self.update(results)
+                self.stats['updated'] += updated
+                if self.is_primary:
+                    self.stats['duplicates'] += len(results) - updated
+                self.stats['seconds'] = time.monotonic() - started
+                if self.progress is not None:
+                    self.progress(self.throughput())
+
+                last_pk = pks[-1]
+
+        #  Shared near-duplicate index is built from 'image_hash' field.
+        if self.is_primary and self.stats['updated']:
+            archives.models.ImageModel.stored_image_hash.rebuild()
+
+        return self.throughput()
+
+    def throughput(self) -> Dict[str, float]:
+        return {
+            **self.stats,
+            'images_per_second': self.stats['processed'] / self.stats['seconds'] if self.stats['seconds'] else 0.0,
+        }
+
+    def update(self, results: Sequence[Tuple[int, str]]) -> int:
+        """
+        Writes hashes to DB in one UPDATE. Returns number of updated images.
+        """
+        if not results:
+            return 0
+
+        table = archives.models.ImageModel._meta.db_table
+        if self.is_primary:
+            pks, values = self.unique_results(results)
+            sql = f"""
+                UPDATE {table} AS image SET image_hash = result.value
+                FROM unnest(%(pks)s::INTEGER[], %(values)s::VARCHAR[]) AS result(id, value)
+                WHERE image.id = result.id AND NOT EXISTS (
+                    SELECT 1 FROM {table} AS other WHERE other.image_hash = result.value AND other.id <> result.id
+                );
+                """
+        else:
+            pks, values = zip(*results)
+            sql = f"""
+                UPDATE {table} AS image SET hashes = image.hashes || jsonb_build_object(%(algorithm)s, result.value)
+                FROM unnest(%(pks)s::INTEGER[], %(values)s::VARCHAR[]) AS result(id, value)
+                WHERE image.id = result.id;
+                """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {'pks': list(pks), 'values': list(values), 'algorithm': self.algorithm, })
+            return cursor.rowcount
+
+    @staticmethod
+    def unique_results(results: Sequence[Tuple[int, str]]) -> Tuple[List[int], List[str]]:
+        """
+        Leaves only first image of each hash in the batch as 'image_hash' is unique.
+        """
+        first_pks = {}
+        for pk, value in results:
+            first_pks.setdefault(value, pk)
+        return list(first_pks.values()), list(first_pks)
+
+
+def rehash_images(algorithm: str = PRIMARY_HASH_ALGORITHM, only_missing: bool = True, **kwargs) -> Dict[str, float]:
+    """
+    Makes hashes of images by given algorithm.
+    """
+    return ImageRehasher(algorithm, only_missing, **kwargs)()
@@ -0,0 +1,243 @@
+import fcntl
+import hashlib
+import imghdr
+import os
+import re
+import time
+from typing import NamedTuple, Optional
+
+import PIL.Image
+import PIL.ImageFile
+import imagehash
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from rest_framework import exceptions
+
+from series import error_codes
+
+CONTENT_RANGE = re.compile(r'^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+)$')
+PART_SUFFIX = '.part'
+
+
+class ContentRange(NamedTuple):
+    start: int
+    end: int
+    total: int
+
+
+def parse_content_range(header: Optional[str]) -> Optional[ContentRange]:
+    """
+    Parses 'Content-Range: bytes <start>-<end>/<total>' header of the chunk of resumable upload.
+    """
+    if header is None:
+        return None
+
+    match = CONTENT_RANGE.match(header.strip())
+    if match is None:
+        raise exceptions.ValidationError(*error_codes.WRONG_CONTENT_RANGE)
+
+    content_range = ContentRange(*map(int, match.group('start', 'end', 'total')))
+    if not content_range.start <= content_range.end < content_range.total:
+        raise exceptions.ValidationError(*error_codes.WRONG_CONTENT_RANGE)
+
+    return content_range
+
+
+def check_size(size: Optional[int], max_size: int) -> None:
+    """
+    Raises validation error if size of the uploaded file exceeds maximum allowed one.
+    """
+    if size is not None and size > max_size:
+        raise exceptions.ValidationError(*error_codes.FILE_TOO_LARGE)
+
+
+class StreamedImageUpload(TemporaryUploadedFile):
+    """
+    Uploaded temporary file with content digest, image type and image hash computed while file
+    was received.
+    """
+    digest = None
+    image_type = None
+    image_hash = None
+
+
+class IncompleteUpload(NamedTuple):
+    """
+    Result of upload of the chunk which is not the last one in resumable upload.
+    """
+    received: int
+    total: int
+
+
+class ImageStreamProcessor:
+    """
+    Computes sha256 digest, image type and average hash of the image fed to it chunk by chunk.
+    Image is decoded incrementally by PIL parser, so that file content is read only once.
+    """
+    header_size = 32
+    chunk_size = 64 * 2 ** 10
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.header = b''
+        self.parser = PIL.ImageFile.Parser()
+        self.is_parsable = True
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        check_size(self.size, self.max_size)
+
+        self.digest.update(chunk)
+        if len(self.header) < self.header_size:
+            self.header += chunk[:self.header_size - len(self.header)]
+
+        if self.is_parsable:
+            try:
+                self.parser.feed(chunk)
+            except (OSError, SyntaxError, ValueError, PIL.Image.DecompressionBombError):
+                self.is_parsable = False
+
+    def feed_file(self, source, destination) -> None:
+        """
+        Feeds content of file 'source' and copies it to file 'destination'.
+        """
+        for chunk in iter(lambda: source.read(self.chunk_size), b''):
+            self.feed(chunk)
+            destination.write(chunk)
+
+    def finish(self, file: StreamedImageUpload) -> StreamedImageUpload:
+        """
+        Sets computed values to uploaded file.
+        """
+        file.size = self.size
+        file.digest = self.digest.hexdigest()
+        file.image_type = imghdr.what(None, h=self.header)
+
+        if self.is_parsable:
+            try:
+                image = self.parser.close()
+            except (OSError, SyntaxError, ValueError, PIL.Image.DecompressionBombError):
+                pass
+            else:
+                file.image_hash = imagehash.average_hash(image)
+
+        file.seek(0)
+        return file
+
+
+class StreamingImageUploadHandler(FileUploadHandler):
+    """
+    Streams uploaded image to temporary file in chunks and processes it by 'ImageStreamProcessor'
+    in the same pass. Files larger than IMAGE_UPLOAD_MAX_SIZE are rejected.
+    Request with 'Content-Range' header is a chunk of resumable upload. Chunks are appended to
+    part file in IMAGE_UPLOAD_PARTS_DIR identified by 'upload_id' and total size and are expected
+    in order. Once last chunk is received, part file is processed and turned into uploaded file,
+    otherwise 'IncompleteUpload' is returned.
+    """
+    chunk_size = 64 * 2 ** 10
+
+    def __init__(self, request=None, upload_id: str = '') -> None:
+        super().__init__(request)
+        self.upload_id = upload_id
+        self.max_size = settings.IMAGE_UPLOAD_MAX_SIZE
+        self.content_range = None
+        self.processor = None
+        self.part = None
+        self.file = None
+        self.received = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.content_range = parse_content_range(META.get('HTTP_CONTENT_RANGE'))
+        if self.content_range is None:
+            check_size(content_length, self.max_size)
+        else:
+            check_size(self.content_range.total, self.max_size)
+            chunk_length = self.content_range.end - self.content_range.start + 1
+            if content_length is not None and content_length != chunk_length:
+                raise exceptions.ValidationError(*error_codes.WRONG_CONTENT_RANGE)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+
+        if self.content_range is None:
+            self.processor = ImageStreamProcessor(self.max_size)
+            self.file = self.create_file()
+        else:
+            self.part = open(self.part_path, 'ab')
+            fcntl.flock(self.part, fcntl.LOCK_EX)
+            self.received = self.part.tell()
+            if self.received != self.content_range.start:
+                self.part.close()
+                raise exceptions.ValidationError(
+                    {'detail': error_codes.WRONG_UPLOAD_OFFSET.message, 'received': self.received},
+                    code=error_codes.WRONG_UPLOAD_OFFSET.code,
+                )
+
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.part is None:
+            self.processor.feed(raw_data)
+            self.file.write(raw_data)
+        else:
+            self.received += len(raw_data)
+            if self.received > self.content_range.end + 1:
+                self.part.close()
+                raise exceptions.ValidationError(*error_codes.WRONG_CONTENT_RANGE)
+            self.part.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.part is None:
+            return self.processor.finish(self.file)
+
+        try:
+            if self.received < self.content_range.total:
+                return IncompleteUpload(self.received, self.content_range.total)
+
+            self.part.flush()
+            self.processor = ImageStreamProcessor(self.max_size)
+            self.file = self.create_file()
+            with open(self.part_path, 'rb') as part:
+                self.processor.feed_file(part, self.file)
+            os.remove(self.part_path)
+            return self.processor.finish(self.file)
+        finally:
+            self.part.close()
+
+    def upload_interrupted(self):
+        if self.part is not None:
+            self.part.close()
+        if self.file is not None:
+            self.file.close()
+
+    def create_file(self) -> StreamedImageUpload:
+        return StreamedImageUpload(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+
+    @property
+    def part_path(self) -> str:
+        key = hashlib.sha256(f'{self.upload_id}:{self.content_range.total}'.encode()).hexdigest()
+        os.makedirs(settings.IMAGE_UPLOAD_PARTS_DIR, exist_ok=True)
+        return os.path.join(settings.IMAGE_UPLOAD_PARTS_DIR, key + PART_SUFFIX)
+
+
+def delete_stale_parts(max_age: int) -> int:
+    """
+    Deletes part files of resumable uploads which were not updated for 'max_age' seconds.
+    Returns number of deleted files.
+    """
+    directory = settings.IMAGE_UPLOAD_PARTS_DIR
+    if not os.path.isdir(directory):
+        return 0
+
+    deleted = 0
+    threshold = time.time() - max_age
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(PART_SUFFIX) and entry.stat().st_mtime < threshold:
+                os.remove(entry.path)
+                deleted += 1
+
+    return deleted
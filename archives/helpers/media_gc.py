@@ -0,0 +1,206 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Sequence, Set, Tuple
+
+import more_itertools
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+import archives.models
+from administration.models import MediaGCPhaseChoices, MediaGarbageCollectionRun
+
+#  Only this number of failed deletions is stored in run statistics.
+MAX_ERRORS = 100
+
+
+def iterate_files(
+        path: str,
+        parts: Tuple[str, ...] = (),
+        after: Tuple[str, ...] = (),
+        empty_folders: Optional[Set[str]] = None,
+) -> Iterator[Tuple[Tuple[str, ...], os.DirEntry]]:
+    """
+    Yields (relative path parts, entry) of files in folder 'path' in depth-first order with
+    entries of each folder sorted by name, which is the order of path parts tuples.
+    Files up to and including 'after' are skipped without scanning folders they are in.
+    Empty folders found on the way are added to 'empty_folders'.
+    """
+    with os.scandir(path) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+
+    if not entries and empty_folders is not None:
+        empty_folders.add(path)
+
+    for entry in entries:
+        entry_parts = (*parts, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            if entry_parts >= after[:len(entry_parts)]:
+                yield from iterate_files(entry.path, entry_parts, after, empty_folders)
+        elif entry_parts > after:
+            yield entry_parts, entry
+
+
+class MediaGarbageCollector:
+    """
+    Incremental mark-and-sweep garbage collector of media root.
+    Images phase - images which files do not exist are deleted. Images are checked in batches
+    ordered by pk.
+    Files phase - media root is walked by 'iterate_files', files are checked in batches against image
+    files and image derivatives in DB and unreferenced ones are deleted in thread pool. Files
+    modified during last MEDIA_GC_GRACE_PERIOD seconds are kept as they might be uploaded right now.
+    Folders which became empty are deleted afterwards.
+    Statistics and checkpoint are saved in 'MediaGarbageCollectionRun' after each batch, therefore
+    interrupted run can be resumed.
+    """
+
+    def __init__(
+            self,
+            run: MediaGarbageCollectionRun,
+            root: Optional[str] = None,
+            batch_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            grace_period: Optional[int] = None,
+    ) -> None:
+        self.run = run
+        self.root = os.path.normpath(root or os.path.join(settings.BASE_DIR, settings.MEDIA_ROOT))
+        self.batch_size = batch_size or settings.MEDIA_GC_BATCH_SIZE
+        self.workers = workers or settings.MEDIA_GC_WORKERS
+        self.grace_period = settings.MEDIA_GC_GRACE_PERIOD if grace_period is None else grace_period
+
+    @classmethod
+    def start(cls, dry_run: bool = False, resume: bool = False, **kwargs) -> 'MediaGarbageCollector':
+        """
+        Creates collector for the new run or for the last unfinished one if 'resume'.
+        """
+        run = None
+        if resume:
+            run = MediaGarbageCollectionRun.objects.filter(
+                finished_at__isnull=True,
+                is_dry_run=dry_run,
+            ).order_by('-started_at').first()
+
+        if run is None:
+            run = MediaGarbageCollectionRun.objects.create(is_dry_run=dry_run)
+
+        return cls(run, **kwargs)
+
+    def __call__(self) -> MediaGarbageCollectionRun:
+        with ThreadPoolExecutor(max_workers=self.workers) as self.executor:
+            if self.run.phase == MediaGCPhaseChoices.IMAGES:
+                self.collect_images()
+                self.run.phase = MediaGCPhaseChoices.FILES
+                self.run.save(update_fields=['phase'])
+
+            if self.run.phase == MediaGCPhaseChoices.FILES:
+                self.collect_files()
+
+        self.run.phase = MediaGCPhaseChoices.DONE
+        self.run.finished_at = timezone.now()
+        self.run.save()
+        return self.run
+
+    def collect_images(self) -> None:
+        """
+        Deletes images which files do not exist.
+        """
+        images = archives.models.ImageModel.objects.order_by('pk').values_list('pk', 'image')
+
+        while batch := list(images.filter(pk__gt=self.run.last_image_pk)[:self.batch_size]):
+            pks, names = zip(*batch)
+            exist = self.executor.map(os.path.exists, (os.path.join(self.root, name) for name in names))
+            dead = [pk for pk, is_existing in zip(pks, exist) if not is_existing]
+
+            if dead and not self.run.is_dry_run:
+                archives.models.ImageModel.objects.filter(pk__in=dead).delete()
+
+            self.run.images_deleted += len(dead)
+            self.run.last_image_pk = pks[-1]
+            self.run.save()
+
+    def collect_files(self) -> None:
+        """
+        Deletes files which are neither image files nor image derivatives.
+        """
+        after = tuple(self.run.last_path.split(os.sep)) if self.run.last_path else ()
+        threshold = time.time() - self.grace_period
+        folders = set()
+        files = iterate_files(self.root, after=after, empty_folders=folders)
+
+        for batch in more_itertools.chunked(files, self.batch_size):
+            paths = [os.sep.join(parts) for parts, entry in batch]
+            referenced = self.referenced(paths)
+
+            garbage = []
+            for path, (parts, entry) in zip(paths, batch):
+                stat = entry.stat(follow_symlinks=False)
+                if path not in referenced and stat.st_mtime < threshold:
+                    garbage.append((entry.path, stat.st_size))
+
+            if self.run.is_dry_run:
+                deleted = garbage
+            else:
+                results = self.executor.map(self.delete_file, (file_path for file_path, size in garbage))
+                deleted = [file for file, is_deleted in zip(garbage, results) if is_deleted]
+                folders.update(os.path.dirname(file_path) for file_path, size in deleted)
+
+            self.run.files_scanned += len(batch)
+            self.run.files_deleted += len(deleted)
+            self.run.bytes_deleted += sum(size for file_path, size in deleted)
+            self.run.last_path = paths[-1]
+            self.run.save()
+
+        if not self.run.is_dry_run:
+            self.run.folders_deleted += self.delete_empty_folders(folders)
+
+    def referenced(self, paths: Sequence[str]) -> Set[str]:
+        """
+        Returns paths which are files or derivatives of images in DB.
+        """
+        table = archives.models.ImageModel._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT path FROM unnest(%(paths)s::TEXT[]) AS path
+                WHERE
+                    EXISTS (SELECT 1 FROM {table} WHERE image = path) OR
+                    EXISTS (
+                        SELECT 1 FROM {table}, unnest(%(names)s::TEXT[]) AS name
+                        WHERE derivatives @> jsonb_build_object(name, path)
+                    );
+                """,
+                {'paths': list(paths), 'names': list(settings.IMAGE_DERIVATIVES), })
+            return {path for path, in cursor.fetchall()}
+
+    def delete_file(self, path: str) -> bool:
+        try:
+            os.remove(path)
+        except OSError:
+            if len(self.run.errors) < MAX_ERRORS:
+                self.run.errors.append(os.path.relpath(path, self.root))
+            return False
+        return True
+
+    def delete_empty_folders(self, folders: Set[str]) -> int:
+        """
+        Deletes given folders and their parents up to media root if they are empty.
+        """
+        deleted = 0
+        for folder in sorted(folders, key=lambda path: path.count(os.sep), reverse=True):
+            while folder != self.root and folder.startswith(self.root + os.sep):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break
+                deleted += 1
+                folder = os.path.dirname(folder)
+
+        return deleted
+
+
+def collect_media_garbage(dry_run: bool = False, resume: bool = True, **kwargs) -> MediaGarbageCollectionRun:
+    """
+    Runs media root garbage collector.
+    """
+    return MediaGarbageCollector.start(dry_run=dry_run, resume=resume, **kwargs)()
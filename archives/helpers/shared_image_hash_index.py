@@ -0,0 +1,356 @@
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import imagehash
+import redis
+
+from archives.helpers.image_hash_index import flip_masks, hamming_distance, hash_to_int, int_to_hash
+
+#  Bucket entry - image pk and 64 bit hash, 12 bytes.
+ENTRY = struct.Struct('>IQ')
+PK = struct.Struct('>I')
+HASH = struct.Struct('>Q')
+
+CHUNKS = 4
+CHUNK_BITS = 16
+
+#  KEYS - hashes, buckets of each chunk. ARGV - channel, pk, new hash (empty string to delete).
+#  Substring of chunk i is 2 bytes of big endian hash, chunk 0 keeps lowest bits.
+UPDATE_SCRIPT = """
+local function substring(hash, chunk)
+    return string.sub(hash, 7 - 2 * chunk, 8 - 2 * chunk)
+end
+
+local function remove_entry(key, field, pk)
+    local bucket = redis.call('HGET', key, field)
+    if not bucket then
+        return
+    end
+    local kept = {}
+    for position = 1, #bucket, 12 do
+        local entry = string.sub(bucket, position, position + 11)
+        if string.sub(entry, 1, 4) ~= pk then
+            table.insert(kept, entry)
+        end
+    end
+    if #kept == 0 then
+        redis.call('HDEL', key, field)
+    else
+        redis.call('HSET', key, field, table.concat(kept))
+    end
+end
+
+local channel, pk, new_hash = ARGV[1], ARGV[2], ARGV[3]
+local old_hash = redis.call('HGET', KEYS[1], pk)
+local invalidated = {}
+
+for chunk = 0, #KEYS - 2 do
+    local key = KEYS[chunk + 2]
+    if old_hash then
+        remove_entry(key, substring(old_hash, chunk), pk)
+        table.insert(invalidated, string.char(chunk) .. substring(old_hash, chunk))
+    end
+    if new_hash ~= '' then
+        local field = substring(new_hash, chunk)
+        redis.call('HSET', key, field, (redis.call('HGET', key, field) or '') .. pk .. new_hash)
+        table.insert(invalidated, string.char(chunk) .. field)
+    end
+end
+
+if new_hash ~= '' then
+    redis.call('HSET', KEYS[1], pk, new_hash)
+else
+    redis.call('HDEL', KEYS[1], pk)
+end
+redis.call('PUBLISH', channel, table.concat(invalidated))
+return old_hash
+"""
+
+
+def is_pk(key) -> bool:
+    """
+    Whether key can be image pk packed to index. Unsaved image has pk None.
+    """
+    return isinstance(key, int) and 0 <= key < 2 ** 32
+
+
+class SharedImageHashIndex(MutableMapping):
+    """
+    Mapping of image pk to image hash with near-duplicate search shared by all processes via Redis.
+    Keys layout:
+        '<prefix>:hashes' - Redis hash of 4 byte pk to 8 byte image hash.
+        '<prefix>:chunk:<i>' - multi-index hashing tables, Redis hash of 2 byte hash substring to
+        bucket of 12 byte (pk, hash) entries.
+        '<prefix>:source' - identifier of the DB table index is built from.
+    Buckets fetched by process are kept in local LRU cache. Each update publishes changed buckets
+    to '<prefix>:changes' channel, which subscribed processes drop from their caches.
+    """
+    def __init__(
+            self,
+            client: redis.Redis,
+            prefix: str,
+            source: Callable[[], str],
+            loader: Callable[[], Iterable[Tuple[int, imagehash.ImageHash]]],
+            cache_size: int = 2 ** 16,
+    ) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.source = source
+        self.loader = loader
+        self.cache_size = cache_size
+
+        self.hashes_key = f'{prefix}:hashes'
+        self.chunk_keys = [f'{prefix}:chunk:{chunk}' for chunk in range(CHUNKS)]
+        self.source_key = f'{prefix}:source'
+        self.lock_key = f'{prefix}:lock'
+        self.channel = f'{prefix}:changes'
+
+        self.update_script = client.register_script(UPDATE_SCRIPT)
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.subscriber = None
+        self.is_built = False
+
+    def __getitem__(self, pk: int) -> imagehash.ImageHash:
+        if not is_pk(pk):
+            raise KeyError(pk)
+        self.ensure_built()
+        value = self.client.hget(self.hashes_key, PK.pack(pk))
+        if value is None:
+            raise KeyError(pk)
+        return int_to_hash(HASH.unpack(value)[0])
+
+    def __setitem__(self, pk: int, image_hash: Optional[imagehash.ImageHash]) -> None:
+        self.ensure_built()
+        self.set_hash(pk, b'' if image_hash is None else HASH.pack(hash_to_int(image_hash)))
+
+    def __delitem__(self, pk: int) -> None:
+        if not is_pk(pk):
+            raise KeyError(pk)
+        self.ensure_built()
+        if self.set_hash(pk, b'') is None:
+            raise KeyError(pk)
+
+    def __iter__(self) -> Iterator[int]:
+        self.ensure_built()
+        for pk in self.client.hscan_iter(self.hashes_key):
+            yield PK.unpack(pk[0])[0]
+
+    def __len__(self) -> int:
+        self.ensure_built()
+        return self.client.hlen(self.hashes_key)
+
+    def __contains__(self, pk) -> bool:
+        if not is_pk(pk):
+            return False
+        self.ensure_built()
+        return self.client.hexists(self.hashes_key, PK.pack(pk))
+
+    def set_hash(self, pk: int, value: bytes) -> Optional[bytes]:
+        """
+        Atomically replaces or deletes (if value is empty) hash of image with given pk.
+        Returns former hash.
+        """
+        old_value = self.update_script(
+            keys=[self.hashes_key, *self.chunk_keys],
+            args=[self.channel, PK.pack(pk), value],
+        )
+        self.invalidate(self.buckets_of(old_value) + self.buckets_of(value))
+        return old_value
+
+    @staticmethod
+    def buckets_of(value: Optional[bytes]) -> List[Tuple[int, bytes]]:
+        """
+        (chunk, substring) pairs of buckets which hold given packed hash.
+        """
+        if not value:
+            return []
+        return [(chunk, value[6 - 2 * chunk:8 - 2 * chunk]) for chunk in range(CHUNKS)]
+
+    def ensure_built(self) -> None:
+        """
+        Builds index from DB unless it's already built from the same DB table. Only one process
+        builds index, others wait for it.
+        """
+        if self.is_built:
+            return None
+
+        source = self.source()
+        if self.client.get(self.source_key) != source.encode():
+            with self.client.lock(self.lock_key, timeout=600):
+                if self.client.get(self.source_key) != source.encode():
+                    self.build(source)
+
+        self.is_built = True
+
+    def rebuild(self) -> None:
+        """
+        Rebuilds index from DB unconditionally.
+        """
+        with self.client.lock(self.lock_key, timeout=600):
+            self.build(self.source())
+
+    def build(self, source: str, batch_size: int = 10000) -> None:
+        """
+        Rebuilds index from scratch. Buckets are collected in memory and written in batches.
+        """
+        self.client.delete(self.source_key, self.hashes_key, *self.chunk_keys)
+        buckets = [{} for _ in range(CHUNKS)]
+        hashes = {}
+
+        def write(key: str, mapping: dict) -> None:
+            items = list(mapping.items())
+            for start in range(0, len(items), batch_size):
+                self.client.hset(key, mapping=dict(items[start:start + batch_size]))
+
+        for pk, image_hash in self.loader():
+            entry = ENTRY.pack(pk, hash_to_int(image_hash))
+            hashes[entry[:4]] = entry[4:]
+            for chunk, substring in self.buckets_of(entry[4:]):
+                buckets[chunk].setdefault(substring, bytearray()).extend(entry)
+
+            if len(hashes) >= batch_size:
+                write(self.hashes_key, hashes)
+                hashes = {}
+
+        write(self.hashes_key, hashes)
+        for key, chunk_buckets in zip(self.chunk_keys, buckets):
+            write(key, {substring: bytes(bucket) for substring, bucket in chunk_buckets.items()})
+
+        self.client.set(self.source_key, source)
+        self.client.publish(self.channel, b'')
+
+    def invalidate(self, buckets: Iterable[Tuple[int, bytes]] = None) -> None:
+        """
+        Drops given buckets or whole cache from local cache.
+        """
+        with self.cache_lock:
+            if buckets is None:
+                self.cache.clear()
+            for bucket in buckets or ():
+                self.cache.pop(bucket, None)
+
+    def handle_message(self, message: dict) -> None:
+        """
+        Pub/sub handler. Empty message means that index was rebuilt.
+        """
+        data = message['data']
+        if not data:
+            self.is_built = False
+            return self.invalidate()
+
+        self.invalidate(
+            (data[position], data[position + 1:position + 3]) for position in range(0, len(data), 3)
+        )
+
+    def warm_up(self) -> None:
+        """
+        Builds index if needed and subscribes for changes made by other processes. Until then
+        buckets are not cached locally. Supposed to be called once in each worker process.
+        """
+        self.ensure_built()
+        if self.subscriber is None or not self.subscriber.is_alive():
+            self.invalidate()
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self.handle_message})
+            self.subscriber = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    @property
+    def is_cache_enabled(self) -> bool:
+        """
+        Buckets are cached only while changes of other processes are received.
+        """
+        return self.subscriber is not None and self.subscriber.is_alive()
+
+    def fetch_buckets(self, keys: List[Tuple[int, bytes]]) -> Dict[Tuple[int, bytes], bytes]:
+        """
+        Returns buckets from local cache or from Redis in one round trip.
+        """
+        buckets = {}
+        if self.is_cache_enabled:
+            with self.cache_lock:
+                for key in keys:
+                    if key in self.cache:
+                        self.cache.move_to_end(key)
+                        buckets[key] = self.cache[key]
+
+        missing = [key for key in keys if key not in buckets]
+        if missing:
+            chunks = sorted({chunk for chunk, substring in missing})
+            pipeline = self.client.pipeline(transaction=False)
+            for chunk in chunks:
+                pipeline.hmget(
+                    self.chunk_keys[chunk],
+                    [substring for key_chunk, substring in missing if key_chunk == chunk],
+                )
+            fetched = {}
+            for chunk, values in zip(chunks, pipeline.execute()):
+                chunk_keys = [key for key in missing if key[0] == chunk]
+                fetched.update(zip(chunk_keys, (value or b'' for value in values)))
+            buckets.update(fetched)
+
+            if self.is_cache_enabled:
+                with self.cache_lock:
+                    self.cache.update(fetched)
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+
+        return buckets
+
+    def search(self, value: int, max_distance: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (pk, distance) of hashes within 'max_distance' from given hash.
+        """
+        self.ensure_built()
+        masks = flip_masks(CHUNK_BITS, max_distance // CHUNKS)
+        packed = HASH.pack(value)
+        keys = [
+            (chunk, (int.from_bytes(substring, 'big') ^ mask).to_bytes(2, 'big'))
+            for chunk, substring in self.buckets_of(packed)
+            for mask in masks
+        ]
+
+        seen = set()
+        for bucket in self.fetch_buckets(keys).values():
+            for pk, stored in ENTRY.iter_unpack(bucket):
+                if pk in seen:
+                    continue
+                seen.add(pk)
+                distance = hamming_distance(value, stored)
+                if distance <= max_distance:
+                    yield pk, distance
+
+    def near_duplicates(self, image_hash: imagehash.ImageHash, distance: int) -> Dict[int, int]:
+        """
+        Returns {pk: distance} of stored hashes with Hamming distance less than 'distance' from given one.
+        """
+        return dict(self.search(hash_to_int(image_hash), distance - 1))
+
+    def has_near_duplicate(self, image_hash: imagehash.ImageHash, distance: int) -> bool:
+        """
+        Whether any stored hash has Hamming distance less than 'distance' from given one.
+        """
+        return next(self.search(hash_to_int(image_hash), distance - 1), None) is not None
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Bytes taken by index in Redis and by local bucket cache of this process.
+        """
+        pipeline = self.client.pipeline(transaction=False)
+        for key in (self.hashes_key, *self.chunk_keys):
+            pipeline.memory_usage(key)
+        redis_bytes = sum(filter(None, pipeline.execute()))
+
+        with self.cache_lock:
+            cache_bytes = sum(len(bucket) for bucket in self.cache.values())
+            cache_buckets = len(self.cache)
+
+        return {
+            'images': self.client.hlen(self.hashes_key),
+            'redis_bytes': redis_bytes,
+            'local_cache_buckets': cache_buckets,
+            'local_cache_bytes': cache_bytes,
+        }
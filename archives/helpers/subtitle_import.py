@@ -0,0 +1,296 @@
+import contextlib
+import io
+import os
+import re
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection, transaction
+from django.db.models import Model
+
+import archives.models
+from archives.helpers import language_codes, subtitle_ingestion, subtitles
+from archives.key_constructors import bump_subtitles_version
+from series import error_codes
+
+SUBTITLES_EXTENSION = '.srt'
+#  Episode number in file names like 'Show.S01E05.en.srt', 'Show.1x05.srt', 'Episode 5.srt', '05.srt'.
+EPISODE_NUMBER_PATTERNS = (
+    re.compile(r's\d{1,2}\s*e(\d{1,3})', re.IGNORECASE),
+    re.compile(r'\d{1,2}x(\d{1,3})', re.IGNORECASE),
+    re.compile(r'ep(?:isode)?[\s._-]*(\d{1,3})', re.IGNORECASE),
+    re.compile(r'(\d{1,3})(?!.*\d)'),
+)
+
+
+class ParsedSubtitle(NamedTuple):
+    """
+    Subtitles file decoded and parsed in worker process.
+    """
+    name: str
+    episode_number: int
+    language: str
+    fts_text: str
+    cues: List[subtitles.Cue]
+    data: bytes
+    size: int
+
+
+class ImportResult(NamedTuple):
+    """
+    Result of import of one file of archive.
+    """
+    name: str
+    episode_number: Optional[int] = None
+    language: Optional[str] = None
+    subtitle_id: Optional[int] = None
+    error: Optional[dict] = None
+
+
+def error_description(error) -> dict:
+    """
+    Error of the file in the same format as in failed subtitles ingestion job.
+    """
+    return {'code': error.code, 'messages': [error.message]}
+
+
+def episode_number_from_name(name: str) -> Optional[int]:
+    stem = os.path.splitext(os.path.basename(name))[0]
+    for pattern in EPISODE_NUMBER_PATTERNS:
+        match = pattern.search(stem)
+        if match is not None:
+            return int(match.group(1))
+    return None
+
+
+def language_from_name(name: str) -> Optional[str]:
+    """
+    Returns language code from file names like 'Show.S01E05.en.srt'.
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    _, _, suffix = stem.rpartition('.')
+    suffix = suffix.lower()
+    return suffix if suffix in language_codes.codes_iterator else None
+
+
+def read_archive(file: Union[str, io.IOBase]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yields (name, content) of subtitles files in zip or tar archive.
+    """
+    if zipfile.is_zipfile(file):
+        with zipfile.ZipFile(file) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.lower().endswith(SUBTITLES_EXTENSION):
+                    yield member.filename, archive.read(member)
+    else:
+        if not isinstance(file, str):
+            file.seek(0)
+        with tarfile.open(**({'name': file} if isinstance(file, str) else {'fileobj': file})) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(SUBTITLES_EXTENSION):
+                    yield member.name, archive.extractfile(member).read()
+
+
+def parse_file(name: str, raw: bytes, language: Optional[str] = None) -> Union[ParsedSubtitle, ImportResult]:
+    """
+    Decodes, parses and compresses subtitles file. Runs in worker processes.
+    Returns failed 'ImportResult' if file can't be parsed.
+    """
+    episode_number = episode_number_from_name(name)
+    if episode_number is None:
+        return ImportResult(name, error=error_description(error_codes.EPISODE_NUMBER_UNDETECTED))
+
+    try:
+        text = subtitle_ingestion.decode(raw)
+        language = language or language_from_name(name) or subtitle_ingestion.detect_language(text)
+    except subtitle_ingestion.IngestionError as err:
+        return ImportResult(name, episode_number, error=error_description(err))
+
+    text, fts_text = subtitle_ingestion.normalize(text)
+    return ParsedSubtitle(
+        name,
+        episode_number,
+        language,
+        fts_text,
+        subtitles.parse_srt(text),
+        **archives.models.SubtitleText.compressed(text),
+    )
+
+
+def fts_index_names(model: Model) -> List[str]:
+    return [
+        index.name for index in model._meta.indexes if isinstance(index, GinIndex) and 'full_text' in index.fields
+    ]
+
+
+@contextlib.contextmanager
+def deferred_gin_maintenance(*index_names: str) -> Iterator[None]:
+    """
+    FTS GIN indexes are created with fastupdate=False, therefore each inserted tsvector updates index
+    right away. During bulk load new entries are collected in pending list instead and merged into
+    index at once afterwards. Should be used inside transaction.
+    """
+    with connection.cursor() as cursor:
+        for name in index_names:
+            cursor.execute(f'ALTER INDEX {connection.ops.quote_name(name)} SET (fastupdate = on);')
+        yield
+        for name in index_names:
+            cursor.execute('SELECT gin_clean_pending_list(%s::regclass);', [connection.ops.quote_name(name)])
+            cursor.execute(f'ALTER INDEX {connection.ops.quote_name(name)} SET (fastupdate = off);')
+
+
+def copy_escape(value: Union[str, int]) -> str:
+    """
+    Escapes value for COPY text format.
+    """
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class SubtitlesImporter:
+    """
+    Imports archive of subtitles files of one season.
+    Files are decoded, parsed and compressed in process pool, episode numbers and languages are taken
+    from file names. Subtitles and their texts are loaded by multi-row INSERT, cues by COPY and lexemes
+    of both are generated by one set-based UPDATE per table with GIN maintenance deferred. Files which
+    can't be parsed or conflict with existing subtitles are reported and skipped.
+    """
+
+    def __init__(
+            self,
+            season: 'archives.models.SeasonModel',
+            language: Optional[str] = None,
+            workers: Optional[int] = None,
+    ) -> None:
+        self.season = season
+        self.language = language
+        self.workers = workers or settings.SUBTITLE_IMPORT_WORKERS
+
+    def __call__(self, file: Union[str, io.IOBase]) -> List[ImportResult]:
+        files = list(read_archive(file))
+        if not files:
+            return []
+        names, contents = zip(*files)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            parsed = list(executor.map(parse_file, names, contents, [self.language] * len(names)))
+
+        failed = [result for result in parsed if isinstance(result, ImportResult)]
+        valid, rejected = self.validate([result for result in parsed if isinstance(result, ParsedSubtitle)])
+
+        return failed + rejected + self.load(valid)
+
+    def validate(self, parsed: Sequence[ParsedSubtitle]) -> Tuple[List[ParsedSubtitle], List[ImportResult]]:
+        """
+        Rejects subtitles in languages which are not ISO 639 codes (detector can return codes like
+        'zh-cn'), subtitles of episodes season doesn't have and ones which already exist in DB or
+        archive. Subtitles are bulk created without validation, therefore one wrong file would fail
+        whole archive otherwise.
+        """
+        existing = set(self.season.subtitle.values_list('episode_number', 'language'))
+        valid, rejected = [], []
+
+        for subtitle in parsed:
+            key = (subtitle.episode_number, subtitle.language)
+            if subtitle.language not in language_codes.codes_iterator:
+                error = error_codes.WRONG_LANGUAGE_CODE
+            elif subtitle.episode_number > self.season.number_of_episodes:
+                error = error_codes.SUB_EPISODE_NUM_GT_SEASON_EPISODE_NUM
+            elif key in existing:
+                error = error_codes.SUBTITLES_ALREADY_EXIST
+            else:
+                existing.add(key)
+                valid.append(subtitle)
+                continue
+            rejected.append(ImportResult(subtitle.name, *key, error=error_description(error)))
+
+        return valid, rejected
+
+    @transaction.atomic
+    def load(self, parsed: Sequence[ParsedSubtitle]) -> List[ImportResult]:
+        if not parsed:
+            return []
+
+        manager = archives.models.Subtitles.objects
+        created = manager.bulk_create([
+            archives.models.Subtitles(
+                season=self.season,
+                episode_number=subtitle.episode_number,
+                language=subtitle.language,
+                search_configuration=manager.get_search_configuration(subtitle.language),
+            ) for subtitle in parsed
+        ])
+        pks = [subtitle.pk for subtitle in created]
+        archives.models.SubtitleText.objects.bulk_create([
+            archives.models.SubtitleText(subtitle_id=pk, data=subtitle.data, size=subtitle.size)
+            for pk, subtitle in zip(pks, parsed)
+        ])
+
+        self.copy_cues(zip(pks, parsed))
+        with deferred_gin_maintenance(
+                *fts_index_names(archives.models.Subtitles),
+                *fts_index_names(archives.models.SubtitleCue),
+        ):
+            self.generate_lexemes(pks, [subtitle.fts_text for subtitle in parsed])
+        #  Bulk create doesn't send signals which invalidate FTS responses cache.
+        bump_subtitles_version()
+        transaction.on_commit(bump_subtitles_version)
+
+        return [
+            ImportResult(subtitle.name, subtitle.episode_number, subtitle.language, pk)
+            for pk, subtitle in zip(pks, parsed)
+        ]
+
+    @staticmethod
+    def copy_cues(subtitles_with_pks: Iterator[Tuple[int, ParsedSubtitle]]) -> None:
+        buffer = io.StringIO()
+        for pk, subtitle in subtitles_with_pks:
+            for cue in subtitle.cues:
+                buffer.write('\t'.join(map(copy_escape, (pk, *cue))) + '\n')
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"""
+                COPY {archives.models.SubtitleCue._meta.db_table} (subtitle_id, number, start_ms, end_ms, text)
+                FROM STDIN;
+                """,
+                buffer,
+            )
+
+    @staticmethod
+    def generate_lexemes(pks: List[int], fts_texts: List[str]) -> None:
+        """
+        Fills lexemes of loaded subtitles from their texts prepared for FTS and lexemes of their cues.
+        """
+        subtitles_table = archives.models.Subtitles._meta.db_table
+        cues_table = archives.models.SubtitleCue._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {subtitles_table} AS subtitle
+                SET full_text = to_tsvector(subtitle.search_configuration::regconfig, source.text)
+                FROM unnest(%(pks)s::INTEGER[], %(texts)s::TEXT[]) AS source(id, text)
+                WHERE subtitle.id = source.id;
+                UPDATE {cues_table} AS cue
+                SET full_text = to_tsvector(subtitle.search_configuration::regconfig, cue.text)
+                FROM {subtitles_table} AS subtitle
+                WHERE subtitle.id = cue.subtitle_id AND subtitle.id = ANY(%(pks)s);
+                """,
+                {'pks': pks, 'texts': fts_texts, },
+            )
+
+
+def import_subtitles(
+        season: 'archives.models.SeasonModel',
+        file: Union[str, io.IOBase],
+        **kwargs,
+) -> List[ImportResult]:
+    """
+    Imports archive of subtitles files of the season.
+    """
+    return SubtitlesImporter(season, **kwargs)(file)
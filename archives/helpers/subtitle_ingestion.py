@@ -0,0 +1,156 @@
+import logging
+import re
+from typing import Tuple
+
+import chardet
+from django.contrib.postgres.search import SearchVector
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Value
+from django.utils import timezone
+from langdetect import detect, lang_detect_exception
+
+import archives.models
+from archives.models import SubtitleIngestionStageChoices as Stages, SubtitleIngestionStatusChoices as Statuses
+from series import error_codes
+
+logger = logging.getLogger(__name__)
+
+#  Subtitles timings like 00:00:13,320 are converted to 000013320 in text for FTS in order to avoid
+#  FTS parsing them to a bunch of plain integers.
+TIMING = re.compile(r'(\d\d):(\d\d):(\d\d),(\d\d\d)')
+#  Encoding is detected by this number of first bytes of file at most.
+ENCODING_DETECTION_LIMIT = 100 * 1000
+
+
+class IngestionError(Exception):
+    """
+    Subtitles file can't be ingested.
+    """
+    def __init__(self, message: str, code: str) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def detect_encoding(raw: bytes) -> str:
+    """
+    Returns encoding of subtitles file detected by first ENCODING_DETECTION_LIMIT bytes.
+    """
+    detector = chardet.UniversalDetector()
+    for start in range(0, min(len(raw), ENCODING_DETECTION_LIMIT), 1000):
+        detector.feed(raw[start: start + 1000])
+        if detector.done:
+            break
+    detector.close()
+
+    encoding = detector.result['encoding']
+    if encoding is None:
+        raise IngestionError(*error_codes.SUBTITLE_ENCODING_UNDETECTED)
+    return encoding
+
+
+def decode(raw: bytes) -> str:
+    try:
+        return raw.decode(encoding=detect_encoding(raw), errors='strict')
+    except (UnicodeDecodeError, LookupError) as err:
+        raise IngestionError(*error_codes.SUBTITLE_ENCODING_UNDETECTED) from err
+
+
+def detect_language(text: str) -> str:
+    """
+    Returns language code of subtitles detected by first 1000 characters.
+    """
+    try:
+        return detect(text[:1000])
+    except lang_detect_exception.LangDetectException as err:
+        raise IngestionError(*error_codes.LANGUAGE_UNDETECTED) from err
+
+
+def normalize(text: str) -> Tuple[str, str]:
+    """
+    Returns text to store with BOM removed and line breaks unified and text for FTS with timings
+    converted to single tokens.
+    """
+    text = text.lstrip('﻿').replace('\r\n', '\n').replace('\r', '\n')
+    return text, TIMING.sub(r'\1\2\3\4', text)
+
+
+class SubtitleIngestion:
+    """
+    Ingests uploaded subtitles file of the job by stages:
+    encoding detection -> language detection -> normalization -> lexemes generation.
+    Lexemes are generated in the same INSERT that creates subtitles. Current stage is saved in job,
+    failed job keeps stage and error it failed with. Unexpected errors are logged and re-raised
+    after job is marked as failed.
+    """
+
+    def __init__(self, job: 'archives.models.SubtitleIngestionJob') -> None:
+        self.job = job
+
+    def __call__(self) -> 'archives.models.SubtitleIngestionJob':
+        self.job.status = Statuses.RUNNING
+        try:
+            self.set_stage(Stages.ENCODING)
+            text = decode(bytes(self.job.raw))
+
+            self.set_stage(Stages.LANGUAGE)
+            language = self.job.language or detect_language(text)
+
+            self.set_stage(Stages.NORMALIZATION)
+            text, fts_text = normalize(text)
+
+            self.set_stage(Stages.LEXEMES)
+            self.job.subtitle = self.create_subtitle(text, fts_text, language)
+        except IngestionError as err:
+            self.fail(err.code, [err.message])
+        except ValidationError as err:
+            self.fail('invalid', err.messages)
+        except Exception:
+            logger.exception(f'Subtitles ingestion job {self.job.pk} failed at stage {self.job.stage}.')
+            message, code = error_codes.SUBTITLE_INGESTION_FAILED
+            self.fail(code, [message])
+            self.finish()
+            raise
+        else:
+            self.job.status = Statuses.DONE
+            self.job.raw = None
+
+        self.finish()
+        return self.job
+
+    def finish(self) -> None:
+        self.job.finished_at = timezone.now()
+        self.job.save()
+
+    def set_stage(self, stage: str) -> None:
+        self.job.stage = stage
+        self.job.save(update_fields=['status', 'stage'])
+
+    def fail(self, code: str, messages: list) -> None:
+        self.job.status = Statuses.FAILED
+        self.job.error = {'code': code, 'messages': messages}
+
+    @transaction.atomic
+    def create_subtitle(self, text: str, fts_text: str, language: str) -> 'archives.models.Subtitles':
+        config = archives.models.Subtitles.objects.get_search_configuration(language)
+        subtitle = archives.models.Subtitles(
+            season=self.job.season,
+            episode_number=self.job.episode_number,
+            language=language,
+            text=text,
+            search_configuration=config,
+            full_text=SearchVector(Value(fts_text), config=config),
+        )
+        subtitle.save()
+        archives.models.SubtitleCue.objects.rebuild(subtitle, config)
+
+        return subtitle
+
+
+def ingest_subtitles(pk: int) -> 'archives.models.SubtitleIngestionJob':
+    """
+    Ingests subtitles of pending job.
+    """
+    job = archives.models.SubtitleIngestionJob.objects.select_related('season').get(pk=pk)
+    return SubtitleIngestion(job)()
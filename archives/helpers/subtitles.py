@@ -0,0 +1,62 @@
+import re
+import zlib
+from typing import List, NamedTuple
+
+TIMESTAMP = r'(\d{1,2}):(\d{2}):(\d{2})[,.](\d{1,3})'
+TIMING = re.compile(rf'^\s*{TIMESTAMP}\s*-->\s*{TIMESTAMP}')
+BLOCK_SEPARATOR = re.compile(r'\n\s*\n')
+TAG = re.compile(r'<[^>]+>|{\\[^}]*}')
+#  Raw subtitles text is written once and read rarely, therefore best compression is used.
+COMPRESSION_LEVEL = 9
+
+
+class Cue(NamedTuple):
+    """
+    One subtitle cue - text shown on screen between 'start_ms' and 'end_ms' milliseconds.
+    """
+    number: int
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+def to_milliseconds(hours: str, minutes: str, seconds: str, fraction: str) -> int:
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(fraction.ljust(3, '0'))
+
+
+def parse_srt(text: str) -> List[Cue]:
+    """
+    Parses SRT subtitles into cues numbered in order of appearance. Blocks without timing line or
+    text are skipped, formatting tags are removed and text lines are joined by space.
+    """
+    cues = []
+    text = text.lstrip('﻿').replace('\r\n', '\n').replace('\r', '\n')
+
+    for block in BLOCK_SEPARATOR.split(text.strip()):
+        lines = block.split('\n')
+        for position, line in enumerate(lines[:2]):
+            match = TIMING.match(line)
+            if match is not None:
+                break
+        else:
+            continue
+
+        cue_text = ' '.join(
+            stripped for stripped in (TAG.sub('', line).strip() for line in lines[position + 1:]) if stripped
+        )
+        if cue_text:
+            groups = match.groups()
+            cues.append(Cue(len(cues) + 1, to_milliseconds(*groups[:4]), to_milliseconds(*groups[4:]), cue_text))
+
+    return cues
+
+
+def compress(text: str) -> bytes:
+    """
+    Compresses raw subtitles text for storage.
+    """
+    return zlib.compress(text.encode(), COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode()
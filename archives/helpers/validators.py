@@ -214,7 +214,11 @@ class IsImageValidator:
 
     @__call__.register(File)
     def _(self, value: File) -> None:
-        is_image_file = imghdr.what(value, h=None)
+        #  Type of streamed upload is sniffed while it is received, therefore file is not read once again.
+        #  Field file wraps uploaded file.
+        is_image_file = getattr(value, 'image_type', None) or \
+            getattr(getattr(value, 'file', None), 'image_type', None) or \
+            imghdr.what(value, h=None)
         self.raise_exception(is_image_file)
 
     @__call__.register(str)
@@ -0,0 +1,141 @@
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_extensions.key_constructor import bits
+from rest_framework_extensions.key_constructor.constructors import KeyConstructor
+
+from series import constants
+
+CATALOGUE_VERSION_CACHE_KEY = 'tvseries_catalogue_version'
+SERIES_VERSION_CACHE_KEY = 'tvseries_version'
+CATALOGUE_VERSION = 'catalogue'
+SUBTITLES_VERSION_CACHE_KEY = 'subtitles_version'
+
+
+def bump_series_versions(series_pks: Iterable[Optional[int]] = ()) -> None:
+    """
+    Invalidates cached responses of series list and responses of detail view of each series in 'series_pks'.
+    """
+    timeout = constants.TIMEOUTS['tvseriesmodel']
+    value = timezone.now().isoformat()
+
+    cache.set(key=CATALOGUE_VERSION_CACHE_KEY, value=value, timeout=timeout, version=CATALOGUE_VERSION)
+    for pk in set(series_pks) - {None}:
+        cache.set(key=SERIES_VERSION_CACHE_KEY, value=value, timeout=timeout, version=int(pk))
+
+
+def bump_subtitles_version() -> None:
+    """
+    Invalidates cached responses of full text search over subtitles.
+    """
+    cache.set(
+        key=SUBTITLES_VERSION_CACHE_KEY,
+        value=timezone.now().isoformat(),
+        timeout=constants.TIMEOUTS['subtitles'],
+    )
+
+
+class SeriesPermissionClassBit(bits.KeyBitBase):
+    """
+    Returns category of request user in respect of series output. Staff and series owner see
+    additional data in series detail. Any authenticated user can read series.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        if request.user.is_staff:
+            return 'staff'
+
+        series_pk = kwargs.get(view_instance.lookup_url_kwarg)
+        if series_pk is not None:
+            is_owner = view_instance.model.objects.filter(
+                pk=series_pk,
+                entry_author_id=request.user.pk,
+            ).exists()
+            if is_owner:
+                return 'owner'
+
+        return 'reader'
+
+
+class CatalogueVersionBit(bits.KeyBitBase):
+    """
+    Returns version of series catalogue as a whole. Sets it in cache if one is not present yet.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        value = cache.get_or_set(
+            key=CATALOGUE_VERSION_CACHE_KEY,
+            default=timezone.now().isoformat(),
+            timeout=constants.TIMEOUTS['tvseriesmodel'],
+            version=CATALOGUE_VERSION,
+        )
+        return value
+
+
+class SeriesVersionBit(bits.KeyBitBase):
+    """
+    Returns version of a single series. Sets it in cache if one is not present yet.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        value = cache.get_or_set(
+            key=SERIES_VERSION_CACHE_KEY,
+            default=timezone.now().isoformat(),
+            timeout=constants.TIMEOUTS['tvseriesmodel'],
+            version=int(kwargs[view_instance.lookup_url_kwarg]),
+        )
+        return value
+
+
+class SubtitlesVersionBit(bits.KeyBitBase):
+    """
+    Returns version of subtitles as a whole. Sets it in cache if one is not present yet.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        value = cache.get_or_set(
+            key=SUBTITLES_VERSION_CACHE_KEY,
+            default=timezone.now().isoformat(),
+            timeout=constants.TIMEOUTS['subtitles'],
+        )
+        return value
+
+
+class TvSeriesListKeyConstructor(KeyConstructor):
+    """
+    Cache key constructor for 'TvSeriesListCreateView' list action.
+    """
+    unique_method_id = bits.UniqueMethodIdKeyBit()
+    query_param = bits.QueryParamsKeyBit()
+    permission_class = SeriesPermissionClassBit()
+    catalogue_version = CatalogueVersionBit()
+
+
+class TvSeriesDetailKeyConstructor(KeyConstructor):
+    """
+    Cache key constructor for 'TvSeriesDetailView' retrieve action.
+    """
+    unique_method_id = bits.UniqueMethodIdKeyBit()
+    query_param = bits.QueryParamsKeyBit()
+    kwargs = bits.KwargsKeyBit()
+    permission_class = SeriesPermissionClassBit()
+    series_version = SeriesVersionBit()
+
+
+class FTSListKeyConstructor(KeyConstructor):
+    """
+    Cache key constructor for 'FTSListViewSet' list action.
+    """
+    unique_method_id = bits.UniqueMethodIdKeyBit()
+    query_param = bits.QueryParamsKeyBit()
+    subtitles_version = SubtitlesVersionBit()
+
+
+class FTSSuggestionsKeyConstructor(KeyConstructor):
+    """
+    Cache key constructor for 'FTSListViewSet' suggestions action.
+    """
+    unique_method_id = bits.UniqueMethodIdKeyBit()
+    query_param = bits.QueryParamsKeyBit()
+    subtitles_version = SubtitlesVersionBit()
@@ -0,0 +1,72 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from archives.helpers.image_hash_index import MultiIndexHashing, hamming_distance
+
+
+class Command(BaseCommand):
+    """
+    Measures near-duplicate image hash search on synthetic hashes.
+    """
+    help = 'Compares linear scan over image hashes with multi-index hashing search.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=10 ** 6,
+            help='Number of synthetic 64 bit hashes in index.',
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=100,
+            help='Number of searches to measure. Half of them have near duplicates.',
+        )
+        parser.add_argument(
+            '--distance',
+            type=int,
+            default=10,
+            help='Hashes with Hamming distance less than this one are near duplicates.',
+        )
+
+    def handle(self, *args, **options):
+        size, number, distance = options['size'], options['queries'], options['distance']
+        rng = random.Random(0)
+        hashes = [rng.getrandbits(64) for _ in range(size)]
+
+        start = time.perf_counter()
+        index = MultiIndexHashing()
+        for key, value in enumerate(hashes):
+            index.add(key, value)
+        self.stdout.write(f'build: {time.perf_counter() - start:.2f} s for {size} hashes')
+
+        def flip(value: int, bits: int) -> int:
+            for bit in rng.sample(range(64), bits):
+                value ^= 1 << bit
+            return value
+
+        queries = [
+            flip(rng.choice(hashes), rng.randrange(distance)) if i % 2 else rng.getrandbits(64)
+            for i in range(number)
+        ]
+
+        def linear_scan(value):
+            return any(hamming_distance(value, stored) < distance for stored in hashes)
+
+        def index_search(value):
+            return next(index.search(value, distance - 1), None) is not None
+
+        results = {}
+        for search in (linear_scan, index_search):
+            start = time.perf_counter()
+            found = [search(value) for value in queries]
+            results[search.__name__] = (time.perf_counter() - start) / number, found
+
+        assert results['linear_scan'][1] == results['index_search'][1], 'Search results differ.'
+
+        for name, (seconds, found) in results.items():
+            self.stdout.write(f'{name}: {seconds * 10 ** 3:.3f} ms per search, {sum(found)} found')
+        self.stdout.write(f'speedup: x{results["linear_scan"][0] / results["index_search"][0]:.0f}')
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from archives.helpers import fts_dictionaries
+
+
+class Command(BaseCommand):
+    """
+    Shows cost of loading FTS dictionaries by new DB connection or installs shared dictionaries.
+    """
+    help = 'Measures loading of FTS dictionaries on cold and warm DB connection. ' \
+           'Replaces hunspell dictionaries with shared ones with --install-shared option.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--install-shared',
+            action='store_true',
+            help='Install "shared_ispell" dictionaries.',
+        )
+
+    def handle(self, *args, **options):
+        if options['install_shared']:
+            fts_dictionaries.install_shared_dictionaries(connection)
+            self.stdout.write(self.style.SUCCESS('Shared dictionaries are installed.'))
+
+        with fts_dictionaries.cold_connection(connection.alias) as cold_connection:
+            for configuration in settings.FTS_WARM_UP_CONFIGURATIONS:
+                cold = fts_dictionaries.load_configuration(cold_connection, configuration)
+                warm = fts_dictionaries.load_configuration(cold_connection, configuration)
+                self.stdout.write(f'{configuration}: cold {cold:.1f} ms, warm {warm:.1f} ms')
+
+        for configuration, stats in fts_dictionaries.timings.items():
+            self.stdout.write(
+                f'{configuration} warm-up in this process: {stats["connections"]} connections, '
+                f'last {stats["last_ms"]:.1f} ms, max {stats["max_ms"]:.1f} ms'
+            )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+import archives.models
+
+
+class Command(BaseCommand):
+    """
+    Reports near-duplicate images.
+    """
+    help = 'Lists pairs of images which hashes have Hamming distance less than given one.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--distance',
+            type=int,
+            default=10,
+            help='Images with Hamming distance of hashes less than this one are near duplicates.',
+        )
+
+    def handle(self, *args, **options):
+        pairs = archives.models.ImageModel.objects.duplicate_pairs(options['distance'])
+
+        for pk, duplicate_pk, distance in pairs:
+            self.stdout.write(f'{pk} - {duplicate_pk}: {distance}')
+        self.stdout.write(self.style.SUCCESS(f'{len(pairs)} pairs of near-duplicate images found.'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from archives.models import ImageModel
+
+
+class Command(BaseCommand):
+    """
+    Shows memory taken by shared image hash index or rebuilds it.
+    """
+    help = 'Shows memory usage of shared image hash index. Rebuilds it from DB with --rebuild option.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Rebuild index from DB.',
+        )
+
+    def handle(self, *args, **options):
+        index = ImageModel.stored_image_hash
+
+        if options['rebuild']:
+            index.rebuild()
+            self.stdout.write('Index is rebuilt.')
+
+        for name, value in index.memory_usage().items():
+            self.stdout.write(f'{name}: {value}')
@@ -0,0 +1,62 @@
+import tarfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from archives.helpers import language_codes, subtitle_import
+from archives.models import SeasonModel
+
+
+class Command(BaseCommand):
+    """
+    Imports zip or tar archive of season subtitles files.
+    """
+    help = 'Imports archive of .srt files of the season. Episode numbers and languages are taken from file names.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'season',
+            type=int,
+            help='Season pk.',
+        )
+        parser.add_argument(
+            'archive',
+            help='Path to zip or tar archive.',
+        )
+        parser.add_argument(
+            '--language',
+            help='Language code of all files. Otherwise taken from file name or detected.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of parsing processes.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            season = SeasonModel.objects.get(pk=options['season'])
+        except SeasonModel.DoesNotExist as err:
+            raise CommandError(f'Season {options["season"]} does not exist.') from err
+
+        language = options['language']
+        if language is not None and language not in language_codes.codes_iterator:
+            raise CommandError(f'Wrong language code {language}.')
+
+        try:
+            results = subtitle_import.import_subtitles(
+                season,
+                options['archive'],
+                language=language,
+                workers=options['workers'],
+            )
+        except tarfile.ReadError as err:
+            raise CommandError(f'{options["archive"]} is neither zip nor tar archive.') from err
+
+        for result in sorted(results, key=lambda result: result.name):
+            if result.error is None:
+                self.stdout.write(f'{result.name}: episode {result.episode_number}, {result.language}')
+            else:
+                self.stderr.write(f'{result.name}: {" ".join(result.error["messages"])}')
+
+        imported = sum(result.error is None for result in results)
+        self.stdout.write(self.style.SUCCESS(f'{imported} of {len(results)} files are imported.'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from archives.helpers import media_gc
+
+
+class Command(BaseCommand):
+    """
+    Runs media root garbage collector.
+    """
+    help = 'Deletes files in MEDIA_ROOT which are not used by images and images which files do not exist.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report garbage without deleting it.',
+        )
+        parser.add_argument(
+            '--no-resume',
+            action='store_true',
+            help='Start new run instead of resuming last unfinished one.',
+        )
+
+    def handle(self, *args, **options):
+        run = media_gc.collect_media_garbage(dry_run=options['dry_run'], resume=not options['no_resume'])
+
+        self.stdout.write('\n'.join((
+            f'Images deleted - {run.images_deleted}',
+            f'Files scanned - {run.files_scanned}',
+            f'Files deleted - {run.files_deleted}, {run.bytes_deleted} bytes',
+            f'Empty folders deleted - {run.folders_deleted}',
+            f'Errors - {len(run.errors)} {run.errors}',
+        )))
+        self.stdout.write(self.style.SUCCESS(f'{"Dry run" if run.is_dry_run else "Run"} {run.pk} finished.'))
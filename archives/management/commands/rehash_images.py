@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from archives.helpers import image_rehash
+from archives.helpers.custom_functions import HASH_ALGORITHMS, PRIMARY_HASH_ALGORITHM
+
+
+class Command(BaseCommand):
+    """
+    Makes image hashes in bulk.
+    """
+    help = 'Makes missing image hashes by given algorithm or re-hashes all images with --all option.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--algorithm',
+            choices=list(HASH_ALGORITHMS),
+            default=PRIMARY_HASH_ALGORITHM,
+            help=f'Hash algorithm. "{PRIMARY_HASH_ALGORITHM}" hash is written to "image_hash" field, '
+                 f'others to "hashes" field.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-hash images which already have hash of this algorithm.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Number of images read and updated at once.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of hashing processes.',
+        )
+
+    def handle(self, *args, **options):
+        stats = image_rehash.rehash_images(
+            options['algorithm'],
+            only_missing=not options['all'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            progress=self.report,
+        )
+        self.report(stats)
+        self.stdout.write(self.style.SUCCESS(f'{stats["updated"]} images are updated.'))
+
+    def report(self, stats: dict) -> None:
+        self.stdout.write(
+            f'processed {stats["processed"]}, updated {stats["updated"]}, failed {stats["failed"]}, '
+            f'duplicates {stats["duplicates"]} - {stats["images_per_second"]:.1f} images/s'
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+import archives.models
+
+
+class Command(BaseCommand):
+    """
+    Verifies or rebuilds denormalized series statistics.
+    """
+    help = 'Verifies that series statistics are in sync with seasons or rebuilds them from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recalculate statistics of all series.',
+        )
+
+    def handle(self, *args, **options):
+        manager = archives.models.SeriesStatisticsModel.objects
+
+        if options['rebuild']:
+            entries_count = manager.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Statistics of {entries_count} series were rebuilt.'))
+            return
+
+        mismatched_series = manager.verify()
+        if mismatched_series:
+            raise CommandError(
+                f'Statistics of series {", ".join(map(str, mismatched_series))} are out of sync. '
+                f'Run command with --rebuild option.'
+            )
+        self.stdout.write(self.style.SUCCESS('Series statistics are in sync.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+import archives.models
+
+
+class Command(BaseCommand):
+    """
+    Verifies or rebuilds vocabulary of subtitles lexemes.
+    """
+    help = 'Verifies that vocabulary of subtitles lexemes is in sync with subtitles or rebuilds it from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recalculate vocabulary of all search configurations.',
+        )
+
+    def handle(self, *args, **options):
+        manager = archives.models.SubtitleLexeme.objects
+
+        if options['rebuild']:
+            lexemes_count = manager.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Vocabulary of {lexemes_count} lexemes was rebuilt.'))
+            return
+
+        mismatched_configs = manager.verify()
+        if mismatched_configs:
+            raise CommandError(
+                f'Vocabulary of search configurations {", ".join(mismatched_configs)} is out of sync. '
+                f'Run command with --rebuild option.'
+            )
+        self.stdout.write(self.style.SUCCESS('Vocabulary of subtitles lexemes is in sync.'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+import archives.models
+
+
+class Command(BaseCommand):
+    """
+    Shows storage used by compressed subtitles texts.
+    """
+    help = 'Shows uncompressed and stored sizes of subtitles texts and sizes of subtitles tables.'
+
+    def handle(self, *args, **options):
+        report = archives.models.SubtitleText.objects.storage_report()
+        ratio = report['stored_bytes'] / report['raw_bytes'] if report['raw_bytes'] else 0.0
+
+        self.stdout.write(f'Subtitles texts: {report["texts"]}')
+        self.stdout.write(f'Uncompressed size: {filesizeformat(report["raw_bytes"])}')
+        self.stdout.write(f'Stored size: {filesizeformat(report["stored_bytes"])} ({ratio:.1%})')
+        self.stdout.write(f'Subtitles table total size: {filesizeformat(report["subtitles_table_bytes"])}')
+        self.stdout.write(f'Texts table total size: {filesizeformat(report["texts_table_bytes"])}')
+        self.stdout.write(self.style.SUCCESS(f'Saved: {filesizeformat(report["saved_bytes"])}'))
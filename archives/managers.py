@@ -1,16 +1,23 @@
 import datetime
-from typing import List
+import functools
+import os
+import uuid
+from typing import Dict, List, Optional, Tuple
 
 import guardian.models
 import more_itertools
 from django.contrib.postgres.aggregates import BoolAnd, StringAgg
-from django.db import connection, models
+from django.contrib.postgres.search import SearchQuery, SearchQueryField, SearchRank, SearchVector, \
+    TrigramSimilarity
+from django.db import connection, connections, models, transaction
 from django.db.models import Case, CharField, F, FloatField, Max, Min, OuterRef, \
-    Q, Subquery, When, functions
+    Q, Subquery, Sum, When, functions
 from django.utils.functional import cached_property
 from psycopg2.extras import DateRange
 
-from archives.helpers import language_codes
+from archives.helpers import file_uploads, image_derivatives, language_codes, subtitles
+from archives.helpers.image_hash_index import flip_masks
+import series.celery
 from series import error_codes
 from series.constants import DEFAULT_OBJECT_LEVEL_PERMISSION_CODE
 
@@ -130,8 +137,72 @@ class EmptyTvSeriesManager(TvSeriesManager):
     def get_queryset(self):
         """
         Returns only series with no seasons (empty series).
+        Empty series do not have statistics entry.
         """
-        return super().get_queryset().filter(seasons__isnull=True)
+        return super().get_queryset().filter(statistics__isnull=True)
+
+# -----------------------------------------------------------------------------------
+
+
+class SeriesStatisticsQueryset(models.QuerySet):
+    """
+    SeriesStatisticsModel custom queryset.
+    """
+    pass
+
+
+class SeriesStatisticsManager(models.Manager):
+    """
+    SeriesStatisticsModel custom manager.
+    """
+    #  Statistics calculated straight from seasons table. One row per each non-empty series.
+    calculate_sql = """
+        SELECT
+            season.series_id,
+            count(*),
+            sum(season.number_of_episodes),
+            coalesce(sum(season.last_watched_episode), 0),
+            max(episode.last_date)
+        FROM
+            archives_seasonmodel AS season
+            LEFT JOIN LATERAL (SELECT max(value::date) AS last_date FROM each(season.episodes)) AS episode
+            ON true
+        GROUP BY
+            season.series_id
+        """
+    columns = 'series_id, seasons_cnt, episodes_cnt, watched_episodes_cnt, last_episode_date'
+
+    def rebuild(self) -> int:
+        """
+        Recalculates statistics of all series from scratch. Returns number of statistics entries.
+        """
+        table = self.model._meta.db_table
+
+        with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN EXCLUSIVE MODE;')
+            cursor.execute(f'DELETE FROM {table};')
+            cursor.execute(f'INSERT INTO {table} ({self.columns}) {self.calculate_sql};')
+            return cursor.rowcount
+
+    def verify(self) -> List[int]:
+        """
+        Returns pks of series whose stored statistics differ from the actual ones.
+        """
+        table = self.model._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT series_id FROM (
+                    (SELECT {self.columns} FROM {table} EXCEPT {self.calculate_sql})
+                    UNION
+                    ({self.calculate_sql} EXCEPT SELECT {self.columns} FROM {table})
+                ) AS mismatch
+                ORDER BY series_id;
+                """
+            )
+            return [series_id for [series_id] in cursor.fetchall()]
+
 
 # -----------------------------------------------------------------------------------
 
@@ -167,12 +238,113 @@ class ImageQueryset(models.QuerySet):
         obj.save(force_insert=True, using=self.db, fc=fc)
         return obj
 
+    def near_duplicates(self, image_hash, distance: int = 10) -> models.QuerySet:
+        """
+        Images which hashes have Hamming distance less than 'distance' to given hash.
+        """
+        return self.filter(image_hash__hamming_lt=(image_hash, distance))
+
 
 class ImageManager(models.Manager):
     """
     ImageModel custom manager.
     """
-    pass
+
+    def duplicate_pairs(self, distance: int = 10) -> List[Tuple[int, int, int]]:
+        """
+        Returns (pk, duplicate pk, distance) of all pairs of images which hashes have Hamming
+        distance less than 'distance'. Duplicates of each image are found via indexes on 16 bit
+        chunks of the hash, same way as in 'hamming_lt' lookup.
+        """
+        table = self.model._meta.db_table
+        chunk_conditions = ' OR '.join(
+            f"""
+            ((duplicate.image_hash_bits >> {shift}) & 65535) = ANY(ARRAY(
+                SELECT ((image.image_hash_bits >> {shift}) & 65535) # mask FROM unnest(%(masks)s::BIGINT[]) AS mask
+            ))
+            """ for shift in (0, 16, 32, 48)
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT image.id, duplicate.id, duplicate.distance
+                FROM {table} AS image
+                CROSS JOIN LATERAL (
+                    SELECT
+                        duplicate.id,
+                        hamming_distance(image.image_hash_bits, duplicate.image_hash_bits) AS distance
+                    FROM {table} AS duplicate
+                    WHERE duplicate.id > image.id AND ({chunk_conditions})
+                ) AS duplicate
+                WHERE image.image_hash_bits IS NOT NULL AND duplicate.distance < %(distance)s
+                ORDER BY image.id, duplicate.id;
+                """,
+                {'masks': list(flip_masks(16, (distance - 1) // 4)), 'distance': distance, })
+            return cursor.fetchall()
+
+
+class ImageBlobManager(models.Manager):
+    """
+    ImageBlob custom manager.
+    """
+
+    def acquire(self, file, filename: str) -> models.Model:
+        """
+        Returns blob of the file content, creates it if it doesn't exist yet, and marks the file by
+        it. Reference to the blob is counted once image referring to it is saved, therefore blob row
+        is locked and should be acquired in the transaction the image is saved in, so that blob is
+        not released meanwhile.
+        """
+        assert transaction.get_connection(self.db).in_atomic_block, 'Blob should be acquired in transaction.'
+        digest = getattr(file, 'digest', None) or file_uploads.file_digest(file)
+        blob, created = self.select_for_update().get_or_create(
+            digest=digest,
+            defaults={'path': file_uploads.content_addressed_path(digest, filename)},
+        )
+        file.blob = blob
+        return blob
+
+    def release(self, digest: str) -> Optional[str]:
+        """
+        Deletes blob which is not referenced by any image anymore and sends its file and file
+        derivatives for deletion. Returns storage path of deleted file.
+        Files are renamed before blob deletion is committed, as blob row lock makes concurrent upload
+        of the same content wait, so that it doesn't find file which is about to be deleted. Renamed
+        files are renamed back if blob deletion is rolled back. Blob is released on commit of image
+        deletion, therefore its transaction is the outermost one.
+        """
+        renamed = []
+        try:
+            with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE FROM {self.model._meta.db_table}
+                    WHERE digest = %s AND reference_count = 0
+                    RETURNING path;
+                    """,
+                    (digest, ))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+
+                [path] = row
+                for file_path in (path, *image_derivatives.derivative_paths(path)):
+                    full_path = file_uploads.image_storage.path(file_path)
+                    deleted_path = f'{full_path}.{uuid.uuid4().hex}.deleted'
+                    try:
+                        os.replace(full_path, deleted_path)
+                    except FileNotFoundError:
+                        continue
+                    renamed.append((full_path, deleted_path))
+                    transaction.on_commit(
+                        functools.partial(series.celery.delete_file.delay, deleted_path), using=self.db,
+                    )
+        except Exception:
+            for full_path, deleted_path in reversed(renamed):
+                os.replace(deleted_path, full_path)
+            raise
+
+        return path
 
 
 # -----------------------------------------------------------------------------------
@@ -224,7 +396,49 @@ class SubtitlesQueryset(models.QuerySet):
     """
     Subtitles model  custom queryset.
     """
-    pass
+
+    def full_text_search(
+            self,
+            search: str,
+            search_type: str = 'plain',
+            language_code: Optional[str] = None,
+    ) -> models.QuerySet:
+        """
+        Filters subtitles that match search query and annotates them with 'search_query' and
+        'search_rank'.
+        Tsquery made with config taken from 'search_configuration' column is computed per row and
+        can't use GIN index, therefore tsquery is made for each search configuration as a constant
+        and conditions (search_configuration = config AND full_text @@ tsquery) are OR-ed, so that
+        each of them is an index scan on partial or common GIN index on 'full_text'.
+        """
+        if language_code is not None:
+            configs = [self.model.objects.get_search_configuration(language_code)]
+            queryset = self.filter(language=language_code)
+        else:
+            configs = self.model.objects.search_configurations()
+            queryset = self
+
+        if not configs:
+            return queryset.none()
+
+        condition = Q()
+        search_queries = []
+        search_ranks = []
+        for config in configs:
+            search_query = SearchQuery(search, config=config, search_type=search_type)
+            condition |= Q(search_configuration=config, full_text=search_query)
+            search_queries.append(When(search_configuration=config, then=search_query))
+            search_ranks.append(When(
+                search_configuration=config,
+                then=SearchRank(F('full_text'), search_query, cover_density=True, normalization=32),
+            ))
+
+        return queryset.filter(condition).annotate(
+            search_query=Case(*search_queries, output_field=SearchQueryField()),
+            #  Rank is real, it is cast to double precision to compare equal to its value passed back by
+            #  top-k pagination token.
+            search_rank=functions.Cast(Case(*search_ranks), output_field=FloatField()),
+        )
 
 
 class SubtitlesManager(models.Manager):
@@ -266,5 +480,177 @@ class SubtitlesManager(models.Manager):
 
         return config
 
+    def search_configurations(self) -> List[str]:
+        """
+        Returns FTS configurations subtitles in DB are indexed with. Distinct values are taken by
+        recursive loose index scan on 'search_configuration' index instead of scanning whole table.
+        """
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH RECURSIVE configs AS (
+                    (SELECT search_configuration AS config FROM {table}
+                     WHERE search_configuration IS NOT NULL ORDER BY search_configuration LIMIT 1)
+                    UNION ALL
+                    SELECT (SELECT search_configuration FROM {table}
+                            WHERE search_configuration > configs.config ORDER BY search_configuration LIMIT 1)
+                    FROM configs WHERE configs.config IS NOT NULL
+                )
+                SELECT config FROM configs WHERE config IS NOT NULL;
+                """)
+            return [config for config, in cursor.fetchall()]
+
+
+class SubtitleCueManager(models.Manager):
+    """
+    SubtitleCue model custom manager.
+    """
+
+    @transaction.atomic
+    def rebuild(self, subtitle: models.Model, config: str) -> int:
+        """
+        Replaces cues of given subtitles with ones parsed from its text and fills their lexemes with
+        given search configuration. Returns number of cues.
+        """
+        self.filter(subtitle=subtitle).delete()
+        cues = self.bulk_create([
+            self.model(subtitle=subtitle, **cue._asdict()) for cue in subtitles.parse_srt(subtitle.text)
+        ])
+        self.filter(subtitle=subtitle).update(full_text=SearchVector(F('text'), config=config))
+
+        return len(cues)
+
+
+class SubtitleTextManager(models.Manager):
+    """
+    SubtitleText model custom manager.
+    """
+
+    def storage_report(self) -> Dict[str, int]:
+        """
+        Returns number of texts, their uncompressed and stored sizes in bytes and total sizes of
+        subtitles table and texts table including TOAST and indexes.
+        """
+        table = self.model._meta.db_table
+        subtitles_table = self.model._meta.get_field('subtitle').related_model._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    count(*),
+                    coalesce(sum(size), 0),
+                    coalesce(sum(octet_length(data)), 0),
+                    pg_total_relation_size(%s::regclass),
+                    pg_total_relation_size(%s::regclass)
+                FROM {table};
+                """,
+                [subtitles_table, table],
+            )
+            texts, raw_bytes, stored_bytes, subtitles_table_bytes, texts_table_bytes = cursor.fetchone()
+
+        return {
+            'texts': texts,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'saved_bytes': raw_bytes - stored_bytes,
+            'subtitles_table_bytes': subtitles_table_bytes,
+            'texts_table_bytes': texts_table_bytes,
+        }
 
 
+class SubtitleLexemeQueryset(models.QuerySet):
+    """
+    SubtitleLexeme model custom queryset.
+    """
+
+    def vocabulary(self, configs: Optional[List[str]] = None) -> models.QuerySet:
+        """
+        Returns words of given search configurations (all by default) with their document
+        frequencies summed up across configurations.
+        """
+        queryset = self if configs is None else self.filter(search_configuration__in=configs)
+        return queryset.values('word').annotate(document_frequency=Sum('ndoc'))
+
+    def completions(self, term: str, configs: Optional[List[str]] = None) -> models.QuerySet:
+        """
+        Returns most frequent words which start with the term.
+        """
+        return self.vocabulary(configs).filter(
+            word__startswith=term,
+        ).annotate(
+            similarity=TrigramSimilarity('word', term),
+        ).order_by(
+            '-document_frequency',
+            'word',
+        )
+
+    def corrections(self, term: str, configs: Optional[List[str]] = None) -> models.QuerySet:
+        """
+        Returns words similar to the term by trigrams, most similar first.
+        """
+        return self.vocabulary(configs).filter(
+            word__trigram_similar=term,
+        ).exclude(
+            word__startswith=term,
+        ).annotate(
+            similarity=TrigramSimilarity('word', term),
+        ).order_by(
+            '-similarity',
+            '-document_frequency',
+        )
+
+
+class SubtitleLexemeManager(models.Manager):
+    """
+    SubtitleLexeme model custom manager.
+    """
+    #  Vocabulary calculated by 'ts_stat' straight from subtitles table, one 'ts_stat' call per
+    #  search configuration.
+    calculate_sql = """
+        SELECT
+            config.name,
+            stat.word,
+            stat.ndoc,
+            stat.nentry
+        FROM
+            (SELECT DISTINCT search_configuration AS name FROM archives_subtitles
+             WHERE search_configuration IS NOT NULL AND full_text IS NOT NULL) AS config,
+            LATERAL ts_stat(format(
+                'SELECT full_text FROM archives_subtitles WHERE search_configuration = %L AND full_text IS NOT NULL',
+                config.name
+            )) AS stat
+        """
+    columns = 'search_configuration, word, ndoc, nentry'
+
+    def rebuild(self) -> int:
+        """
+        Recalculates vocabulary from scratch. Returns number of lexemes.
+        """
+        table = self.model._meta.db_table
+
+        with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN EXCLUSIVE MODE;')
+            cursor.execute(f'DELETE FROM {table};')
+            cursor.execute(f'INSERT INTO {table} ({self.columns}) {self.calculate_sql};')
+            return cursor.rowcount
+
+    def verify(self) -> List[str]:
+        """
+        Returns search configurations whose stored vocabulary differs from the actual one.
+        """
+        table = self.model._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT DISTINCT search_configuration FROM (
+                    (SELECT {self.columns} FROM {table} EXCEPT {self.calculate_sql})
+                    UNION
+                    ({self.calculate_sql} EXCEPT SELECT {self.columns} FROM {table})
+                ) AS mismatch
+                ORDER BY search_configuration;
+                """
+            )
+            return [config for [config] in cursor.fetchall()]
@@ -0,0 +1,119 @@
+# Generated by Django 3.1 on 2026-10-17 07:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    seasons_table = 'archives_seasonmodel'
+    statistics_table = 'archives_seriesstatisticsmodel'
+    refresh_function_name = 'refresh_series_statistics'
+    trigger_function_name = 'series_statistics_trigger'
+    trigger_name = 'maintain_series_statistics'
+
+    dependencies = [
+        ('archives', '0072_auto_20200912_1831'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesStatisticsModel',
+            fields=[
+                ('series', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='archives.tvseriesmodel', verbose_name='Series')),
+                ('seasons_cnt', models.PositiveSmallIntegerField(db_index=True, verbose_name='Number of seasons in series')),
+                ('episodes_cnt', models.PositiveIntegerField(verbose_name='Number of episodes in all seasons of series')),
+                ('watched_episodes_cnt', models.PositiveIntegerField(verbose_name='Number of watched episodes in all seasons of series')),
+                ('last_episode_date', models.DateField(blank=True, db_index=True, null=True, verbose_name='Release date of the last episode')),
+            ],
+            options={
+                'verbose_name': 'Series statistics',
+                'verbose_name_plural': 'Series statistics',
+            },
+        ),
+        migrations.RunSQL(sql=
+                          f"""
+                            CREATE OR REPLACE FUNCTION {refresh_function_name}(v_series_id INTEGER)
+                            RETURNS void AS $$
+                            BEGIN
+                                -- serialize recalculations of the same series from concurrent transactions
+                                PERFORM pg_advisory_xact_lock(
+                                    '{statistics_table}'::regclass::oid::integer, v_series_id);
+
+                                IF NOT EXISTS (SELECT 1 FROM {seasons_table} WHERE series_id = v_series_id) THEN
+                                    DELETE FROM {statistics_table} WHERE series_id = v_series_id;
+                                    RETURN;
+                                END IF;
+
+                                INSERT INTO {statistics_table} (
+                                    series_id, seasons_cnt, episodes_cnt, watched_episodes_cnt, last_episode_date)
+                                SELECT
+                                    v_series_id,
+                                    count(*),
+                                    sum(number_of_episodes),
+                                    coalesce(sum(last_watched_episode), 0),
+                                    (SELECT max(value::date)
+                                     FROM {seasons_table}, each(episodes)
+                                     WHERE series_id = v_series_id)
+                                FROM {seasons_table}
+                                WHERE series_id = v_series_id
+                                ON CONFLICT (series_id) DO UPDATE SET
+                                    seasons_cnt = EXCLUDED.seasons_cnt,
+                                    episodes_cnt = EXCLUDED.episodes_cnt,
+                                    watched_episodes_cnt = EXCLUDED.watched_episodes_cnt,
+                                    last_episode_date = EXCLUDED.last_episode_date;
+                            END;
+                            $$ LANGUAGE plpgsql;
+
+                            CREATE OR REPLACE FUNCTION {trigger_function_name}() RETURNS trigger AS $$
+                            BEGIN
+                                IF TG_OP = 'INSERT' THEN
+                                    PERFORM {refresh_function_name}(NEW.series_id);
+                                ELSIF TG_OP = 'DELETE' THEN
+                                    PERFORM {refresh_function_name}(OLD.series_id);
+                                ELSIF (NEW.series_id, NEW.number_of_episodes, NEW.last_watched_episode, NEW.episodes)
+                                    IS DISTINCT FROM
+                                    (OLD.series_id, OLD.number_of_episodes, OLD.last_watched_episode, OLD.episodes)
+                                THEN
+                                    PERFORM {refresh_function_name}(NEW.series_id);
+                                    IF NEW.series_id != OLD.series_id THEN
+                                        PERFORM {refresh_function_name}(OLD.series_id);
+                                    END IF;
+                                END IF;
+
+                                RETURN NULL;
+                            END;
+                            $$ LANGUAGE plpgsql;
+
+                            CREATE TRIGGER {trigger_name}
+                            AFTER INSERT OR UPDATE OR DELETE ON {seasons_table}
+                            FOR EACH ROW EXECUTE PROCEDURE {trigger_function_name}();
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP TRIGGER IF EXISTS {trigger_name} ON {seasons_table};
+                            DROP FUNCTION IF EXISTS {trigger_function_name};
+                            DROP FUNCTION IF EXISTS {refresh_function_name};
+                            """,
+                          ),
+        #  Initial population of statistics for already existing seasons.
+        migrations.RunSQL(sql=
+                          f"""
+                            INSERT INTO {statistics_table} (
+                                series_id, seasons_cnt, episodes_cnt, watched_episodes_cnt, last_episode_date)
+                            SELECT
+                                season.series_id,
+                                count(*),
+                                sum(season.number_of_episodes),
+                                coalesce(sum(season.last_watched_episode), 0),
+                                max(episode.last_date)
+                            FROM
+                                {seasons_table} AS season
+                                LEFT JOIN LATERAL (
+                                    SELECT max(value::date) AS last_date FROM each(season.episodes)
+                                ) AS episode ON true
+                            GROUP BY
+                                season.series_id;
+                            """,
+                          reverse_sql=migrations.RunSQL.noop,
+                          ),
+    ]
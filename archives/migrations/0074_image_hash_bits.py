@@ -0,0 +1,63 @@
+# Generated by Django 3.1 on 2026-10-17 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    table_name = 'archives_imagemodel'
+    distance_function_name = 'hamming_distance'
+    trigger_function_name = 'set_image_hash_bits'
+    trigger_name = 'image_hash_bits'
+    index_name = 'image_hash_bits_chunk_{}_index'
+
+    dependencies = [
+        ('archives', '0073_series_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='image_hash_bits',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name='Image hash as 64 bit integer.'),
+        ),
+        migrations.RunSQL(sql=
+                          f"""
+                            CREATE OR REPLACE FUNCTION {distance_function_name}(BIGINT, BIGINT) RETURNS INTEGER AS
+                            $hamming_distance$
+                                SELECT length(replace(($1 # $2)::BIT(64)::TEXT, '0', ''));
+                            $hamming_distance$
+                                LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+                            CREATE OR REPLACE FUNCTION {trigger_function_name}() RETURNS TRIGGER AS
+                            $set_image_hash_bits$
+                            BEGIN
+                                NEW.image_hash_bits := ('x' || NEW.image_hash)::BIT(64)::BIGINT;
+                                RETURN NEW;
+                            END;
+                            $set_image_hash_bits$
+                                LANGUAGE plpgsql;
+
+                            CREATE TRIGGER {trigger_name}
+                                BEFORE INSERT OR UPDATE ON {table_name}
+                                FOR EACH ROW EXECUTE PROCEDURE {trigger_function_name}();
+
+                            UPDATE {table_name} SET image_hash_bits = ('x' || image_hash)::BIT(64)::BIGINT;
+
+                            -- 16 bit chunks of the hash for multi-index hashing prefilter.
+                            CREATE INDEX {index_name.format(0)} ON {table_name} (((image_hash_bits >> 0) & 65535));
+                            CREATE INDEX {index_name.format(1)} ON {table_name} (((image_hash_bits >> 16) & 65535));
+                            CREATE INDEX {index_name.format(2)} ON {table_name} (((image_hash_bits >> 32) & 65535));
+                            CREATE INDEX {index_name.format(3)} ON {table_name} (((image_hash_bits >> 48) & 65535));
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP INDEX IF EXISTS {index_name.format(0)};
+                            DROP INDEX IF EXISTS {index_name.format(1)};
+                            DROP INDEX IF EXISTS {index_name.format(2)};
+                            DROP INDEX IF EXISTS {index_name.format(3)};
+                            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
+                            DROP FUNCTION IF EXISTS {trigger_function_name};
+                            DROP FUNCTION IF EXISTS {distance_function_name};
+                            """
+                          ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.1 on 2026-10-17 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0074_image_hash_bits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Storage paths of resized copies of the image.'),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='processing_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('DUPLICATE', 'Duplicate')], default='PENDING', editable=False, max_length=9, verbose_name='Status of image post-processing.'),
+        ),
+    ]
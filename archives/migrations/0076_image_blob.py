@@ -0,0 +1,72 @@
+# Generated by Django 3.1 on 2026-10-17 07:40
+
+import archives.helpers.file_uploads
+import archives.helpers.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    table_name = 'archives_imagemodel'
+    blob_table_name = 'archives_imageblob'
+    trigger_function_name = 'count_image_blob_references'
+    trigger_name = 'image_blob_references'
+
+    dependencies = [
+        ('archives', '0075_image_processing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='sha256 digest of the file content.')),
+                ('path', models.CharField(max_length=100, unique=True, verbose_name='Storage path of the file.')),
+                ('reference_count', models.PositiveIntegerField(default=0, verbose_name='Number of images referring to the file.')),
+            ],
+            options={
+                'verbose_name': 'Image blob',
+                'verbose_name_plural': 'Image blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='imagemodel',
+            name='image',
+            field=models.ImageField(storage=archives.helpers.file_uploads.ContentAddressedStorage(), upload_to=archives.helpers.file_uploads.save_image_path, validators=[archives.helpers.validators.IsImageValidator()], verbose_name='An image'),
+        ),
+        migrations.AddField(
+            model_name='imagemodel',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='images', to='archives.imageblob', verbose_name='Content addressed file of the image.'),
+        ),
+        migrations.RunSQL(sql=
+                          f"""
+                            CREATE OR REPLACE FUNCTION {trigger_function_name}() RETURNS TRIGGER AS
+                            $count_references$
+                            BEGIN
+                                IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.blob_id IS NOT NULL THEN
+                                    UPDATE {blob_table_name} SET reference_count = reference_count - 1
+                                    WHERE digest = OLD.blob_id;
+                                END IF;
+                                IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.blob_id IS NOT NULL THEN
+                                    UPDATE {blob_table_name} SET reference_count = reference_count + 1
+                                    WHERE digest = NEW.blob_id;
+                                END IF;
+                                RETURN NULL;
+                            END;
+                            $count_references$
+                                LANGUAGE plpgsql;
+
+                            CREATE TRIGGER {trigger_name}
+                                AFTER INSERT OR DELETE OR UPDATE OF blob_id
+                                ON {table_name}
+                                FOR EACH ROW
+                                EXECUTE PROCEDURE {trigger_function_name}();
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
+                            DROP FUNCTION IF EXISTS {trigger_function_name};
+                            """
+                          ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.1 on 2026-10-17 07:42
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0076_image_blob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='imagemodel',
+            index=models.Index(fields=['image'], name='image_file_index'),
+        ),
+        migrations.AddIndex(
+            model_name='imagemodel',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['derivatives'], name='image_derivatives_index', opclasses=['jsonb_path_ops']),
+        ),
+    ]
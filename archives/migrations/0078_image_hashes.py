@@ -0,0 +1,18 @@
+# Generated by Django 3.1 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0077_image_gc_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemodel',
+            name='hashes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Image hashes made by other algorithms.'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.1 on 2026-10-17 07:47
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0078_image_hashes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subtitles',
+            index=models.Index(fields=['search_configuration'], name='subtitles_search_config_index'),
+        ),
+        migrations.AddIndex(
+            model_name='subtitles',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(search_configuration='russian_hunspell'), fastupdate=False, fields=['full_text'], name='subtitles_fts_ru_index'),
+        ),
+        migrations.AddIndex(
+            model_name='subtitles',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(search_configuration='french_hunspell'), fastupdate=False, fields=['full_text'], name='subtitles_fts_fr_index'),
+        ),
+        migrations.AddIndex(
+            model_name='subtitles',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(search_configuration='english_hunspell'), fastupdate=False, fields=['full_text'], name='subtitles_fts_en_index'),
+        ),
+    ]
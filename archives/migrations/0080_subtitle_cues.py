@@ -0,0 +1,64 @@
+# Generated by Django 3.1 on 2026-10-17 07:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+from archives.helpers import subtitles
+
+
+def create_cues(apps, schema_editor):
+    """
+    Fills cues of existing subtitles.
+    """
+    Subtitles = apps.get_model('archives', 'Subtitles')
+    SubtitleCue = apps.get_model('archives', 'SubtitleCue')
+
+    for subtitle in Subtitles.objects.only('pk', 'text').iterator():
+        SubtitleCue.objects.bulk_create([
+            SubtitleCue(subtitle_id=subtitle.pk, **cue._asdict()) for cue in subtitles.parse_srt(subtitle.text)
+        ])
+
+    schema_editor.execute(
+        f"""
+        UPDATE {SubtitleCue._meta.db_table} AS cue
+        SET full_text = to_tsvector(subtitle.search_configuration::regconfig, cue.text)
+        FROM {Subtitles._meta.db_table} AS subtitle
+        WHERE subtitle.id = cue.subtitle_id AND subtitle.search_configuration IS NOT NULL;
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0079_subtitles_fts_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubtitleCue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Number of the cue in subtitles')),
+                ('start_ms', models.PositiveIntegerField(verbose_name='Cue start in milliseconds')),
+                ('end_ms', models.PositiveIntegerField(verbose_name='Cue end in milliseconds')),
+                ('text', models.TextField(verbose_name='Cue text')),
+                ('full_text', django.contrib.postgres.search.SearchVectorField(blank=True, null=True, verbose_name='full_text')),
+                ('subtitle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cues', to='archives.subtitles', verbose_name='Subtitles')),
+            ],
+            options={
+                'verbose_name': 'Subtitle cue',
+                'verbose_name_plural': 'Subtitle cues',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='subtitlecue',
+            index=django.contrib.postgres.indexes.GinIndex(fastupdate=False, fields=['full_text'], name='subtitle_cue_fts_index'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subtitlecue',
+            unique_together={('subtitle', 'number')},
+        ),
+        migrations.RunPython(create_cues, migrations.RunPython.noop),
+    ]
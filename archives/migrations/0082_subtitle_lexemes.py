@@ -0,0 +1,110 @@
+# Generated by Django 3.1 on 2026-10-17 08:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    subtitles_table = 'archives_subtitles'
+    lexemes_table = 'archives_subtitlelexeme'
+    trigger_function_name = 'subtitle_lexemes_trigger'
+    trigger_name = 'maintain_subtitle_lexemes'
+
+    dependencies = [
+        ('archives', '0081_subtitle_ingestion_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubtitleLexeme',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_configuration', models.CharField(max_length=30, verbose_name='FTS configuration')),
+                ('word', models.TextField(verbose_name='Lexeme')),
+                ('ndoc', models.PositiveIntegerField(verbose_name='Number of subtitles lexeme occurs in')),
+                ('nentry', models.PositiveIntegerField(verbose_name='Total number of occurrences of lexeme')),
+            ],
+            options={
+                'verbose_name': 'Subtitle lexeme',
+                'verbose_name_plural': 'Subtitle lexemes',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='subtitlelexeme',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['word'], name='subtitle_lexeme_trgm_index', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subtitlelexeme',
+            unique_together={('search_configuration', 'word')},
+        ),
+        migrations.RunSQL(sql=
+                          f"""
+                            CREATE OR REPLACE FUNCTION {trigger_function_name}() RETURNS trigger AS $$
+                            BEGIN
+                                IF TG_OP = 'UPDATE'
+                                    AND (NEW.search_configuration, NEW.full_text)
+                                    IS NOT DISTINCT FROM (OLD.search_configuration, OLD.full_text)
+                                THEN
+                                    RETURN NULL;
+                                END IF;
+
+                                IF TG_OP IN ('UPDATE', 'DELETE')
+                                    AND OLD.search_configuration IS NOT NULL AND OLD.full_text IS NOT NULL
+                                THEN
+                                    UPDATE {lexemes_table} AS vocabulary SET
+                                        ndoc = vocabulary.ndoc - 1,
+                                        nentry = vocabulary.nentry - coalesce(array_length(lexeme.positions, 1), 1)
+                                    FROM unnest(OLD.full_text) AS lexeme
+                                    WHERE vocabulary.search_configuration = OLD.search_configuration
+                                        AND vocabulary.word = lexeme.lexeme;
+
+                                    DELETE FROM {lexemes_table}
+                                    WHERE search_configuration = OLD.search_configuration
+                                        AND word IN (SELECT lexeme FROM unnest(OLD.full_text))
+                                        AND ndoc = 0;
+                                END IF;
+
+                                IF TG_OP IN ('INSERT', 'UPDATE')
+                                    AND NEW.search_configuration IS NOT NULL AND NEW.full_text IS NOT NULL
+                                THEN
+                                    -- lexemes come sorted out of tsvector, so concurrent transactions lock
+                                    -- vocabulary rows in the same order
+                                    INSERT INTO {lexemes_table} (search_configuration, word, ndoc, nentry)
+                                    SELECT NEW.search_configuration, lexeme, 1, coalesce(array_length(positions, 1), 1)
+                                    FROM unnest(NEW.full_text)
+                                    ON CONFLICT (search_configuration, word) DO UPDATE SET
+                                        ndoc = {lexemes_table}.ndoc + 1,
+                                        nentry = {lexemes_table}.nentry + EXCLUDED.nentry;
+                                END IF;
+
+                                RETURN NULL;
+                            END;
+                            $$ LANGUAGE plpgsql;
+
+                            CREATE TRIGGER {trigger_name}
+                            AFTER INSERT OR UPDATE OF search_configuration, full_text OR DELETE ON {subtitles_table}
+                            FOR EACH ROW EXECUTE PROCEDURE {trigger_function_name}();
+                            """,
+                          reverse_sql=
+                          f"""
+                            DROP TRIGGER IF EXISTS {trigger_name} ON {subtitles_table};
+                            DROP FUNCTION IF EXISTS {trigger_function_name};
+                            """,
+                          ),
+        #  Initial population of vocabulary from already existing subtitles.
+        migrations.RunSQL(sql=
+                          f"""
+                            INSERT INTO {lexemes_table} (search_configuration, word, ndoc, nentry)
+                            SELECT config.name, stat.word, stat.ndoc, stat.nentry
+                            FROM
+                                (SELECT DISTINCT search_configuration AS name FROM {subtitles_table}
+                                 WHERE search_configuration IS NOT NULL AND full_text IS NOT NULL) AS config,
+                                LATERAL ts_stat(format(
+                                    'SELECT full_text FROM {subtitles_table} '
+                                    'WHERE search_configuration = %L AND full_text IS NOT NULL',
+                                    config.name
+                                )) AS stat;
+                            """,
+                          reverse_sql=migrations.RunSQL.noop,
+                          ),
+    ]
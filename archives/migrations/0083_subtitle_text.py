@@ -0,0 +1,77 @@
+# Generated by Django 3.1 on 2026-10-17 08:03
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+from archives.helpers import subtitles
+
+#  Subtitles are converted in batches of BATCH_SIZE rows, each batch in its own transaction.
+BATCH_SIZE = 200
+
+
+def compress_texts(apps, schema_editor):
+    """
+    Moves texts of existing subtitles to side table compressed.
+    """
+    Subtitles = apps.get_model('archives', 'Subtitles')
+    SubtitleText = apps.get_model('archives', 'SubtitleText')
+    queryset = Subtitles.objects.order_by('pk').values_list('pk', 'text')
+    last_pk = 0
+
+    while batch := list(queryset.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        with transaction.atomic():
+            SubtitleText.objects.bulk_create([
+                SubtitleText(subtitle_id=pk, data=subtitles.compress(text), size=len(text.encode()))
+                for pk, text in batch
+            ], ignore_conflicts=True)
+        last_pk = batch[-1][0]
+
+
+def decompress_texts(apps, schema_editor):
+    """
+    Moves texts of subtitles back to subtitles table.
+    """
+    Subtitles = apps.get_model('archives', 'Subtitles')
+    SubtitleText = apps.get_model('archives', 'SubtitleText')
+    queryset = SubtitleText.objects.order_by('pk').values_list('pk', 'data')
+    last_pk = 0
+
+    while batch := list(queryset.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        with transaction.atomic():
+            for pk, data in batch:
+                Subtitles.objects.filter(pk=pk).update(text=subtitles.decompress(bytes(data)))
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+    texts_table = 'archives_subtitletext'
+
+    dependencies = [
+        ('archives', '0082_subtitle_lexemes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubtitleText',
+            fields=[
+                ('subtitle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='raw_text', serialize=False, to='archives.subtitles', verbose_name='Subtitles')),
+                ('data', models.BinaryField(verbose_name='Compressed subtitles text')),
+                ('size', models.PositiveIntegerField(verbose_name='Size of uncompressed subtitles text in bytes')),
+            ],
+            options={
+                'verbose_name': 'Subtitle text',
+                'verbose_name_plural': 'Subtitle texts',
+            },
+        ),
+        #  Data is compressed already, so Postgres should not try to compress it once more.
+        migrations.RunSQL(
+            sql=f'ALTER TABLE {texts_table} ALTER COLUMN data SET STORAGE EXTERNAL;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(compress_texts, reverse_code=decompress_texts),
+        migrations.RemoveField(
+            model_name='subtitles',
+            name='text',
+        ),
+    ]
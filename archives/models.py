@@ -6,15 +6,18 @@ from collections import defaultdict
 from fractions import Fraction
 from typing import KeysView, Optional, Tuple, Union
 
+import PIL.Image
+import django_redis
+import imagehash
 import more_itertools
-from BTrees.IOBTree import IOBTree
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres import constraints as psgr_constraints, fields as psgr_fields, \
     indexes as psgr_indexes, search as psgr_search
 from django.core import exceptions, validators
-from django.db import models, transaction
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -22,8 +25,8 @@ from psycopg2.extras import DateRange
 from rest_framework.reverse import reverse
 
 import archives.managers
-from archives.helpers import custom_fields, custom_functions, file_uploads, language_codes, \
-    validators as custom_validators
+from archives.helpers import custom_fields, custom_functions, file_uploads, image_derivatives, \
+    language_codes, shared_image_hash_index, subtitles, validators as custom_validators
 from series import constants, error_codes
 from series.helpers.custom_functions import available_range
 
@@ -264,6 +267,46 @@ class EmptyTVSeriesModel(TvSeriesModel):
         proxy = True
 
 
+class SeriesStatisticsModel(models.Model):
+    """
+    Denormalized seasons and episodes statistics of a series. Maintained by database trigger on
+    'SeasonModel' table (see migration 0073). Series without seasons do not have statistics entry.
+    """
+    objects = archives.managers.SeriesStatisticsManager.from_queryset(
+        archives.managers.SeriesStatisticsQueryset)()
+
+    series = models.OneToOneField(
+        TvSeriesModel,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics',
+        verbose_name='Series',
+    )
+    seasons_cnt = models.PositiveSmallIntegerField(
+        verbose_name='Number of seasons in series',
+        db_index=True,
+    )
+    episodes_cnt = models.PositiveIntegerField(
+        verbose_name='Number of episodes in all seasons of series',
+    )
+    watched_episodes_cnt = models.PositiveIntegerField(
+        verbose_name='Number of watched episodes in all seasons of series',
+    )
+    last_episode_date = models.DateField(
+        verbose_name='Release date of the last episode',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+
+    class Meta:
+        verbose_name = 'Series statistics'
+        verbose_name_plural = 'Series statistics'
+
+    def __str__(self):
+        return f'series pk - {self.series_id}, seasons - {self.seasons_cnt}, episodes - {self.episodes_cnt}'
+
+
 class SeasonModel(models.Model):
     """
     Model represents one singular season of a series.
@@ -564,6 +607,43 @@ class SeasonModel(models.Model):
         return available_range(series_range, *inner_ranges)[0]
 
 
+class ImageBlob(models.Model):
+    """
+    Image file stored by content digest. One file is shared by all images with the same content.
+    """
+    objects = archives.managers.ImageBlobManager()
+
+    digest = models.CharField(
+        primary_key=True,
+        max_length=64,
+        verbose_name='sha256 digest of the file content.',
+    )
+    path = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Storage path of the file.',
+    )
+    #  Maintained by DB trigger on ImageModel.
+    reference_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of images referring to the file.',
+    )
+
+    class Meta:
+        verbose_name = 'Image blob'
+        verbose_name_plural = 'Image blobs'
+
+    def __str__(self):
+        return f'{self.path} - references={self.reference_count}'
+
+
+class ImageProcessingStatusChoices(models.TextChoices):
+    PENDING = 'PENDING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    DUPLICATE = 'DUPLICATE'
+
+
 class ImageModelMetaClass(type(models.Model)):
     """
     Metaclass for ImageModel.
@@ -597,6 +677,7 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
     )
     image = models.ImageField(
         upload_to=file_uploads.save_image_path,
+        storage=file_uploads.image_storage,
         verbose_name='An image',
         validators=[
             custom_validators.IsImageValidator(),
@@ -608,6 +689,44 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
         verbose_name='Image hash.',
         unique=True,
     )
+    #  Set from 'image_hash' by DB trigger. Used for Hamming distance search in DB.
+    image_hash_bits = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Image hash as 64 bit integer.',
+    )
+    #  {algorithm name: hex hash} of algorithms other than primary one, filled by 'rehash_images'.
+    hashes = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Image hashes made by other algorithms.',
+    )
+    #  Set if image is stored by content digest (IMAGE_STORAGE_MODE = 'content').
+    blob = models.ForeignKey(
+        ImageBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='images',
+        verbose_name='Content addressed file of the image.',
+    )
+    #  Derivatives and (if IMAGE_HASH_OFF_REQUEST) image hash are made by 'process_image' Celery task.
+    processing_status = models.CharField(
+        choices=ImageProcessingStatusChoices.choices,
+        default=ImageProcessingStatusChoices.PENDING,
+        max_length=9,
+        editable=False,
+        verbose_name='Status of image post-processing.',
+    )
+    derivatives = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Storage paths of resized copies of the image.',
+    )
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE
@@ -629,12 +748,27 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
                 name='len_16_constraint',
                 check=models.Q(image_hash__length=16),
             ), ]
+        #  Used by media root garbage collector to find referenced files.
+        indexes = [
+            models.Index(
+                fields=['image'],
+                name='image_file_index',
+            ),
+            psgr_indexes.GinIndex(
+                fields=['derivatives'],
+                opclasses=['jsonb_path_ops'],
+                name='image_derivatives_index',
+            ), ]
 
     def __str__(self):
         return f'image - {self.image.name}, model - {self.content_type} - pk={self.object_id}'
 
     def clean(self):
 
+        #  Image hash is made by 'process_image' Celery task in this case.
+        if self.image_hash is None and settings.IMAGE_HASH_OFF_REQUEST:
+            return None
+
         #  I instance has not image hash yet - try to generate and set hash to it.
         if self.image_hash is None:
             self.image_hash = self.make_image_hash()
@@ -646,12 +780,11 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
 
         # If image hash has Hamming difference les then X - raise validation error as this or closer
         # to this image already exists in DB.
-        for img_hash in self.__class__.stored_image_hash.values():
-            if img_hash is not None and (img_hash - self.image_hash) < 10:
-                raise exceptions.ValidationError(
-                    {'image': error_codes.IMAGE_ALREADY_EXISTS.message},
-                    code=error_codes.IMAGE_ALREADY_EXISTS.code,
-                )
+        if self.__class__.stored_image_hash.has_near_duplicate(self.image_hash, distance=10):
+            raise exceptions.ValidationError(
+                {'image': error_codes.IMAGE_ALREADY_EXISTS.message},
+                code=error_codes.IMAGE_ALREADY_EXISTS.code,
+            )
 
     def save(self, fc=True, *args, **kwargs):
         """
@@ -664,12 +797,20 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
         if fc:
             self.full_clean(exclude=('image_hash',), validate_unique=True)
 
-        if not self.image_hash:
-            self.image_hash = self.make_image_hash()
+        with transaction.atomic():
+            if settings.IMAGE_STORAGE_MODE == file_uploads.CONTENT and self.blob_id is None and \
+                    not self.image._committed:
+                self.blob = ImageBlob.objects.acquire(self.image.file, self.image.name)
 
-        super().save(*args, **kwargs)
+            if not self.image_hash and not settings.IMAGE_HASH_OFF_REQUEST:
+                self.image_hash = self.make_image_hash()
+
+            super().save(*args, **kwargs)
+            #  Hash of rolled back image should not be found by near-duplicate search.
+            transaction.on_commit(
+                functools.partial(self.__class__.stored_image_hash.__setitem__, self.pk, self.image_hash)
+            )
         self.image.close()
-        self.__class__.stored_image_hash[self.pk] = self.image_hash
 
     def delete(self, using=None, keep_parents=False):
         deleted = super().delete(using, keep_parents)
@@ -700,13 +841,70 @@ class ImageModel(models.Model, metaclass=ImageModelMetaClass):
         image_hash = custom_functions.create_image_hash(self.image.open('rb'))
         return image_hash
 
+    def process(self) -> str:
+        """
+        Generates derivatives of the image and its hash if it was not made on save.
+        Returns processing status.
+        """
+        fields = {}
+        try:
+            with self.image.open('rb') as image_file:
+                image = PIL.Image.open(image_file)
+                image.load()
+        except (OSError, SyntaxError, ValueError, PIL.Image.DecompressionBombError):
+            fields['processing_status'] = ImageProcessingStatusChoices.FAILED
+        else:
+            fields['derivatives'] = image_derivatives.generate_derivatives(
+                image, self.image.name, self.image.storage,
+            )
+            fields['processing_status'] = ImageProcessingStatusChoices.DONE
+            if self.image_hash is None:
+                image_hash = imagehash.average_hash(image)
+                if self.__class__.stored_image_hash.has_near_duplicate(image_hash, distance=10):
+                    fields['processing_status'] = ImageProcessingStatusChoices.DUPLICATE
+                else:
+                    fields['image_hash'] = image_hash
+
+        try:
+            with transaction.atomic():
+                self.__class__.objects.filter(pk=self.pk).update(**fields)
+        except IntegrityError:
+            #  Same image hash was stored by concurrent task.
+            fields.pop('image_hash', None)
+            fields['processing_status'] = ImageProcessingStatusChoices.DUPLICATE
+            self.__class__.objects.filter(pk=self.pk).update(**fields)
+
+        for name, value in fields.items():
+            setattr(self, name, value)
+        if 'image_hash' in fields:
+            self.__class__.stored_image_hash[self.pk] = self.image_hash
+
+        return self.processing_status
+
     @classmethod
     def get_image_hash_from_db(cls):
         """
-        Fetch all ImageModel instances pk and image_hash from DB.
+        Returns near-duplicate search index shared by all processes. Index is built from all
+        ImageModel instances pk and image_hash in DB on first use.
+        """
+        return shared_image_hash_index.SharedImageHashIndex(
+            client=django_redis.get_redis_connection(settings.IMAGE_HASH_INDEX_CACHE),
+            prefix=f'image_hash_index:{connection.settings_dict["NAME"]}',
+            source=cls.get_image_hash_source,
+            loader=lambda: cls.objects.exclude(image_hash__isnull=True).values_list(
+                'pk', 'image_hash',
+            ).iterator(),
+        )
+
+    @classmethod
+    def get_image_hash_source(cls) -> str:
+        """
+        Identifier of the table shared index is built from. Changes if table is recreated.
         """
-        image_hash_from_db = cls.objects.exclude(image_hash__isnull=True).values_list('pk', 'image_hash', )
-        return IOBTree(image_hash_from_db)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT %s::regclass::oid;', (cls._meta.db_table, ))
+            [oid] = cursor.fetchone()
+        return str(oid)
 
 
 class Subtitles(models.Model):
@@ -724,9 +922,6 @@ class Subtitles(models.Model):
     episode_number = models.PositiveSmallIntegerField(
         verbose_name='Number of the episode',
     )
-    text = models.TextField(
-        verbose_name='Subtitles text',
-    )
     language = models.CharField(
         verbose_name='Subtitles language',
         choices=language_codes.iso_639_choices,
@@ -765,7 +960,16 @@ class Subtitles(models.Model):
                     output_field=models.BooleanField(),
                 ), )]
         indexes = [
-            psgr_indexes.GinIndex(fields=['full_text'], fastupdate=False)
+            psgr_indexes.GinIndex(fields=['full_text'], fastupdate=False),
+            #  Loose index scan of distinct search configurations.
+            models.Index(fields=['search_configuration'], name='subtitles_search_config_index'),
+            #  Per language partial indexes used by FTS with constant tsquery of the same configuration.
+            *(psgr_indexes.GinIndex(
+                fields=['full_text'],
+                fastupdate=False,
+                name=f'subtitles_fts_{language_code}_index',
+                condition=models.Q(search_configuration=config),
+            ) for language_code, config in archives.managers.SubtitlesManager.analyzers_preferences.items()),
         ]
 
     def __str__(self):
@@ -773,12 +977,37 @@ class Subtitles(models.Model):
                f' season-{self.season.season_number},' \
                f' episode-{self.episode_number}'
 
+    #  Raw text loaded from 'SubtitleText' side table or set but not saved yet.
+    _text = None
+    _text_changed = False
+
+    @property
+    def text(self) -> str:
+        """
+        Raw subtitles text. Kept compressed in 'SubtitleText' table, loaded on first access.
+        """
+        if self._text is None and self.pk is not None:
+            self._text = self.raw_text.text
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+        self._text_changed = True
+
     @transaction.atomic()
     def save(self, fc=True, *args, **kwargs):
         if fc:
             self.full_clean(validate_unique=True)
         super().save(*args, **kwargs)
 
+        if self._text_changed:
+            SubtitleText.objects.update_or_create(
+                subtitle=self,
+                defaults=SubtitleText.compressed(self._text),
+            )
+            self._text_changed = False
+
     def clean(self):
         if self.episode_number > self.season.number_of_episodes:
             raise exceptions.ValidationError(
@@ -788,3 +1017,219 @@ class Subtitles(models.Model):
     @cached_property
     def get_absolute_url(self):
         return reverse('full-text-search-detail', args=(self.pk,))
+
+
+class SubtitleText(models.Model):
+    """
+    Raw text of subtitles compressed by application. Kept apart from 'Subtitles' table in order to
+    leave only lexemes and metadata in rows scanned by FTS.
+    """
+    objects = archives.managers.SubtitleTextManager()
+
+    subtitle = models.OneToOneField(
+        Subtitles,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='raw_text',
+        verbose_name='Subtitles',
+    )
+    data = models.BinaryField(
+        verbose_name='Compressed subtitles text',
+    )
+    size = models.PositiveIntegerField(
+        verbose_name='Size of uncompressed subtitles text in bytes',
+    )
+
+    class Meta:
+        verbose_name = 'Subtitle text'
+        verbose_name_plural = 'Subtitle texts'
+
+    def __str__(self):
+        return f'{self.subtitle_id}'
+
+    @staticmethod
+    def compressed(text: str) -> dict:
+        """
+        Returns field values of compressed text.
+        """
+        return {'data': subtitles.compress(text), 'size': len(text.encode())}
+
+    @cached_property
+    def text(self) -> str:
+        return subtitles.decompress(bytes(self.data))
+
+
+class SubtitleCue(models.Model):
+    """
+    Model represents one cue of subtitles with its timing. Filled from subtitles text on save and
+    indexed for FTS with search configuration of subtitles.
+    """
+    objects = archives.managers.SubtitleCueManager()
+
+    subtitle = models.ForeignKey(
+        Subtitles,
+        on_delete=models.CASCADE,
+        related_name='cues',
+        verbose_name='Subtitles',
+    )
+    number = models.PositiveIntegerField(
+        verbose_name='Number of the cue in subtitles',
+    )
+    start_ms = models.PositiveIntegerField(
+        verbose_name='Cue start in milliseconds',
+    )
+    end_ms = models.PositiveIntegerField(
+        verbose_name='Cue end in milliseconds',
+    )
+    text = models.TextField(
+        verbose_name='Cue text',
+    )
+    full_text = psgr_search.SearchVectorField(
+        verbose_name='full_text',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Subtitle cue'
+        verbose_name_plural = 'Subtitle cues'
+        unique_together = ('subtitle', 'number',)
+        indexes = [
+            psgr_indexes.GinIndex(fields=['full_text'], fastupdate=False, name='subtitle_cue_fts_index'),
+        ]
+
+    def __str__(self):
+        return f'{self.subtitle_id}-{self.number}'
+
+
+class SubtitleLexeme(models.Model):
+    """
+    Vocabulary of subtitles lexemes per search configuration with their document frequencies as
+    returned by 'ts_stat'. Maintained by database trigger on 'Subtitles' table (see migration 0082).
+    Used for search suggestions.
+    """
+    objects = archives.managers.SubtitleLexemeManager.from_queryset(archives.managers.SubtitleLexemeQueryset)()
+
+    search_configuration = models.CharField(
+        verbose_name='FTS configuration',
+        max_length=30,
+    )
+    word = models.TextField(
+        verbose_name='Lexeme',
+    )
+    ndoc = models.PositiveIntegerField(
+        verbose_name='Number of subtitles lexeme occurs in',
+    )
+    nentry = models.PositiveIntegerField(
+        verbose_name='Total number of occurrences of lexeme',
+    )
+
+    class Meta:
+        verbose_name = 'Subtitle lexeme'
+        verbose_name_plural = 'Subtitle lexemes'
+        unique_together = ('search_configuration', 'word',)
+        indexes = [
+            #  Completions by prefix and typo corrections by similarity.
+            psgr_indexes.GinIndex(
+                fields=['word'],
+                opclasses=['gin_trgm_ops'],
+                name='subtitle_lexeme_trgm_index',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.search_configuration}-{self.word}'
+
+
+class SubtitleIngestionStatusChoices(models.TextChoices):
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+
+class SubtitleIngestionStageChoices(models.TextChoices):
+    ENCODING = 'ENCODING'
+    LANGUAGE = 'LANGUAGE'
+    NORMALIZATION = 'NORMALIZATION'
+    LEXEMES = 'LEXEMES'
+
+
+class SubtitleIngestionJob(models.Model):
+    """
+    Model represents uploaded subtitles file processed by ingestion pipeline in Celery worker.
+    Raw file content is kept until file is ingested.
+    """
+    season = models.ForeignKey(
+        SeasonModel,
+        on_delete=models.CASCADE,
+        related_name='subtitle_jobs',
+        verbose_name='Season',
+    )
+    entry_author = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name='subtitle_jobs',
+        verbose_name='Author of the upload',
+    )
+    filename = models.CharField(
+        max_length=255,
+        verbose_name='Uploaded file name',
+    )
+    episode_number = models.PositiveSmallIntegerField(
+        verbose_name='Number of the episode',
+    )
+    language = models.CharField(
+        verbose_name='Subtitles language',
+        choices=language_codes.iso_639_choices,
+        max_length=2,
+        null=True,
+        blank=True,
+    )
+    raw = models.BinaryField(
+        null=True,
+        verbose_name='Uploaded file content',
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=SubtitleIngestionStatusChoices.choices,
+        default=SubtitleIngestionStatusChoices.PENDING,
+        verbose_name='Ingestion status',
+    )
+    stage = models.CharField(
+        max_length=13,
+        choices=SubtitleIngestionStageChoices.choices,
+        null=True,
+        blank=True,
+        verbose_name='Current or failed stage of ingestion',
+    )
+    #  {'code': error code, 'messages': [messages]} of failed ingestion.
+    error = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='Ingestion error',
+    )
+    subtitle = models.ForeignKey(
+        Subtitles,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ingestion_jobs',
+        verbose_name='Ingested subtitles',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Upload time',
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Ingestion finish time',
+    )
+
+    class Meta:
+        verbose_name = 'Subtitle ingestion job'
+        verbose_name_plural = 'Subtitle ingestion jobs'
+
+    def __str__(self):
+        return f'{self.filename} - {self.status}'
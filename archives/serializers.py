@@ -1,4 +1,5 @@
-import chardet
+import functools
+
 import guardian.models
 from django.apps import apps
 from django.conf import settings
@@ -9,11 +10,12 @@ from django.db.models.functions import Concat
 from django.utils import timezone
 from drf_extra_fields.fields import DateRangeField
 from guardian.shortcuts import assign_perm
-from langdetect import detect, lang_detect_exception
 from rest_framework import permissions, serializers
+from rest_framework.reverse import reverse
 import itertools
 import archives.models
 from archives.helpers import custom_fields
+from archives.key_constructors import bump_series_versions
 from series import constants, error_codes
 from series.helpers import serializer_mixins
 
@@ -39,10 +41,15 @@ class ImagesSerializer(serializers.ModelSerializer):
     """
     if settings.IM_IN_TEST_MODE:
         image = serializers.FileField()
+    else:
+        image = custom_fields.StreamedImageField(max_length=100)
+
+    processing_status = serializers.ReadOnlyField()
+    derivatives = serializers.SerializerMethodField()
 
     class Meta:
         model = archives.models.ImageModel
-        fields = ('image',)
+        fields = ('image', 'processing_status', 'derivatives', )
         extra_kwargs = {
             'image': {
                 'max_length': 100,
@@ -52,8 +59,21 @@ class ImagesSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['content_object'] = self.context['series']
         validated_data['entry_author'] = self.context['request'].user
+        #  Hash computed while file was uploaded, model computes it itself otherwise.
+        validated_data['image_hash'] = getattr(validated_data['image'], 'image_hash', None)
         return super().create(validated_data)
 
+    def get_derivatives(self, image: archives.models.ImageModel) -> dict:
+        """
+        URLs of resized copies of the image made by 'process_image' task.
+        """
+        request = self.context.get('request')
+        urls = {}
+        for name, path in image.derivatives.items():
+            url = image.image.storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
 
 class TvSeriesSerializer(serializer_mixins.NoneInsteadEmptyMixin, serializers.ModelSerializer):
     """
@@ -128,9 +148,20 @@ class TvSeriesSerializer(serializer_mixins.NoneInsteadEmptyMixin, serializers.Mo
                 list_of_interrelationships,
                 ignore_conflicts=True,
             )
+            self.bump_interrelated_series_versions(list_of_interrelationships)
 
         return series
 
+    @staticmethod
+    def bump_interrelated_series_versions(groups) -> None:
+        """
+        Invalidates cached responses of series on both sides of interrelationships, as 'bulk_create'
+        doesn't send 'post_save' which 'invalidate_series_cache' receiver relies on.
+        """
+        series_pks = {pk for group in groups for pk in (group.from_series_id, group.to_series_id)}
+        bump_series_versions(series_pks)
+        transaction.on_commit(functools.partial(bump_series_versions, series_pks))
+
 
 class SeasonShortSerializer(serializers.ModelSerializer):
     """
@@ -190,6 +221,7 @@ class TvSeriesDetailSerializer(serializer_mixins.ReadOnlyRaisesException, TvSeri
                     list_of_interrelationships,
                     ignore_conflicts=True,
                 )
+                self.bump_interrelated_series_versions(new)
         return series
 
     def get_fields(self):
@@ -421,13 +453,14 @@ class ManagePermissionsSerializer(serializers.ModelSerializer):
 
 class SubtitlesUploadSerializer(serializers.ModelSerializer):
     """
-    Serializer for uploading and saving subtitles.
+    Serializer for uploading subtitles. Creates ingestion job, subtitles are ingested by Celery worker.
     """
     text = serializers.FileField(
+        write_only=True,
     )
 
     class Meta:
-        model = archives.models.Subtitles
+        model = archives.models.SubtitleIngestionJob
         fields = (
             'episode_number',
             'text',
@@ -438,36 +471,54 @@ class SubtitlesUploadSerializer(serializers.ModelSerializer):
                 'required': False,
             }, }
 
+    def validate_episode_number(self, episode_number):
+        if episode_number > self.context['season'].number_of_episodes:
+            raise serializers.ValidationError(
+                *error_codes.SUB_EPISODE_NUM_GT_SEASON_EPISODE_NUM
+            )
+        return episode_number
+
     def create(self, validated_data):
+        file = validated_data.pop('text')
         validated_data['season'] = self.context['season']
-        file_in_memory = validated_data['text']
-        text_in_bytes = file_in_memory.read()
-
-        #  Find out text encoding.
-        detector = chardet.UniversalDetector()
-        for num in range(100):
-            detector.feed(text_in_bytes[num * 1000: (num + 1) * 1000])
-            if detector.done:
-                break
-        detector.close()
-
-        #  Converts bytes to actual text.
-        codec = detector.result['encoding']
-        plain_text = text_in_bytes.decode(encoding=codec, errors='strict', )
-        validated_data['text'] = plain_text
-
-        #  Detect language if subtitle automatically if not specified in request.data.
-        if 'language' not in validated_data:
-            try:
-                validated_data['language'] = detect(validated_data['text'][: 1000])
-            except lang_detect_exception.LangDetectException as err:
-                raise serializers.ValidationError(
-                    *error_codes.LANGUAGE_UNDETECTED
-                ) from err
+        validated_data['entry_author'] = self.context['request'].user
+        validated_data['filename'] = file.name[:255]
+        validated_data['raw'] = file.read()
 
         return super().create(validated_data)
 
 
+class SubtitleIngestionJobSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for subtitles ingestion job status.
+    """
+    url = serializers.SerializerMethodField(
+    )
+
+    class Meta:
+        model = archives.models.SubtitleIngestionJob
+        fields = (
+            'id',
+            'url',
+            'filename',
+            'episode_number',
+            'language',
+            'status',
+            'stage',
+            'error',
+            'subtitle_id',
+            'created_at',
+            'finished_at',
+        )
+
+    def get_url(self, job: archives.models.SubtitleIngestionJob) -> str:
+        return reverse(
+            'seasonmodel-subtitle-job',
+            args=(job.season.series_id, job.season_id, job.pk),
+            request=self.context.get('request'),
+        )
+
+
 class FTSSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for FTSListView. Manages instances that match FTS conditions.
@@ -506,10 +557,64 @@ class FTSSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.ModelS
         )
 
 
+class SubtitleCueHitSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for subtitle cue which matches FTS query. Shows cue timing and highlighted text.
+    """
+    headline = serializers.CharField(
+    )
+
+    class Meta:
+        model = archives.models.SubtitleCue
+        fields = (
+            'number',
+            'start_ms',
+            'end_ms',
+            'headline',
+        )
+
+
 class FTSDetailSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.Serializer):
     """
-    Serializer for FTSListView, detail action. Shows highlighted text.
+    Serializer for FTSListView, detail action. Shows highlighted text of matching cues and their timings.
+    """
+    max_headline_fragments = 10
+
+    search_headline = serializers.SerializerMethodField(
+    )
+    hits = SubtitleCueHitSerializer(
+        source='matching_cues',
+        many=True,
+    )
+
+    def get_search_headline(self, obj: archives.models.Subtitles) -> str:
+        return ' ... '.join(cue.headline for cue in obj.matching_cues[:self.max_headline_fragments])
+
+
+class FTSSuggestionSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.Serializer):
+    """
+    Serializer for FTSListView, suggestions action. Shows vocabulary word with its document frequency
+    and trigram similarity to the searched term.
+    """
+    word = serializers.CharField(
+    )
+    ndoc = serializers.IntegerField(
+        source='document_frequency',
+    )
+    similarity = serializers.FloatField(
+    )
+
+
+class FTSSuggestionsSerializer(serializer_mixins.ReadOnlyAllFieldsMixin, serializers.Serializer):
+    """
+    Serializer for FTSListView, suggestions action. Shows completions and typo corrections of the last
+    word of search text.
     """
-    search_headline = serializers.CharField(
-        source='headline',
-    )
\ No newline at end of file
+    term = serializers.CharField(
+    )
+    completions = FTSSuggestionSerializer(
+        many=True,
+    )
+    corrections = FTSSuggestionSerializer(
+        many=True,
+    )
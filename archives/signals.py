@@ -1,34 +1,112 @@
+import functools
+
+import guardian.models
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.search import SearchVector
-from django.db.models import F, Func, Value
+from django.db import transaction
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.signals import connection_created
+from django.db.models import Value
 from django.db.models.base import ModelBase
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from archives.models import Subtitles
+import archives.tasks
+from archives.helpers import fts_dictionaries, subtitle_ingestion
+from archives.key_constructors import bump_series_versions, bump_subtitles_version
+from archives.models import GroupingModel, ImageBlob, ImageModel, SeasonModel, SubtitleCue, Subtitles, \
+    TvSeriesModel
 
 
 @receiver(post_save, sender=Subtitles)
 def generate_lexemes(sender: ModelBase, instance: Subtitles, **kwargs) -> None:
     """
-    Fills field 'full_text' of model 'Subtitles' with lexemes.
+    Fills field 'full_text' of model 'Subtitles' with lexemes and rebuilds subtitle cues.
     """
     if instance.full_text is None:
         language_code = instance.language
         config = sender.objects.get_search_configuration(language_code)
 
         #  Converts  times like 00:00:13,320 to 000013320 . This is needed to avoid FTS parsing it to a bunch
-        #  of plain integers. Update is used in order to avoid recursion in post_save.
-        #  re.sub(r'(\d\d):(\d\d):(\d\d),(\d\d\d)', r'\1\2\3\4', text) - an alternative pure python implementation.
+        #  of plain integers. Raw text is not stored in subtitles table, therefore it is converted in python.
+        #  Update is used in order to avoid recursion in post_save.
+        _, fts_text = subtitle_ingestion.normalize(instance.text)
         sender.objects.filter(pk=instance.pk).update(
             search_configuration=config,
-            full_text=SearchVector(
-                Func(
-                    F('text'),
-                    Value(r'(\d\d):(\d\d):(\d\d),(\d\d\d)'),
-                    Value(r'\1\2\3\4'),
-                    Value(r'g'),
-                    function='regexp_replace',
-                    arity=4,
-                ),
-                config=config,
-            ))
+            full_text=SearchVector(Value(fts_text), config=config),
+        )
+        SubtitleCue.objects.rebuild(instance, config)
+
+
+@receiver(post_save, sender=ImageModel)
+def process_image(sender: ModelBase, instance: ImageModel, created: bool, **kwargs) -> None:
+    """
+    Sends newly created image to post-processing after transaction commit.
+    """
+    if created:
+        transaction.on_commit(functools.partial(archives.tasks.process_image.delay, instance.pk))
+
+
+@receiver(post_delete, sender=ImageModel)
+def release_image_blob(sender: ModelBase, instance: ImageModel, **kwargs) -> None:
+    """
+    Deletes content addressed file once last image referring to it is deleted.
+    """
+    if instance.blob_id is not None:
+        transaction.on_commit(functools.partial(ImageBlob.objects.release, instance.blob_id))
+
+
+@receiver([post_save, post_delete, ], sender=GroupingModel)
+@receiver([post_save, post_delete, ], sender=ImageModel)
+@receiver([post_save, post_delete, ], sender=SeasonModel)
+@receiver([post_save, post_delete, ], sender=TvSeriesModel)
+@receiver([post_save, post_delete, ], sender=guardian.models.UserObjectPermission)
+def invalidate_series_cache(sender: ModelBase, instance: ModelBase, **kwargs) -> None:
+    """
+    Bumps cache versions of series list and of affected series detail. Versions are bumped once
+    more after transaction commit, otherwise concurrent request might cache uncommitted state
+    under the new version.
+    """
+    is_series_related = getattr(instance, 'content_type_id', None) == \
+        ContentType.objects.get_for_model(TvSeriesModel).pk
+
+    if sender is TvSeriesModel:
+        series_pks = (instance.pk, )
+    elif sender is SeasonModel:
+        series_pks = (instance.series_id, )
+    elif sender is GroupingModel:
+        series_pks = (instance.from_series_id, instance.to_series_id, )
+    elif sender is ImageModel:
+        series_pks = (instance.object_id, ) if is_series_related else ()
+    elif is_series_related:
+        series_pks = (instance.object_pk, )
+    else:
+        #  Guardian permissions on models other then series do not affect series output.
+        return None
+
+    bump_series_versions(series_pks)
+    transaction.on_commit(functools.partial(bump_series_versions, series_pks))
+
+
+@receiver([post_save, post_delete, ], sender=SeasonModel)
+@receiver([post_save, post_delete, ], sender=Subtitles)
+@receiver([post_save, post_delete, ], sender=TvSeriesModel)
+def invalidate_subtitles_search_cache(sender: ModelBase, instance: ModelBase, **kwargs) -> None:
+    """
+    Bumps cache version of FTS responses once subtitles lexemes are generated or subtitles are
+    deleted. Seasons and series are shown in FTS responses as well. Version is bumped once more
+    after transaction commit for the same reason as in 'invalidate_series_cache'.
+    """
+    bump_subtitles_version()
+    transaction.on_commit(bump_subtitles_version)
+
+
+@receiver(connection_created)
+def warm_up_fts_dictionaries(sender, connection, **kwargs) -> None:
+    """
+    Preloads FTS dictionaries in new DB connection so that first FTS query on it isn't slow.
+    """
+    #  Maintenance connection to 'postgres' DB (e.g. on test DB creation) doesn't run FTS queries.
+    if settings.FTS_WARM_UP_ENABLED and connection.vendor == 'postgresql' and connection.alias != NO_DB_ALIAS:
+        fts_dictionaries.warm_up(connection)
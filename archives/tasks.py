@@ -1,16 +1,23 @@
 from __future__ import absolute_import, unicode_literals
 
+from concurrent.futures import ThreadPoolExecutor
+
 from celery import shared_task
-from series.helpers import custom_functions
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+
+import archives.models
+from archives.helpers import image_rehash, image_uploads, media_gc, subtitle_ingestion
+from archives.key_constructors import bump_series_versions
 import administration.handle_urls
 
 
 @shared_task
 def clean_media_root():
     """
-    Cleans MEDIA_ROOT from garbage.
+    Cleans MEDIA_ROOT from garbage. Interrupted run is resumed.
     """
-    custom_functions.clean_garbage_in_folder()
+    media_gc.collect_media_garbage()
 
 
 @shared_task
@@ -19,3 +26,62 @@ def notify_authors_about_invalid_urls():
     Send to responsible users information about their series have invalid urls.
     """
     administration.handle_urls.HandleWrongUrls()()
+
+
+@shared_task
+def delete_stale_image_upload_parts():
+    """
+    Deletes part files of abandoned resumable image uploads.
+    """
+    return image_uploads.delete_stale_parts(settings.IMAGE_UPLOAD_PART_TIMEOUT)
+
+
+@shared_task
+def process_image(pk: int):
+    """
+    Generates derivatives of the image and its hash if needed.
+    """
+    try:
+        image = archives.models.ImageModel.objects.get(pk=pk)
+    except archives.models.ImageModel.DoesNotExist:
+        return None
+
+    status = image.process()
+    #  Series output includes image derivatives.
+    if image.content_type_id == ContentType.objects.get_for_model(archives.models.TvSeriesModel).pk:
+        bump_series_versions((image.object_id, ))
+
+    return status
+
+
+@shared_task
+def process_pending_images():
+    """
+    Sends images which were not processed yet to post-processing.
+    """
+    pending = archives.models.ImageModel.objects.filter(
+        processing_status=archives.models.ImageProcessingStatusChoices.PENDING,
+    ).values_list('pk', flat=True)
+    for pk in pending.iterator():
+        process_image.delay(pk)
+
+
+@shared_task
+def rehash_images(algorithm: str, only_missing: bool = True):
+    """
+    Makes hashes of images by given algorithm in bulk. Images are hashed in threads as
+    prefork worker processes are daemonic and can't start process pool.
+    """
+    return image_rehash.rehash_images(
+        algorithm,
+        only_missing,
+        executor_class=ThreadPoolExecutor,
+    )
+
+
+@shared_task
+def ingest_subtitles(pk: int):
+    """
+    Runs subtitles ingestion pipeline of the job.
+    """
+    return subtitle_ingestion.ingest_subtitles(pk).status
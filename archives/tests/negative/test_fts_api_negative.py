@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.http import QueryDict
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -32,6 +33,7 @@ class SubtitlesFTSPositiveTest(test_helpers.TestHelpers, APITestCase):
         cls.season_1_1, *rest = cls.seasons
 
     def setUp(self) -> None:
+        cache.clear()
         self.query_dict = QueryDict(mutable=True)
 
     def test_validate_query_params_no_search(self):
@@ -95,4 +97,21 @@ class SubtitlesFTSPositiveTest(test_helpers.TestHelpers, APITestCase):
             status_code=status.HTTP_400_BAD_REQUEST,
             field=None,
             error_message=expected_error_message,
-        )
\ No newline at end of file
+        )
+
+    def test_top_k_invalid_token(self):
+        """
+        Check that malformed top-k continuation token results in 404.
+        """
+        self.client.force_authenticate(user=self.user_1)
+
+        response = self.client.get(
+            reverse('full-text-search-list'),
+            data={'search': 'Harry', 'token': 'not-a-token', },
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
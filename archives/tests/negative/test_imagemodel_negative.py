@@ -2,6 +2,7 @@ import tempfile
 
 from django.core import exceptions
 from django.core.files.base import File
+from django.db import transaction
 from django.db.utils import IntegrityError
 from rest_framework.test import APITestCase
 
@@ -60,10 +61,21 @@ class ImageModelNegativeTest(APITestCase):
         """
         expected_error_message = error_codes.IMAGE_ALREADY_EXISTS.message
 
+        image = archives.models.ImageModel.objects.create(
+            image=self.test_image,
+            content_object=self.series_1,
+            entry_author=self.user_3,
+        )
+        self.addCleanup(archives.models.ImageModel.delete_stored_image_hash, image.pk)
+        #  Hash is stored in near-duplicate index on commit, test case transaction is never committed.
+        connection = transaction.get_connection()
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
+
         with self.assertRaisesMessage(exceptions.ValidationError, expected_error_message):
-            for _ in range(2):
-                archives.models.ImageModel.objects.create(
-                    image=self.test_image,
-                    content_object=self.series_1,
-                    entry_author=self.user_3,
-                )
+            archives.models.ImageModel.objects.create(
+                image=self.test_image,
+                content_object=self.series_1,
+                entry_author=self.user_3,
+            )
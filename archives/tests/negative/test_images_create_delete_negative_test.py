@@ -1,6 +1,7 @@
 import operator
 
 from django.conf import settings
+from django.test import override_settings
 from rest_framework import status, exceptions as drf_exceptions
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
@@ -51,6 +52,78 @@ class ImagesCreateNegativeTest(test_helpers.TestHelpers, APITestCase):
             field=None,
         )
 
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=10)
+    def test_file_too_large(self):
+        """
+        Check that file larger than IMAGE_UPLOAD_MAX_SIZE is rejected.
+        """
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+        response = self.client.generic(
+            'POST',
+            reverse('upload', args=[self.series_1.pk, 'small_image.gif']),
+            data=self.image.read(),
+            content_type='image/gif',
+        )
+
+        self.check_status_and_error_message(
+            response,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_message=error_codes.FILE_TOO_LARGE.message,
+            field=None,
+        )
+
+    def test_wrong_upload_offset(self):
+        """
+        Check that chunk of resumable upload which doesn't continue already received part is rejected.
+        """
+        content = self.image.read()
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+        response = self.client.generic(
+            'POST',
+            reverse('upload', args=[self.series_1.pk, 'small_image.gif']),
+            data=content[10:],
+            content_type='image/gif',
+            HTTP_CONTENT_RANGE=f'bytes 10-{len(content) - 1}/{len(content)}',
+        )
+
+        self.check_status_and_error_message(
+            response,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_message=error_codes.WRONG_UPLOAD_OFFSET.message,
+        )
+        self.assertEqual(
+            response.data['received'],
+            '0',
+        )
+
+    def test_chunk_upload_permissions(self):
+        """
+        Check that chunk of resumable upload is rejected before it is received if user can't upload
+        images of the series or series doesn't exist.
+        """
+        content = self.image.read()
+        self.client.force_authenticate(user=self.series_2.entry_author)
+
+        for series_pk, status_code in (
+                (self.series_1.pk, status.HTTP_403_FORBIDDEN),
+                (self.series_2.pk + self.series_1.pk, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(series_pk=series_pk):
+                response = self.client.generic(
+                    'POST',
+                    reverse('upload', args=[series_pk, 'small_image.gif']),
+                    data=content[:10],
+                    content_type='image/gif',
+                    HTTP_CONTENT_RANGE=f'bytes 0-9/{len(content)}',
+                )
+
+                self.assertEqual(
+                    response.status_code,
+                    status_code,
+                )
+
 
 class ImageDeleteNegativeTest(test_helpers.TestHelpers, APITestCase):
     """
@@ -0,0 +1,27 @@
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class SeriesStatisticsNegativeTest(APITestCase):
+    """
+    Negative test on denormalized series statistics.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        initial_data.create_seasons(cls.series)
+
+    def test_management_command_out_of_sync(self):
+        """
+        Check that management command raises error if statistics are out of sync with seasons.
+        """
+        archives.models.SeriesStatisticsModel.objects.filter(series=self.series[0]).update(episodes_cnt=0)
+
+        with self.assertRaisesMessage(CommandError, str(self.series[0].pk)):
+            call_command('series_statistics')
@@ -0,0 +1,56 @@
+import os
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+from archives.helpers import subtitle_import
+from archives.tests.data import initial_data
+from series import error_codes
+from users.helpers import create_test_users
+
+TEST_SRT_PATH = os.path.join(settings.BASE_DIR, 'series', 'files_for_tests', 'test.srt')
+
+
+class SubtitlesImportNegativeTest(APITestCase):
+    """
+    Negative test on bulk import of season subtitles archive.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.seasons, cls.seasons_dict = initial_data.create_seasons(
+            cls.series,
+            num_seasons=1,
+            return_sorted=True,
+        )
+        cls.season_1_1, *rest = cls.seasons
+
+    def test_wrong_language(self):
+        """
+        Check that file which language is not ISO 639 code is rejected on its own.
+        """
+        parsed = [
+            subtitle_import.ParsedSubtitle('Show.S01E01.srt', 1, 'zh-cn', '', [], b'', 0),
+            subtitle_import.ParsedSubtitle('Show.S01E01.en.srt', 1, 'en', '', [], b'', 0),
+        ]
+
+        valid, rejected = subtitle_import.SubtitlesImporter(self.season_1_1).validate(parsed)
+
+        self.assertListEqual(
+            valid,
+            parsed[1:],
+        )
+        self.assertListEqual(
+            [result.error['code'] for result in rejected],
+            [error_codes.WRONG_LANGUAGE_CODE.code],
+        )
+
+    def test_not_an_archive(self):
+        """
+        Check that file which is neither zip nor tar archive results in command error.
+        """
+        with self.assertRaises(CommandError):
+            call_command('import_subtitles', self.season_1_1.pk, TEST_SRT_PATH)
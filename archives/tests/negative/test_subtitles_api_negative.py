@@ -1,5 +1,6 @@
 import io
 import os
+from unittest import mock
 
 from django.conf import settings
 from django.core.files import File
@@ -7,6 +8,9 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+import archives.models
+import archives.tasks
+from archives.helpers import subtitle_ingestion
 from archives.tests.data import initial_data
 from series import error_codes
 from series.helpers import test_helpers
@@ -65,7 +69,7 @@ class SubtitlesAPINegativeTest(test_helpers.TestHelpers, APITestCase):
     def test_upload_api_no_lng_can_not_determine_lng_automatically(self):
         """
         Check that if no language was provided on upload and language can;t be recognized
-        automatically by some reason or another, than validation error is arisen.
+        automatically by some reason or another, than ingestion job fails with this error.
         """
         expected_error_message = error_codes.LANGUAGE_UNDETECTED.message
         del self.data['language']
@@ -74,6 +78,84 @@ class SubtitlesAPINegativeTest(test_helpers.TestHelpers, APITestCase):
 
         self.client.force_authenticate(user=self.season_1_1.entry_author)
 
+        response = self.client.post(
+            reverse(
+                'seasonmodel-add-subtitle',
+                args=(self.season_1_1.series_id, self.season_1_1.pk,)
+            ),
+            data=self.data,
+            format='multipart',
+        )
+        job = subtitle_ingestion.ingest_subtitles(response.data['id'])
+
+        self.assertEqual(
+            job.status,
+            archives.models.SubtitleIngestionStatusChoices.FAILED,
+        )
+        self.assertEqual(
+            job.stage,
+            archives.models.SubtitleIngestionStageChoices.LANGUAGE,
+        )
+        self.assertDictEqual(
+            job.error,
+            {'code': error_codes.LANGUAGE_UNDETECTED.code, 'messages': [expected_error_message]},
+        )
+        self.assertFalse(
+            archives.models.Subtitles.objects.exists(),
+        )
+
+    def test_ingestion_unexpected_error(self):
+        """
+        Check that ingestion job which failed with unexpected error is marked as failed with stage
+        it failed at and error is re-raised.
+        """
+        self.client.force_authenticate(user=self.season_1_1.entry_author)
+
+        response = self.client.post(
+            reverse(
+                'seasonmodel-add-subtitle',
+                args=(self.season_1_1.series_id, self.season_1_1.pk,)
+            ),
+            data=self.data,
+            format='multipart',
+        )
+        with mock.patch.object(
+                subtitle_ingestion,
+                'normalize',
+                side_effect=RuntimeError('Unexpected error.'),
+        ), self.assertLogs(subtitle_ingestion.logger, level='ERROR'):
+            with self.assertRaises(RuntimeError):
+                archives.tasks.ingest_subtitles(response.data['id'])
+
+        job = archives.models.SubtitleIngestionJob.objects.get(pk=response.data['id'])
+
+        self.assertEqual(
+            job.status,
+            archives.models.SubtitleIngestionStatusChoices.FAILED,
+        )
+        self.assertEqual(
+            job.stage,
+            archives.models.SubtitleIngestionStageChoices.NORMALIZATION,
+        )
+        self.assertDictEqual(
+            job.error,
+            {
+                'code': error_codes.SUBTITLE_INGESTION_FAILED.code,
+                'messages': [error_codes.SUBTITLE_INGESTION_FAILED.message],
+            },
+        )
+        self.assertIsNotNone(
+            job.finished_at,
+        )
+
+    def test_upload_api_episode_number_gt_season_episodes(self):
+        """
+        Check that upload of subtitles of episode which season doesn't have is rejected right away.
+        """
+        self.data['episode_number'] = self.season_1_1.number_of_episodes + 1
+
+        self.client.force_authenticate(user=self.season_1_1.entry_author)
+
         response = self.client.post(
             reverse(
                 'seasonmodel-add-subtitle',
@@ -85,8 +167,8 @@ class SubtitlesAPINegativeTest(test_helpers.TestHelpers, APITestCase):
         self.check_status_and_error_message(
             response,
             status_code=status.HTTP_400_BAD_REQUEST,
-            error_message=expected_error_message,
-            field=None,
+            error_message=error_codes.SUB_EPISODE_NUM_GT_SEASON_EPISODE_NUM.message,
+            field='episode_number',
         )
 
     def test_delete_subtitle_api_permissions(self):
@@ -1,7 +1,9 @@
 import os
+from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
 from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
 from django.db import connection
 from django.http import QueryDict
 from django.test.utils import CaptureQueriesContext
@@ -11,6 +13,7 @@ from rest_framework.test import APITestCase
 
 import archives.models
 import archives.serializers
+from archives.helpers import fts_queries
 from archives.tests.data import initial_data
 from series.helpers import test_helpers
 from users.helpers import create_test_users
@@ -49,6 +52,7 @@ class SubtitlesFTSPositiveTest(test_helpers.TestHelpers, APITestCase):
         cls.subtitle = archives.models.Subtitles.objects.create(**data)
 
     def setUp(self) -> None:
+        cache.clear()
         self.query_dict = QueryDict(mutable=True)
 
     def test_api_response(self):
@@ -178,3 +182,308 @@ class SubtitlesFTSPositiveTest(test_helpers.TestHelpers, APITestCase):
             'Harry',
             response.data['search_headline'],
         )
+        self.assertDictEqual(
+            dict(response.data['hits'][0]),
+            {
+                'number': 53,
+                'start_ms': 303704,
+                'end_ms': 307322,
+                'headline': response.data['hits'][0]['headline'],
+            },
+        )
+        self.assertIn(
+            '<b>Harry</b>',
+            response.data['hits'][0]['headline'],
+        )
+
+
+class SubtitlesFTSPlannerPositiveTest(APITestCase):
+    """
+    Positive test on FTS with constant tsquery per search configuration.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.seasons, cls.seasons_dict = initial_data.create_seasons(
+            cls.series,
+            num_seasons=1,
+            return_sorted=True,
+        )
+        cls.season_1_1, *rest = cls.seasons
+
+        cls.subtitle_en = archives.models.Subtitles.objects.create(
+            episode_number=1,
+            language='en',
+            text='Harry caught the snitch.',
+            season=cls.season_1_1,
+        )
+        cls.subtitle_fr = archives.models.Subtitles.objects.create(
+            episode_number=1,
+            language='fr',
+            text='Harry a attrapé le vif d\'or.',
+            season=cls.season_1_1,
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_search_configurations(self):
+        """
+        Check that distinct search configurations of subtitles in DB are returned.
+        """
+        self.assertListEqual(
+            archives.models.Subtitles.objects.search_configurations(),
+            ['english_hunspell', 'french_hunspell'],
+        )
+
+    def test_full_text_search(self):
+        """
+        Check that subtitles of all configurations are found if language is not specified and only
+        subtitles of given language otherwise.
+        """
+        self.assertSetEqual(
+            set(archives.models.Subtitles.objects.full_text_search('Harry')),
+            {self.subtitle_en, self.subtitle_fr},
+        )
+        self.assertListEqual(
+            list(archives.models.Subtitles.objects.full_text_search('Harry', language_code='fr')),
+            [self.subtitle_fr],
+        )
+
+    def test_gin_index_is_used(self):
+        """
+        Check that FTS condition is resolved by GIN index scans, one per search configuration.
+        """
+        with connection.cursor() as cursor:
+            #  Table is too small for planner to prefer index over sequential scan on its own.
+            cursor.execute('SET LOCAL enable_seqscan = off;')
+
+        plan = archives.models.Subtitles.objects.full_text_search('Harry').explain()
+
+        self.assertNotIn(
+            f'Seq Scan on {archives.models.Subtitles._meta.db_table}',
+            plan,
+        )
+        self.assertEqual(
+            plan.count('Bitmap Index Scan'),
+            2,
+        )
+        self.assertIn(
+            'subtitles_fts_en_index',
+            plan,
+        )
+
+    def test_top_k_pagination(self):
+        """
+        Check that in top-k mode results are paginated by continuation token with positional rank
+        continued on the next page and approximate count of matches is returned.
+        """
+        self.client.force_authenticate(user=self.users[0])
+
+        response = self.client.get(
+            reverse('full-text-search-list'),
+            data={'search': 'Harry', 'pagination': 'top', 'limit': 1, },
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertIn(
+            'approximate_count',
+            response.data,
+        )
+        self.assertEqual(
+            response.data['results'][0]['rank'],
+            1,
+        )
+
+        first_pk = response.data['results'][0]['subtitle_pk']
+        response = self.client.get(response.data['next'], format='json')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            response.data['results'][0]['rank'],
+            2,
+        )
+        self.assertSetEqual(
+            {first_pk, response.data['results'][0]['subtitle_pk']},
+            {self.subtitle_en.pk, self.subtitle_fr.pk},
+        )
+        self.assertIsNone(
+            response.data['next'],
+        )
+
+    def test_top_k_pagination_tied_ranks(self):
+        """
+        Check that matches with the same rank are neither skipped nor repeated when they are split
+        by page boundary.
+        """
+        #  'create' is used as lexemes are generated on 'post_save'.
+        subtitles = [
+            archives.models.Subtitles.objects.create(
+                episode_number=episode_number,
+                language='en',
+                text=self.subtitle_en.text,
+                season=self.season_1_1,
+            ) for episode_number in (2, 3)
+        ]
+        self.client.force_authenticate(user=self.users[0])
+
+        seen_pks, positions = [], []
+        next_link = reverse('full-text-search-list') + '?search=Harry&language=en&pagination=top&limit=1'
+        while next_link is not None:
+            response = self.client.get(next_link, format='json')
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK,
+            )
+            seen_pks.extend(result['subtitle_pk'] for result in response.data['results'])
+            positions.extend(result['rank'] for result in response.data['results'])
+            next_link = response.data['next']
+
+        self.assertCountEqual(
+            seen_pks,
+            [self.subtitle_en.pk, *(subtitle.pk for subtitle in subtitles)],
+        )
+        self.assertListEqual(
+            positions,
+            [1, 2, 3],
+        )
+
+
+class SubtitlesFTSCachePositiveTest(APITestCase):
+    """
+    Positive test on cached FTS query analysis and cached FTS responses.
+    /archives/tvseries/full-text-search/ GET
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.seasons, cls.seasons_dict = initial_data.create_seasons(
+            cls.series,
+            num_seasons=1,
+            return_sorted=True,
+        )
+        cls.season_1_1, *rest = cls.seasons
+
+        cls.subtitle = archives.models.Subtitles.objects.create(
+            episode_number=1,
+            language='en',
+            text='Harry caught the snitch.',
+            season=cls.season_1_1,
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_authenticate(user=self.users[0])
+
+    def search(self, search: str = 'Harry') -> dict:
+        """
+        Returns response content. Cached responses do not have 'data' attribute.
+        """
+        response = self.client.get(
+            reverse('full-text-search-list'),
+            data={'search': search, 'language': 'en', },
+            format='json',
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        return response.json()
+
+    def test_analyze(self):
+        """
+        Check that search text is normalized to tsquery and analysis is cached. Search text is passed
+        as query parameter.
+        """
+        analysis = fts_queries.analyze("Harry's snitches", 'plain', ['english_hunspell', 'simple'])
+
+        self.assertEqual(
+            analysis['simple'],
+            fts_queries.QueryAnalysis('simple', "'harry' & 's' & 'snitches'", 5),
+        )
+        self.assertGreater(
+            analysis['english_hunspell'].numnode,
+            0,
+        )
+        self.assertEqual(
+            fts_queries.analyze('the', 'plain', ['english_hunspell'])['english_hunspell'].numnode,
+            0,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            fts_queries.analyze("Harry's snitches", 'plain', ['simple'])
+
+        self.assertEqual(
+            len(ctx.captured_queries),
+            0,
+        )
+
+    def test_list_served_from_cache(self):
+        """
+        Check that list response is served from cache for the same search text while nothing has
+        changed through signals.
+        """
+        self.search('Harry')
+        archives.models.Subtitles.objects.filter(pk=self.subtitle.pk).update(episode_number=2)
+
+        self.assertEqual(
+            self.search('Harry')['results'][0]['episode_number'],
+            1,
+        )
+
+    def test_pagination_links_of_own_search_text(self):
+        """
+        Check that search texts with the same lexemes do not share cached response, as pagination
+        links of response contain raw search text of the request.
+        """
+        archives.models.Subtitles.objects.create(
+            episode_number=2,
+            language='en',
+            text='Harry lost the snitch.',
+            season=self.season_1_1,
+        )
+
+        for search in ('Harry', 'harry'):
+            with self.subTest(search=search):
+                response = self.client.get(
+                    reverse('full-text-search-list'),
+                    data={'search': search, 'language': 'en', 'limit': 1, },
+                    format='json',
+                )
+
+                self.assertEqual(
+                    parse_qs(urlparse(response.json()['next']).query)['search'],
+                    [search],
+                )
+
+    def test_list_invalidated(self):
+        """
+        Check that saving or deleting subtitles invalidates list cache.
+        """
+        self.search()
+        archives.models.Subtitles.objects.filter(pk=self.subtitle.pk).update(episode_number=2)
+        self.subtitle.refresh_from_db()
+        self.subtitle.save()
+
+        self.assertEqual(
+            self.search()['results'][0]['episode_number'],
+            2,
+        )
+
+        self.subtitle.delete()
+
+        self.assertListEqual(
+            self.search()['results'],
+            [],
+        )
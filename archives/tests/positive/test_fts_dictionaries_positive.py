@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from archives.helpers import fts_dictionaries
+
+
+class FTSDictionariesWarmUpPositiveTest(APITestCase):
+    """
+    Positive test on preloading FTS dictionaries in new DB connections.
+    """
+
+    def test_warm_up(self):
+        """
+        Check that existing configurations are warmed up with timings recorded and missing ones are
+        skipped and reported once.
+        """
+        key = (connection.settings_dict['NAME'], 'no_such_configuration')
+        self.addCleanup(fts_dictionaries.reported_missing.discard, key)
+        connections_before = fts_dictionaries.timings.get('english_hunspell', {}).get('connections', 0)
+
+        with mock.patch.object(fts_dictionaries.logger, 'warning') as warning:
+            for _ in range(2):
+                result = fts_dictionaries.warm_up(connection, ['english_hunspell', 'no_such_configuration'])
+
+                self.assertSetEqual(
+                    set(result),
+                    {'english_hunspell'},
+                )
+
+        warning.assert_called_once()
+        self.assertIn(
+            key,
+            fts_dictionaries.reported_missing,
+        )
+        self.assertEqual(
+            fts_dictionaries.timings['english_hunspell']['connections'],
+            connections_before + 2,
+        )
+
+    def test_maintenance_connection_is_not_warmed_up(self):
+        """
+        Check that maintenance connection to 'postgres' DB isn't warmed up.
+        """
+        with mock.patch.object(fts_dictionaries, 'warm_up') as warm_up:
+            with connection._nodb_cursor():
+                pass
+
+        warm_up.assert_not_called()
+
+    def test_new_connection_is_warmed_up(self):
+        """
+        Check that new connection is warmed up on creation unless it is cold connection.
+        """
+        with mock.patch.object(fts_dictionaries, 'load_configuration', return_value=0.0) as load:
+            with fts_dictionaries.cold_connection() as cold_connection:
+                load.assert_not_called()
+
+                cold_connection.close()
+                cold_connection.ensure_connection()
+
+        self.assertTrue(
+            load.called,
+        )
@@ -0,0 +1,143 @@
+import os
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.helpers import file_uploads
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+@override_settings(
+    IMAGE_STORAGE_MODE=file_uploads.CONTENT,
+    IMAGE_HASH_OFF_REQUEST=True,
+)
+class ImageBlobPositiveTest(APITestCase):
+    """
+    Positive test on content addressed image storage with reference counting.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+        with open(os.path.join(settings.IMAGES_FOR_TESTS, 'real_test_image.jpg'), 'rb') as image_file:
+            cls.content = image_file.read()
+
+    def create_image(self, series: archives.models.TvSeriesModel, filename: str) -> archives.models.ImageModel:
+        return archives.models.ImageModel.objects.create(
+            fc=False,
+            image=SimpleUploadedFile(filename, self.content),
+            content_object=series,
+            entry_author=series.entry_author,
+        )
+
+    def test_same_content_stored_once(self):
+        """
+        Check that images with the same content share one file stored by content digest.
+        """
+        image_1 = self.create_image(self.series_1, 'poster.JPG')
+        image_2 = self.create_image(self.series_2, 'other_name.jpg')
+
+        blob = archives.models.ImageBlob.objects.get()
+        self.assertEqual(
+            image_1.image.name,
+            image_2.image.name,
+        )
+        self.assertEqual(
+            image_1.image.name,
+            file_uploads.content_addressed_path(blob.digest, 'poster.jpg'),
+        )
+        self.assertEqual(
+            blob.reference_count,
+            2,
+        )
+        with image_1.image.open('rb') as image_file:
+            self.assertEqual(
+                image_file.read(),
+                self.content,
+            )
+
+    @mock.patch('series.celery.delete_file.delay')
+    def test_release(self, delete_file):
+        """
+        Check that blob is released only once the last image referring to it is deleted.
+        """
+        image_1 = self.create_image(self.series_1, 'poster.jpg')
+        image_2 = self.create_image(self.series_2, 'poster.jpg')
+        blob = archives.models.ImageBlob.objects.get()
+        full_path = image_1.image.path
+
+        image_1.delete()
+
+        self.assertIsNone(
+            archives.models.ImageBlob.objects.release(blob.digest),
+        )
+        blob.refresh_from_db()
+        self.assertEqual(
+            blob.reference_count,
+            1,
+        )
+
+        image_2.delete()
+
+        self.assertEqual(
+            archives.models.ImageBlob.objects.release(blob.digest),
+            blob.path,
+        )
+        self.assertFalse(
+            archives.models.ImageBlob.objects.exists(),
+        )
+        self.assertFalse(
+            os.path.exists(full_path),
+        )
+
+    @mock.patch('series.celery.delete_file.delay')
+    def test_release_rolled_back(self, delete_file):
+        """
+        Check that renamed files are renamed back if blob deletion is rolled back.
+        """
+        image = self.create_image(self.series_1, 'poster.jpg')
+        blob = archives.models.ImageBlob.objects.get()
+        full_path = image.image.path
+        image.delete()
+
+        with mock.patch('django.db.transaction.on_commit', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archives.models.ImageBlob.objects.release(blob.digest)
+
+        self.assertTrue(
+            archives.models.ImageBlob.objects.filter(digest=blob.digest).exists(),
+        )
+        with open(full_path, 'rb') as image_file:
+            self.assertEqual(
+                image_file.read(),
+                self.content,
+            )
+        delete_file.assert_not_called()
+
+    @override_settings(IMAGE_STORAGE_MODE=file_uploads.PATH)
+    def test_series_named_like_content_dir(self):
+        """
+        Check that images of series directory named like IMAGE_CONTENT_DIR are not mistaken for
+        content addressed files and are not shared.
+        """
+        self.series_1.name = settings.IMAGE_CONTENT_DIR
+        self.series_1.save(update_fields=('name', ))
+
+        image_1 = self.create_image(self.series_1, 'poster.jpg')
+        image_2 = self.create_image(self.series_1, 'poster.jpg')
+
+        self.assertNotEqual(
+            image_1.image.name,
+            image_2.image.name,
+        )
+        self.assertFalse(
+            archives.models.ImageBlob.objects.exists(),
+        )
@@ -0,0 +1,82 @@
+import random
+
+import imagehash
+from rest_framework.test import APISimpleTestCase
+
+from archives.helpers import image_hash_index
+
+
+class ImageHashIndexPositiveTest(APISimpleTestCase):
+    """
+    Positive tests on near-duplicate image hash index.
+    """
+
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.hashes = {pk: rng.getrandbits(64) for pk in range(1, 2001)}
+        #  Near duplicates of first hash with 1 to 12 flipped bits.
+        for bits in range(1, 13):
+            self.hashes[10000 + bits] = self.hashes[1] ^ ((1 << bits) - 1)
+
+        self.index = image_hash_index.ImageHashIndex(
+            (pk, image_hash_index.int_to_hash(value)) for pk, value in self.hashes.items()
+        )
+
+    def test_mapping(self):
+        """
+        Check that index behaves as mapping of image pk to image hash.
+        """
+        self.assertEqual(
+            len(self.index),
+            len(self.hashes),
+        )
+        self.assertIsInstance(
+            self.index[1],
+            imagehash.ImageHash,
+        )
+        self.assertEqual(
+            image_hash_index.hash_to_int(self.index[1]),
+            self.hashes[1],
+        )
+
+        del self.index[1]
+
+        self.assertNotIn(
+            1,
+            self.index,
+        )
+        self.assertNotIn(
+            1,
+            self.index.near_duplicates(image_hash_index.int_to_hash(self.hashes[1]), distance=10),
+        )
+
+    def test_near_duplicates(self):
+        """
+        Check that search returns same hashes as linear scan.
+        """
+        for distance in (1, 5, 10, 13):
+            with self.subTest(distance=distance):
+                expected = {
+                    pk: image_hash_index.hamming_distance(self.hashes[1], value)
+                    for pk, value in self.hashes.items()
+                    if image_hash_index.hamming_distance(self.hashes[1], value) < distance
+                }
+                self.assertDictEqual(
+                    self.index.near_duplicates(image_hash_index.int_to_hash(self.hashes[1]), distance),
+                    expected,
+                )
+
+    def test_incremental_update(self):
+        """
+        Check that replaced hash is not found by it's former value anymore.
+        """
+        query = image_hash_index.int_to_hash(self.hashes[1])
+        self.index[1] = image_hash_index.int_to_hash(~self.hashes[1] & (2 ** 64 - 1))
+
+        self.assertNotIn(
+            1,
+            self.index.near_duplicates(query, distance=10),
+        )
+        self.assertTrue(
+            self.index.has_near_duplicate(query, distance=10),
+        )
@@ -0,0 +1,75 @@
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.helpers import image_hash_index
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class ImageHashLookupPositiveTest(APITestCase):
+    """
+    Positive tests on 'hamming_lt' lookup of image hash and near-duplicate search in DB.
+    """
+    base_hash = 0x0f0f_f0f0_1234_abcd
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.images = initial_data.create_images_instances(cls.series, num_img=4)
+
+        #  Hashes with 0, 3, 9, 10, 20 bits flipped and one with flipped highest bit.
+        cls.hashes = {}
+        for image, mask in zip(cls.images, (0, 0b111, 0x1ff, 0x3ff, 0xfffff, 1 << 63)):
+            cls.hashes[image.pk] = cls.base_hash ^ mask
+            archives.models.ImageModel.objects.filter(pk=image.pk).update(
+                image_hash=image_hash_index.int_to_hash(cls.hashes[image.pk]),
+            )
+
+    def brute_force(self, value: int, distance: int) -> set:
+        return {
+            pk for pk, stored in self.hashes.items()
+            if image_hash_index.hamming_distance(value, stored) < distance
+        }
+
+    def test_hash_bits_set_by_trigger(self):
+        """
+        Check that integer representation of the hash is filled by DB trigger.
+        """
+        for image in archives.models.ImageModel.objects.filter(pk__in=self.hashes):
+            with self.subTest(image=image):
+                self.assertEqual(
+                    image.image_hash_bits & (2 ** 64 - 1),
+                    self.hashes[image.pk],
+                )
+
+    def test_hamming_lt_lookup(self):
+        """
+        Check that lookup finds exactly the hashes within given distance.
+        """
+        for distance in (1, 4, 10, 11, 21, 65):
+            with self.subTest(distance=distance):
+                self.assertSetEqual(
+                    set(
+                        archives.models.ImageModel.objects.near_duplicates(
+                            image_hash_index.int_to_hash(self.base_hash), distance,
+                        ).values_list('pk', flat=True)
+                    ),
+                    self.brute_force(self.base_hash, distance),
+                )
+
+    def test_duplicate_pairs(self):
+        """
+        Check that all pairs of near-duplicate images are reported once.
+        """
+        expected = sorted(
+            (pk, other_pk, image_hash_index.hamming_distance(value, other_value))
+            for pk, value in self.hashes.items()
+            for other_pk, other_value in self.hashes.items()
+            if pk < other_pk and image_hash_index.hamming_distance(value, other_value) < 10
+        )
+
+        self.assertListEqual(
+            archives.models.ImageModel.objects.duplicate_pairs(10),
+            expected,
+        )
@@ -0,0 +1,148 @@
+import os
+from unittest import mock
+
+import PIL.Image
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+import archives.models
+import archives.serializers
+from archives.helpers import custom_functions, image_derivatives, image_hash_index
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+TEST_IMAGE_PATH = os.path.join(settings.IMAGES_FOR_TESTS, 'real_test_image.jpg')
+
+
+class ImageDerivativesPositiveTest(APISimpleTestCase):
+    """
+    Positive test on making resized copies of images.
+    """
+
+    def test_derivative_path(self):
+        """
+        Check that derivatives are stored in 'derivatives' sub-folder next to the original image.
+        """
+        self.assertEqual(
+            image_derivatives.derivative_path('Series/poster.jpg', 'thumbnail', 'WEBP'),
+            os.path.join('Series', 'derivatives', 'poster_thumbnail.webp'),
+        )
+
+    def test_make_derivative(self):
+        """
+        Check that derivative fits in given size, keeps aspect ratio and is encoded in given format.
+        """
+        with PIL.Image.open(TEST_IMAGE_PATH) as image:
+            image.load()
+        size = (image.width // 4, image.height)
+
+        derivative = PIL.Image.open(image_derivatives.make_derivative(image, size, 'WEBP'))
+
+        self.assertEqual(
+            derivative.format,
+            'WEBP',
+        )
+        self.assertEqual(
+            derivative.width,
+            image.width // 4,
+        )
+        self.assertAlmostEqual(
+            derivative.width / derivative.height,
+            image.width / image.height,
+            places=1,
+        )
+
+
+class ImageProcessingPositiveTest(APITestCase):
+    """
+    Positive test on post-processing of uploaded images.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+        with open(TEST_IMAGE_PATH, 'rb') as image_file:
+            cls.image, = archives.models.ImageModel.objects.bulk_create([
+                archives.models.ImageModel(
+                    image=SimpleUploadedFile('processed_image.jpg', image_file.read()),
+                    content_object=cls.series_1,
+                    entry_author=cls.series_1.entry_author,
+                ), ])
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(
+            archives.models.ImageModel,
+            'stored_image_hash',
+            image_hash_index.ImageHashIndex(),
+            create=True,
+        )
+        self.stored_image_hash = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_process(self):
+        """
+        Check that derivatives listed in IMAGE_DERIVATIVES are saved, image hash is made and status
+        is set to 'DONE'.
+        """
+        status = self.image.process()
+
+        self.image.refresh_from_db()
+        self.assertEqual(
+            status,
+            archives.models.ImageProcessingStatusChoices.DONE,
+        )
+        self.assertSetEqual(
+            set(self.image.derivatives),
+            set(settings.IMAGE_DERIVATIVES),
+        )
+        for name, path in self.image.derivatives.items():
+            with self.subTest(name=name):
+                self.assertTrue(
+                    self.image.image.storage.exists(path),
+                )
+        self.assertEqual(
+            self.image.image_hash,
+            custom_functions.create_image_hash(TEST_IMAGE_PATH),
+        )
+        self.assertIn(
+            self.image.pk,
+            self.stored_image_hash,
+        )
+
+    def test_process_duplicate(self):
+        """
+        Check that image which hash is close to stored one gets 'DUPLICATE' status.
+        """
+        self.stored_image_hash[0] = custom_functions.create_image_hash(TEST_IMAGE_PATH)
+
+        status = self.image.process()
+
+        self.image.refresh_from_db()
+        self.assertEqual(
+            status,
+            archives.models.ImageProcessingStatusChoices.DUPLICATE,
+        )
+        self.assertIsNone(
+            self.image.image_hash,
+        )
+
+    def test_serializer_derivatives(self):
+        """
+        Check that serializer shows processing status and derivatives URLs.
+        """
+        self.image.process()
+
+        data = archives.serializers.ImagesSerializer(instance=self.image).data
+
+        self.assertEqual(
+            data['processing_status'],
+            archives.models.ImageProcessingStatusChoices.DONE,
+        )
+        self.assertDictEqual(
+            data['derivatives'],
+            {name: self.image.image.storage.url(path) for name, path in self.image.derivatives.items()},
+        )
@@ -0,0 +1,145 @@
+import os
+from unittest import mock
+
+import imagehash
+import PIL.Image
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+import archives.models
+import archives.tasks
+from archives.helpers import image_rehash
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+TEST_IMAGE_PATH = os.path.join(settings.IMAGES_FOR_TESTS, 'real_test_image.jpg')
+
+
+class HashFilePositiveTest(APISimpleTestCase):
+    """
+    Positive test on hashing image files in worker processes.
+    """
+
+    def test_hash_file(self):
+        """
+        Check that hash of the image file made by given algorithm is returned as hex string.
+        """
+        with PIL.Image.open(TEST_IMAGE_PATH) as image:
+            expected_hash = str(imagehash.dhash(image))
+
+        self.assertEqual(
+            image_rehash.hash_file(TEST_IMAGE_PATH, 'dhash'),
+            expected_hash,
+        )
+
+    def test_hash_file_not_an_image(self):
+        """
+        Check that None is returned if file is not an image.
+        """
+        self.assertIsNone(
+            image_rehash.hash_file(__file__, 'average'),
+        )
+
+    def test_unique_results(self):
+        """
+        Check that only first image of each hash in the batch is left.
+        """
+        self.assertTupleEqual(
+            image_rehash.ImageRehasher.unique_results([(1, 'a'), (2, 'b'), (3, 'a')]),
+            ([1, 2], ['a', 'b']),
+        )
+
+
+class ImageRehashPositiveTest(APITestCase):
+    """
+    Positive test on bulk image re-hashing.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+        with open(TEST_IMAGE_PATH, 'rb') as image_file:
+            cls.image, = archives.models.ImageModel.objects.bulk_create([
+                archives.models.ImageModel(
+                    image=SimpleUploadedFile('rehashed_image.jpg', image_file.read()),
+                    content_object=cls.series_1,
+                    entry_author=cls.series_1.entry_author,
+                ), ])
+
+        with PIL.Image.open(TEST_IMAGE_PATH) as image:
+            cls.average_hash = imagehash.average_hash(image)
+            cls.phash = str(imagehash.phash(image))
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(
+            archives.models.ImageModel,
+            'stored_image_hash',
+            mock.MagicMock(),
+        )
+        self.stored_image_hash = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_primary_algorithm(self):
+        """
+        Check that missing primary hash is written to 'image_hash' field and near-duplicate index
+        is rebuilt.
+        """
+        progress = mock.Mock()
+
+        stats = image_rehash.rehash_images(workers=1, progress=progress)
+        self.image.refresh_from_db()
+
+        self.assertEqual(
+            self.image.image_hash,
+            self.average_hash,
+        )
+        self.assertEqual(
+            stats['updated'],
+            1,
+        )
+        progress.assert_called_once()
+        self.stored_image_hash.rebuild.assert_called_once_with()
+
+    def test_other_algorithm(self):
+        """
+        Check that hash of other algorithm is written to 'hashes' field and images which already
+        have it are skipped.
+        """
+        image_rehash.rehash_images('phash', workers=1)
+        self.image.refresh_from_db()
+
+        self.assertDictEqual(
+            self.image.hashes,
+            {'phash': self.phash},
+        )
+        self.assertEqual(
+            image_rehash.rehash_images('phash', workers=1)['processed'],
+            0,
+        )
+        self.stored_image_hash.rebuild.assert_not_called()
+
+    def test_rehash_images_task(self):
+        """
+        Check that task hashes images in thread pool as Celery prefork workers can't start
+        process pool.
+        """
+        with mock.patch.object(
+                image_rehash,
+                'ProcessPoolExecutor',
+                side_effect=AssertionError('daemonic processes are not allowed to have children'),
+        ):
+            stats = archives.tasks.rehash_images('phash')
+        self.image.refresh_from_db()
+
+        self.assertEqual(
+            stats['updated'],
+            1,
+        )
+        self.assertDictEqual(
+            self.image.hashes,
+            {'phash': self.phash},
+        )
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+from archives.helpers import custom_functions, image_uploads
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+def read_test_image() -> bytes:
+    with open(os.path.join(settings.IMAGES_FOR_TESTS, 'real_test_image.jpg'), 'rb') as image_file:
+        return image_file.read()
+
+
+class ImageStreamProcessorPositiveTest(APISimpleTestCase):
+    """
+    Positive test on single pass processing of uploaded image.
+    """
+
+    def test_process_in_chunks(self):
+        """
+        Check that digest, image type and image hash of image fed in chunks are the same as computed
+        on whole file.
+        """
+        content = read_test_image()
+        processor = image_uploads.ImageStreamProcessor(max_size=len(content))
+        file = image_uploads.StreamedImageUpload('test.jpg', 'image/jpeg', 0, None)
+
+        for start in range(0, len(content), 1000):
+            processor.feed(content[start:start + 1000])
+            file.write(content[start:start + 1000])
+        processor.finish(file)
+
+        self.assertEqual(
+            file.digest,
+            hashlib.sha256(content).hexdigest(),
+        )
+        self.assertEqual(
+            file.image_type,
+            'jpeg',
+        )
+        self.assertEqual(
+            file.image_hash,
+            custom_functions.create_image_hash(open(file.temporary_file_path(), 'rb')),
+        )
+        self.assertEqual(
+            file.size,
+            len(content),
+        )
+
+
+class ResumableImageUploadPositiveTest(APITestCase):
+    """
+    Positive test on resumable (chunked) image upload.
+    /tvseries/{1}/upload-image/{2}/ POST with 'Content-Range' header.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        parts_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, parts_dir)
+        settings_override = override_settings(IMAGE_UPLOAD_PARTS_DIR=parts_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.content = read_test_image()
+        self.filename = 'resumable_image.jpg'
+        self.client.force_authenticate(user=self.series_1.entry_author)
+
+    def upload_chunk(self, start: int, end: int):
+        return self.client.generic(
+            'POST',
+            reverse('upload', args=[self.series_1.pk, self.filename]),
+            data=self.content[start:end + 1],
+            content_type='image/jpeg',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}',
+        )
+
+    def test_resumable_upload(self):
+        """
+        Check that image uploaded in chunks is saved once last chunk is received and that earlier
+        chunks are acknowledged with received range.
+        """
+        total = len(self.content)
+        bounds = [0, total // 3, total // 3 * 2, total]
+
+        for start, end in zip(bounds[:-2], bounds[1:-1]):
+            response = self.upload_chunk(start, end - 1)
+            with self.subTest(start=start):
+                self.assertEqual(
+                    response.status_code,
+                    status.HTTP_202_ACCEPTED,
+                )
+                self.assertEqual(
+                    response['Range'],
+                    f'bytes=0-{end - 1}',
+                )
+
+        response = self.upload_chunk(bounds[-2], total - 1)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+        )
+        image = self.series_1.images.get()
+        with image.image.open('rb') as image_file:
+            self.assertEqual(
+                image_file.read(),
+                self.content,
+            )
+        self.assertEqual(
+            image.image_hash,
+            custom_functions.create_image_hash(image.image.open('rb')),
+        )
+        self.assertListEqual(
+            os.listdir(settings.IMAGE_UPLOAD_PARTS_DIR),
+            [],
+        )
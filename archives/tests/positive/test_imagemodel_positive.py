@@ -2,6 +2,7 @@ import os
 
 import imagehash
 from django.conf import settings
+from django.db import transaction
 from rest_framework.test import APITestCase
 
 from archives import models as archive_models
@@ -33,6 +34,44 @@ class ImageModelPositiveTest(APITestCase):
             entry_author=cls.user_1
         )
 
+    @staticmethod
+    def run_commit_hooks() -> None:
+        """
+        Runs 'on_commit' callbacks as test case transaction is never committed.
+        """
+        connection = transaction.get_connection()
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
+
+    def test_save_new_image(self):
+        """
+        Check that new image is saved with full clean and its hash is stored in near-duplicate
+        index only once transaction is committed.
+        """
+        image = archive_models.ImageModel(
+            image=initial_data.generate_test_image(),
+            content_object=self.series_2,
+            entry_author=self.user_1,
+        )
+        image.save()
+        self.addCleanup(archive_models.ImageModel.delete_stored_image_hash, image.pk)
+
+        self.assertIsNotNone(
+            image.pk,
+        )
+        self.assertNotIn(
+            image.pk,
+            archive_models.ImageModel.stored_image_hash,
+        )
+
+        self.run_commit_hooks()
+
+        self.assertEqual(
+            archive_models.ImageModel.stored_image_hash[image.pk],
+            image.image_hash,
+        )
+
     def test_file_upload_function_tvseriesmodel(self):
         """
         Check if when 'ImageModel' instance attached via generic FK to different primary models,
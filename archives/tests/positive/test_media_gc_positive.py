@@ -0,0 +1,164 @@
+import os
+import shutil
+import tempfile
+
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+import archives.models
+from administration.models import MediaGCPhaseChoices, MediaGarbageCollectionRun
+from archives.helpers import media_gc
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+def create_files(root: str, *paths: str, age: int = 0) -> None:
+    for path in paths:
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as file:
+            file.write(b'garbage')
+        if age:
+            modified = os.path.getmtime(full_path) - age
+            os.utime(full_path, (modified, modified))
+
+
+class IterateFilesPositiveTest(APISimpleTestCase):
+    """
+    Positive test on walking media root in checkpoint order.
+    """
+
+    def setUp(self) -> None:
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        create_files(self.root, 'b/y.jpg', 'a.jpg', 'b/x.jpg', 'c/d/z.jpg', 'b.jpg')
+        os.makedirs(os.path.join(self.root, 'e'))
+
+    def test_order(self):
+        """
+        Check that files are yielded in depth-first order sorted by names and empty folders are found.
+        """
+        empty_folders = set()
+
+        self.assertListEqual(
+            [parts for parts, entry in media_gc.iterate_files(self.root, empty_folders=empty_folders)],
+            [('a.jpg', ), ('b', 'x.jpg'), ('b', 'y.jpg'), ('b.jpg', ), ('c', 'd', 'z.jpg')],
+        )
+        self.assertSetEqual(
+            empty_folders,
+            {os.path.join(self.root, 'e')},
+        )
+
+    def test_after(self):
+        """
+        Check that files up to checkpoint are skipped.
+        """
+        self.assertListEqual(
+            [parts for parts, entry in media_gc.iterate_files(self.root, after=('b', 'x.jpg'))],
+            [('b', 'y.jpg'), ('b.jpg', ), ('c', 'd', 'z.jpg')],
+        )
+
+
+class MediaGarbageCollectorPositiveTest(APITestCase):
+    """
+    Positive test on media root garbage collector.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.series_1, cls.series_2 = cls.series
+
+    def setUp(self) -> None:
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        self.alive_image, self.dead_image = archives.models.ImageModel.objects.bulk_create([
+            archives.models.ImageModel(
+                image=os.path.join('series', name),
+                content_object=self.series_1,
+                entry_author=self.series_1.entry_author,
+                derivatives=derivatives,
+            ) for name, derivatives in (
+                ('alive.jpg', {'thumbnail': 'series/derivatives/alive_thumbnail.jpeg'}),
+                ('dead.jpg', {}),
+            )])
+        self.alive = ['series/alive.jpg', 'series/derivatives/alive_thumbnail.jpeg']
+        self.garbage = ['series/garbage.jpg', 'old/series/garbage.jpg', 'series/derivatives/dead_thumbnail.jpeg']
+        self.recent = ['series/recent.jpg']
+        create_files(self.root, *self.alive, *self.garbage, age=2 * 60 * 60)
+        create_files(self.root, *self.recent)
+
+    def collect(self, dry_run: bool = False) -> MediaGarbageCollectionRun:
+        return media_gc.collect_media_garbage(dry_run=dry_run, root=self.root, batch_size=2, workers=2)
+
+    def existing(self, paths):
+        return [path for path in paths if os.path.exists(os.path.join(self.root, path))]
+
+    def test_collect(self):
+        """
+        Check that unreferenced files, emptied folders and images without files are deleted, while
+        referenced and recently modified files are kept.
+        """
+        run = self.collect()
+
+        self.assertListEqual(
+            self.existing(self.alive + self.recent),
+            self.alive + self.recent,
+        )
+        self.assertListEqual(
+            self.existing(self.garbage),
+            [],
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'old')),
+        )
+        self.assertFalse(
+            archives.models.ImageModel.objects.filter(pk=self.dead_image.pk).exists(),
+        )
+        self.assertEqual(
+            (run.phase, run.images_deleted, run.files_scanned, run.files_deleted, run.folders_deleted),
+            (MediaGCPhaseChoices.DONE, 1, 6, 3, 2),
+        )
+
+    def test_dry_run(self):
+        """
+        Check that dry run only reports garbage.
+        """
+        run = self.collect(dry_run=True)
+
+        self.assertListEqual(
+            self.existing(self.garbage),
+            self.garbage,
+        )
+        self.assertTrue(
+            archives.models.ImageModel.objects.filter(pk=self.dead_image.pk).exists(),
+        )
+        self.assertEqual(
+            (run.images_deleted, run.files_deleted, run.bytes_deleted),
+            (1, 3, 3 * len(b'garbage')),
+        )
+
+    def test_resume(self):
+        """
+        Check that interrupted run is resumed after its checkpoint.
+        """
+        interrupted = MediaGarbageCollectionRun.objects.create(
+            phase=MediaGCPhaseChoices.FILES,
+            last_image_pk=self.dead_image.pk,
+            last_path='series/alive.jpg',
+        )
+
+        run = self.collect()
+
+        self.assertEqual(
+            run.pk,
+            interrupted.pk,
+        )
+        self.assertListEqual(
+            self.existing(self.garbage),
+            ['old/series/garbage.jpg'],
+        )
+        self.assertTrue(
+            archives.models.ImageModel.objects.filter(pk=self.dead_image.pk).exists(),
+        )
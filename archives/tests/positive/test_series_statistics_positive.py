@@ -0,0 +1,109 @@
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class SeriesStatisticsPositiveTest(APITestCase):
+    """
+    Positive test on denormalized series statistics maintained by trigger on seasons table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+
+    def setUp(self) -> None:
+        self.series = initial_data.create_tvseries(self.users)
+        self.series_1, self.series_2 = self.series
+        self.seasons, self.seasons_dict = initial_data.create_seasons(self.series, return_sorted=True)
+
+    def check_statistics(self, series: archives.models.TvSeriesModel) -> None:
+        """
+        Compares stored statistics of series with statistics calculated from its seasons.
+        """
+        seasons = series.seasons.all()
+        statistics = archives.models.SeriesStatisticsModel.objects.get(series=series)
+
+        self.assertEqual(statistics.seasons_cnt, len(seasons))
+        self.assertEqual(statistics.episodes_cnt, sum(season.number_of_episodes for season in seasons))
+        self.assertEqual(statistics.watched_episodes_cnt, sum(season.last_watched_episode for season in seasons))
+        self.assertEqual(
+            statistics.last_episode_date,
+            max(date for season in seasons for date in season.episodes.values()),
+        )
+
+    def test_statistics_on_insert(self):
+        """
+        Check that statistics are created for each series on seasons insert (even on bulk create).
+        """
+        for series in self.series:
+            with self.subTest(series=series):
+                self.check_statistics(series)
+
+    def test_statistics_on_update(self):
+        """
+        Check that statistics are recalculated on season update.
+        """
+        season = self.seasons_dict[self.series_1.pk][0]
+        season.last_watched_episode = 1
+        season.save(fc=False)
+
+        self.check_statistics(self.series_1)
+
+    def test_statistics_on_delete(self):
+        """
+        Check that statistics are recalculated on season delete and removed when series becomes empty.
+        """
+        self.seasons_dict[self.series_1.pk][0].delete()
+        self.check_statistics(self.series_1)
+
+        self.series_1.seasons.all().delete()
+
+        self.assertFalse(
+            archives.models.SeriesStatisticsModel.objects.filter(series=self.series_1).exists()
+        )
+        self.assertIn(
+            self.series_1,
+            archives.models.EmptyTVSeriesModel.objects.all(),
+        )
+
+    def test_series_delete(self):
+        """
+        Check that series with seasons can be deleted along with its statistics.
+        """
+        self.series_1.delete()
+
+        self.assertFalse(
+            archives.models.SeriesStatisticsModel.objects.filter(series_id=self.series_1.pk).exists()
+        )
+
+    def test_verify_and_rebuild(self):
+        """
+        Check that 'verify' finds out of sync statistics and 'rebuild' fixes them.
+        """
+        manager = archives.models.SeriesStatisticsModel.objects
+        self.assertListEqual(manager.verify(), [])
+
+        manager.filter(series=self.series_2).update(seasons_cnt=100)
+        self.assertListEqual(manager.verify(), [self.series_2.pk])
+
+        self.assertEqual(manager.rebuild(), len(self.series))
+        self.assertListEqual(manager.verify(), [])
+        self.check_statistics(self.series_2)
+
+    def test_management_command(self):
+        """
+        Check that management command verifies and rebuilds statistics.
+        """
+        out = StringIO()
+        archives.models.SeriesStatisticsModel.objects.all().delete()
+
+        call_command('series_statistics', rebuild=True, stdout=out)
+        call_command('series_statistics', stdout=out)
+
+        self.assertIn('in sync', out.getvalue())
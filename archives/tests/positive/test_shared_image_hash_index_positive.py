@@ -0,0 +1,125 @@
+import random
+import time
+
+import django_redis
+from django.conf import settings
+from rest_framework.test import APISimpleTestCase
+
+from archives.helpers import image_hash_index, shared_image_hash_index
+
+
+class SharedImageHashIndexPositiveTest(APISimpleTestCase):
+    """
+    Positive tests on image hash index shared via Redis.
+    """
+
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.hashes = {pk: rng.getrandbits(64) for pk in range(1, 501)}
+        #  Near duplicates of first hash with 1 to 12 flipped bits.
+        for bits in range(1, 13):
+            self.hashes[10000 + bits] = self.hashes[1] ^ ((1 << bits) - 1)
+
+        self.client = django_redis.get_redis_connection(settings.IMAGE_HASH_INDEX_CACHE)
+        self.indexes = [self.create_index() for _ in range(2)]
+        self.addCleanup(self.clean_up)
+
+    def create_index(self) -> shared_image_hash_index.SharedImageHashIndex:
+        return shared_image_hash_index.SharedImageHashIndex(
+            client=self.client,
+            prefix='test_image_hash_index',
+            source=lambda: 'test',
+            loader=lambda: ((pk, image_hash_index.int_to_hash(value)) for pk, value in self.hashes.items()),
+        )
+
+    def clean_up(self) -> None:
+        for index in self.indexes:
+            if index.subscriber is not None:
+                index.subscriber.stop()
+        self.client.delete(*self.client.keys('test_image_hash_index:*'))
+
+    def test_build_and_search(self):
+        """
+        Check that index is built once and search returns same hashes as linear scan.
+        """
+        first_index, second_index = self.indexes
+        first_index.rebuild()
+        hashes = self.hashes.copy()
+        #  Second index doesn't rebuild index as it is built already from the same source.
+        self.hashes.clear()
+
+        self.assertEqual(
+            len(second_index),
+            len(hashes),
+        )
+        query = image_hash_index.int_to_hash(hashes[1])
+        for distance in (1, 5, 10, 13):
+            with self.subTest(distance=distance):
+                expected = {
+                    pk: image_hash_index.hamming_distance(hashes[1], value) for pk, value in hashes.items()
+                }
+                self.assertDictEqual(
+                    second_index.near_duplicates(query, distance),
+                    {pk: value for pk, value in expected.items() if value < distance},
+                )
+
+    def test_incremental_update(self):
+        """
+        Check that changes made via one index are seen by another one, including its local cache.
+        """
+        first_index, second_index = self.indexes
+        second_index.warm_up()
+        query = image_hash_index.int_to_hash(self.hashes[1])
+
+        self.assertIn(
+            10001,
+            second_index.near_duplicates(query, distance=10),
+        )
+        self.assertGreater(
+            second_index.memory_usage()['local_cache_buckets'],
+            0,
+        )
+
+        del first_index[10001]
+        first_index[1] = image_hash_index.int_to_hash(~self.hashes[1] & (2 ** 64 - 1))
+
+        #  Bucket of chunk 1 holds both changed hashes.
+        changed_bucket = (1, shared_image_hash_index.HASH.pack(self.hashes[1])[4:6])
+        for _ in range(50):
+            if changed_bucket not in second_index.cache:
+                break
+            time.sleep(0.1)
+
+        duplicates = second_index.near_duplicates(query, distance=10)
+        self.assertNotIn(
+            10001,
+            duplicates,
+        )
+        self.assertNotIn(
+            1,
+            duplicates,
+        )
+        self.assertIn(
+            10002,
+            duplicates,
+        )
+        self.assertGreater(
+            second_index.memory_usage()['redis_bytes'],
+            0,
+        )
+
+    def test_unsaved_image_pk(self):
+        """
+        Check that pk None of unsaved image is not found in index and index is not touched.
+        """
+        index, _ = self.indexes
+
+        self.assertNotIn(
+            None,
+            index.keys(),
+        )
+        with self.assertRaises(KeyError):
+            index[None]
+        self.assertFalse(
+            index.is_built,
+        )
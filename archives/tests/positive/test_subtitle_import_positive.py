@@ -0,0 +1,128 @@
+import io
+import os
+import zipfile
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+import archives.models
+from archives.helpers import subtitle_import
+from archives.tests.data import initial_data
+from series import error_codes
+from users.helpers import create_test_users
+
+TEST_SRT_PATH = os.path.join(settings.BASE_DIR, 'series', 'files_for_tests', 'test.srt')
+
+
+class SubtitleFileNamesPositiveTest(APISimpleTestCase):
+    """
+    Positive test on deriving episode number and language from subtitles file names.
+    """
+
+    def test_episode_number_from_name(self):
+        """
+        Check that episode number is found in common file name formats.
+        """
+        names = {
+            'Show.S01E05.en.srt': 5,
+            'season 2/Show.2x07.srt': 7,
+            'Episode 9.srt': 9,
+            '12.fr.srt': 12,
+            'no number.srt': None,
+        }
+        for name, episode_number in names.items():
+            with self.subTest(name=name):
+                self.assertEqual(
+                    subtitle_import.episode_number_from_name(name),
+                    episode_number,
+                )
+
+    def test_language_from_name(self):
+        """
+        Check that language code is taken from file name suffix.
+        """
+        self.assertEqual(
+            subtitle_import.language_from_name('Show.S01E05.en.srt'),
+            'en',
+        )
+        self.assertIsNone(
+            subtitle_import.language_from_name('Show.S01E05.srt'),
+        )
+
+
+class SubtitlesImportPositiveTest(APITestCase):
+    """
+    Positive test on bulk import of season subtitles archive.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.seasons, cls.seasons_dict = initial_data.create_seasons(
+            cls.series,
+            num_seasons=1,
+            return_sorted=True,
+        )
+        cls.season_1_1, *rest = cls.seasons
+
+    def setUp(self) -> None:
+        with open(TEST_SRT_PATH, 'rb') as file:
+            content = file.read()
+
+        self.archive = io.BytesIO()
+        with zipfile.ZipFile(self.archive, 'w') as archive:
+            archive.writestr('Show.S01E01.en.srt', content)
+            archive.writestr('Show.S01E02.en.srt', content)
+            archive.writestr(f'Show.S01E{self.season_1_1.number_of_episodes + 1:02}.en.srt', content)
+            archive.writestr('Show.en.srt', content)
+            archive.writestr('readme.txt', b'not subtitles')
+
+    def test_import(self):
+        """
+        Check that subtitles with their cues and lexemes are loaded and files which can't be imported
+        are reported.
+        """
+        results = subtitle_import.import_subtitles(self.season_1_1, self.archive, workers=1)
+        errors = {result.name: result.error['code'] for result in results if result.error is not None}
+
+        self.assertDictEqual(
+            errors,
+            {
+                f'Show.S01E{self.season_1_1.number_of_episodes + 1:02}.en.srt':
+                    error_codes.SUB_EPISODE_NUM_GT_SEASON_EPISODE_NUM.code,
+                'Show.en.srt': error_codes.EPISODE_NUMBER_UNDETECTED.code,
+            },
+        )
+        imported = archives.models.Subtitles.objects.filter(season=self.season_1_1)
+        self.assertSetEqual(
+            set(imported.values_list('episode_number', 'language')),
+            {(1, 'en'), (2, 'en')},
+        )
+        self.assertFalse(
+            imported.filter(full_text__isnull=True).exists(),
+        )
+        self.assertEqual(
+            archives.models.SubtitleCue.objects.filter(subtitle__in=imported, full_text__isnull=False).count(),
+            2 * 1748,
+        )
+        self.assertTrue(
+            imported.filter(full_text=SearchQuery('Harry', config='english_hunspell')).exists(),
+        )
+
+    def test_import_existing(self):
+        """
+        Check that subtitles which already exist are reported and not imported again.
+        """
+        subtitle_import.import_subtitles(self.season_1_1, self.archive, workers=1)
+        results = subtitle_import.import_subtitles(self.season_1_1, self.archive, workers=1)
+
+        self.assertIn(
+            error_codes.SUBTITLES_ALREADY_EXIST.code,
+            {result.error['code'] for result in results},
+        )
+        self.assertEqual(
+            archives.models.Subtitles.objects.filter(season=self.season_1_1).count(),
+            2,
+        )
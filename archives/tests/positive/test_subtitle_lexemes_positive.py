@@ -0,0 +1,151 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class SubtitleLexemesPositiveTest(APITestCase):
+    """
+    Positive test on vocabulary of subtitles lexemes maintained by trigger on subtitles table and
+    on FTS suggestions endpoint.
+    /archives/tvseries/full-text-search/suggestions/ GET
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.series = initial_data.create_tvseries(cls.users)
+        cls.seasons, cls.seasons_dict = initial_data.create_seasons(
+            cls.series,
+            num_seasons=1,
+            return_sorted=True,
+        )
+        cls.season_1_1, *rest = cls.seasons
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.subtitle_1 = archives.models.Subtitles.objects.create(
+            episode_number=1,
+            language='en',
+            text='The wizard caught the ball. The wizard won.',
+            season=self.season_1_1,
+        )
+        self.subtitle_2 = archives.models.Subtitles.objects.create(
+            episode_number=2,
+            language='en',
+            text='The witch read the book.',
+            season=self.season_1_1,
+        )
+
+    def get_lexeme(self, word: str) -> archives.models.SubtitleLexeme:
+        return archives.models.SubtitleLexeme.objects.get(search_configuration='english_hunspell', word=word)
+
+    def test_vocabulary_on_insert(self):
+        """
+        Check that lexemes of inserted subtitles are added to vocabulary with document frequencies and
+        numbers of occurrences as 'ts_stat' returns them.
+        """
+        wizard = self.get_lexeme('wizard')
+
+        self.assertEqual(wizard.ndoc, 1)
+        self.assertEqual(wizard.nentry, 2)
+        self.assertListEqual(
+            archives.models.SubtitleLexeme.objects.verify(),
+            [],
+        )
+
+    def test_vocabulary_on_update_and_delete(self):
+        """
+        Check that vocabulary is updated on subtitles text change and lexemes which are not present in
+        any subtitles anymore are removed on delete.
+        """
+        self.subtitle_2.text = 'The wizard read the book.'
+        self.subtitle_2.full_text = None
+        self.subtitle_2.save()
+
+        self.assertEqual(self.get_lexeme('wizard').ndoc, 2)
+        self.assertFalse(
+            archives.models.SubtitleLexeme.objects.filter(word='witch').exists()
+        )
+
+        self.subtitle_1.delete()
+
+        self.assertEqual(self.get_lexeme('wizard').ndoc, 1)
+        self.assertFalse(
+            archives.models.SubtitleLexeme.objects.filter(word='ball').exists()
+        )
+        self.assertListEqual(
+            archives.models.SubtitleLexeme.objects.verify(),
+            [],
+        )
+
+    def test_rebuild_command(self):
+        """
+        Check that out of sync vocabulary is detected and rebuilt by management command.
+        """
+        archives.models.SubtitleLexeme.objects.filter(word='wizard').update(ndoc=10)
+
+        self.assertListEqual(
+            archives.models.SubtitleLexeme.objects.verify(),
+            ['english_hunspell'],
+        )
+
+        call_command('subtitle_lexemes', '--rebuild', stdout=StringIO())
+
+        self.assertEqual(self.get_lexeme('wizard').ndoc, 1)
+        self.assertListEqual(
+            archives.models.SubtitleLexeme.objects.verify(),
+            [],
+        )
+
+    def test_suggestions(self):
+        """
+        Check that completions and typo corrections of the last word of search text are returned with
+        document frequencies.
+        """
+        self.client.force_authenticate(user=self.users[0])
+
+        response = self.client.get(
+            reverse('full-text-search-suggestions'),
+            data={'search': 'Wizard wit', 'language': 'en', },
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            response.data['term'],
+            'wit',
+        )
+        self.assertEqual(
+            response.data['completions'][0]['word'],
+            'witch',
+        )
+        self.assertEqual(
+            response.data['completions'][0]['ndoc'],
+            1,
+        )
+
+        response = self.client.get(
+            reverse('full-text-search-suggestions'),
+            data={'search': 'boook', },
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            response.data['corrections'][0]['word'],
+            'book',
+        )
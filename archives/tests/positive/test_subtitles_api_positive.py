@@ -7,6 +7,7 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
 import archives.models
+import archives.tasks
 from archives.tests.data import initial_data
 from series.helpers import test_helpers
 from users.helpers import create_test_users
@@ -16,6 +17,7 @@ class SubtitlesAPIPositiveTest(test_helpers.TestHelpers, APITestCase):
     """
     Positive test on Subtitles  create/delete api endpoint.
     /archives/tvseries/<int:pk>/seasons/<int:pk>/add_subtitle/ POST
+    /archives/tvseries/<int:pk>/seasons/<int:pk>/subtitle_jobs/<int:pk>/ GET
     /archives/tvseries/<int:pk>/seasons/<int:pk>/delete_subtitle/<int:pk>/ DELETE
     """
     maxDiff = None
@@ -66,8 +68,19 @@ class SubtitlesAPIPositiveTest(test_helpers.TestHelpers, APITestCase):
 
         self.assertEqual(
             response.status_code,
-            status.HTTP_201_CREATED,
+            status.HTTP_202_ACCEPTED,
         )
+        self.assertEqual(
+            response.data['status'],
+            archives.models.SubtitleIngestionStatusChoices.PENDING,
+        )
+        self.assertEqual(
+            response['Location'],
+            response.data['url'],
+        )
+
+        archives.tasks.ingest_subtitles(response.data['id'])
+
         self.assertTrue(
             archives.models.Subtitles.objects.filter(
                 season=self.season_1_1,
@@ -75,10 +88,32 @@ class SubtitlesAPIPositiveTest(test_helpers.TestHelpers, APITestCase):
                 language=self.data['language'],
             ).exists()
         )
+        subtitle = archives.models.Subtitles.objects.first()
         self.assertGreater(
-            len(archives.models.Subtitles.objects.first().text),
+            len(subtitle.text),
             0,
         )
+        self.assertIsNotNone(
+            subtitle.full_text,
+        )
+        self.assertTrue(
+            subtitle.cues.exists(),
+        )
+
+        job_response = self.client.get(response.data['url'], format='json')
+
+        self.assertEqual(
+            job_response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            job_response.data['status'],
+            archives.models.SubtitleIngestionStatusChoices.DONE,
+        )
+        self.assertEqual(
+            job_response.data['subtitle_id'],
+            subtitle.pk,
+        )
 
     def test_upload_subtitle_without_language(self):
         """
@@ -99,8 +134,11 @@ class SubtitlesAPIPositiveTest(test_helpers.TestHelpers, APITestCase):
         )
         self.assertEqual(
             response.status_code,
-            status.HTTP_201_CREATED,
+            status.HTTP_202_ACCEPTED,
         )
+
+        archives.tasks.ingest_subtitles(response.data['id'])
+
         self.assertEqual(
             archives.models.Subtitles.objects.first().language,
             'en',
@@ -2,6 +2,7 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
 import archives.models
+from archives.helpers import subtitles
 from archives.tests.data import initial_data
 from series.helpers import test_helpers
 from users.helpers import create_test_users
@@ -43,11 +44,57 @@ class SubtitlesModelPositiveTest(test_helpers.TestHelpers, APITestCase):
         archives.models.Subtitles.objects.create(
             **self.subtitles_data
         )
+        text = self.subtitles_data.pop('text')
+
         self.assertTrue(
             archives.models.Subtitles.objects.filter(**self.subtitles_data).exists()
         )
+        subtitle = archives.models.Subtitles.objects.filter(**self.subtitles_data).first()
         self.assertIsNotNone(
-            archives.models.Subtitles.objects.filter(**self.subtitles_data).first().full_text
+            subtitle.full_text
+        )
+        self.assertEqual(
+            subtitle.text,
+            text,
+        )
+
+    def test_text_storage(self):
+        """
+        Check that raw text is stored compressed in side table, loaded only on access and replaced on
+        change.
+        """
+        subtitle = archives.models.Subtitles.objects.create(
+            **{**self.subtitles_data, 'text': 'test ' * 1000},
+        )
+        raw_text = archives.models.SubtitleText.objects.get(subtitle=subtitle)
+
+        self.assertEqual(
+            raw_text.size,
+            len('test ' * 1000),
+        )
+        self.assertLess(
+            len(raw_text.data),
+            raw_text.size,
+        )
+
+        subtitle = archives.models.Subtitles.objects.get(pk=subtitle.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                subtitle.text,
+                'test ' * 1000,
+            )
+
+        subtitle.text = 'changed'
+        subtitle.save()
+        subtitle = archives.models.Subtitles.objects.get(pk=subtitle.pk)
+
+        self.assertEqual(
+            subtitle.text,
+            'changed',
+        )
+        self.assertEqual(
+            archives.models.SubtitleText.objects.storage_report()['saved_bytes'],
+            len('changed') - len(subtitles.compress('changed')),
         )
 
     def test_get_absolute_url(self):
@@ -0,0 +1,44 @@
+import os
+
+from django.conf import settings
+from rest_framework.test import APISimpleTestCase
+
+from archives.helpers import subtitles
+
+
+class ParseSrtPositiveTest(APISimpleTestCase):
+    """
+    Positive test on parsing SRT subtitles into cues.
+    """
+
+    def test_parse_srt(self):
+        """
+        Check that cues are parsed with timings in milliseconds, tags are stripped, lines are joined and
+        blocks without timing are skipped.
+        """
+        text = '1\r\n00:00:01,5 --> 00:00:02,000\r\n<i>Hello</i>\r\nworld\r\n\r\n\r\nbad block\r\n\r\n' \
+               '00:01:00.100 --> 01:00:01.000\r\nno number\r\n'
+
+        self.assertListEqual(
+            subtitles.parse_srt(text),
+            [
+                subtitles.Cue(1, 1500, 2000, 'Hello world'),
+                subtitles.Cue(2, 60100, 3601000, 'no number'),
+            ],
+        )
+
+    def test_parse_srt_file(self):
+        """
+        Check that all cues of real subtitles file are parsed.
+        """
+        with open(os.path.join(settings.BASE_DIR, 'series', 'files_for_tests', 'test.srt')) as file:
+            cues = subtitles.parse_srt(file.read())
+
+        self.assertEqual(
+            len(cues),
+            1748,
+        )
+        self.assertEqual(
+            cues[52],
+            subtitles.Cue(53, 303704, 307322, 'Once again, Harry, your humility is an example to us all.'),
+        )
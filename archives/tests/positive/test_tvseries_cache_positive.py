@@ -0,0 +1,161 @@
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+import archives.models
+from archives.tests.data import initial_data
+from users.helpers import create_test_users
+
+
+class TvSeriesCachePositiveTest(APITestCase):
+    """
+    Positive test on versioned response cache of series list and detail views.
+    archives/tvseries/ GET, archives/tvseries/<series_pk>/ GET.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.series = initial_data.create_tvseries(self.users)
+        self.series_1, self.series_2 = self.series
+        self.seasons = initial_data.create_seasons(self.series)
+
+        self.client.force_authenticate(user=self.user_1)
+
+    def get_list(self) -> dict:
+        """
+        Returns list response content as {pk: series}. Cached responses do not have 'data' attribute.
+        """
+        content = self.client.get(reverse('tvseries'), data=None, format='json').json()
+        results = content['results'] if isinstance(content, dict) else content
+        return {series['pk']: series for series in results}
+
+    def test_list_served_from_cache(self):
+        """
+        Check that list response is served from cache while nothing has changed through signals.
+        """
+        self.get_list()
+        archives.models.TvSeriesModel.objects.filter(pk=self.series_1.pk).update(name='not seen yet')
+
+        self.assertEqual(
+            self.get_list()[self.series_1.pk]['name'],
+            self.series_1.name,
+        )
+
+    def test_list_invalidated(self):
+        """
+        Check that saving or deleting series, season, image or grouping invalidates list cache.
+        """
+        changes = (
+            lambda: self.seasons[0].delete(),
+            lambda: initial_data.create_images_instances((self.series_1, ))[0].save(fc=False),
+            lambda: self.series_1.group.create(
+                to_series=self.series_2,
+                reason_for_interrelationship='test',
+            ),
+            lambda: self.series_2.delete(),
+        )
+        for change in changes:
+            with self.subTest(change=change):
+                self.get_list()
+                change()
+                response_data = self.get_list()
+
+                for series in archives.models.TvSeriesModel.objects.all():
+                    self.assertEqual(
+                        len(response_data[series.pk]['images']),
+                        series.images.count(),
+                    )
+                    self.assertEqual(
+                        len(response_data[series.pk]['interrelationship']),
+                        series.group.count(),
+                    )
+                self.assertSetEqual(
+                    set(response_data),
+                    set(archives.models.TvSeriesModel.objects.values_list('pk', flat=True)),
+                )
+
+    def test_list_etag(self):
+        """
+        Check that list returns 304 if etag from previous response is provided and nothing has changed.
+        """
+        response = self.client.get(reverse('tvseries'), data=None, format='json')
+
+        response = self.client.get(
+            reverse('tvseries'),
+            data=None,
+            format='json',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+    def test_detail_invalidated(self):
+        """
+        Check that season save invalidates detail cache of its series.
+        """
+        season = self.series_1.seasons.first()
+        self.client.get(self.series_1.get_absolute_url, data=None, format='json')
+
+        season.number_of_episodes -= 1
+        season.save(fc=False)
+
+        response = self.client.get(self.series_1.get_absolute_url, data=None, format='json')
+
+        self.assertEqual(
+            response.data['number_of_episodes'],
+            sum(season.number_of_episodes for season in self.series_1.seasons.all()),
+        )
+
+    def test_detail_depends_on_permission_class(self):
+        """
+        Check that response cached for series owner is not served to other users.
+        """
+        self.client.get(self.series_1.get_absolute_url, data=None, format='json')
+
+        self.client.force_authenticate(user=self.user_2)
+        response = self.client.get(self.series_1.get_absolute_url, data=None, format='json')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertNotIn(
+            'allowed_redactors',
+            response.data,
+        )
+
+    def test_detail_of_interrelated_series_invalidated(self):
+        """
+        Check that linking series invalidates detail cache of series on the other side of
+        interrelationship.
+        """
+        self.client.force_authenticate(user=self.series_1.entry_author)
+        self.client.get(self.series_2.get_absolute_url, data=None, format='json')
+
+        response = self.client.patch(
+            self.series_1.get_absolute_url,
+            data={'interrelationship': [
+                {'name': self.series_2.name, 'reason_for_interrelationship': 'test', },
+            ]},
+            format='json',
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+        )
+
+        response = self.client.get(self.series_2.get_absolute_url, data=None, format='json')
+
+        self.assertListEqual(
+            [relation['name'] for relation in response.json()['interrelationship']],
+            [self.series_1.name],
+        )
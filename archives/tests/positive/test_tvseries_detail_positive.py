@@ -1,5 +1,6 @@
 import operator
 
+from django.core.cache import cache
 from guardian.shortcuts import assign_perm, get_users_with_perms
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -17,6 +18,9 @@ class TvSeriesDetailUpdateDeletePositiveTest(APITestCase):
     """
 
     def setUp(self) -> None:
+        #  Series detail responses are cached.
+        cache.clear()
+
         self.users = create_test_users.create_users()
         self.user_1, self.user_2, self.user_3 = self.users
 
@@ -1,5 +1,6 @@
 import datetime
 
+from django.core.cache import cache
 from django.http import QueryDict
 from psycopg2.extras import DateRange
 from rest_framework import status
@@ -25,6 +26,8 @@ class FiltersPositiveTest(APITestCase):
         cls.user_1, *rest = cls.users
 
     def setUp(self) -> None:
+        #  Series list responses are cached.
+        cache.clear()
         self.series = initial_data.create_tvseries(users=self.users)
         self.series_1, self.series_2 = self.series
 
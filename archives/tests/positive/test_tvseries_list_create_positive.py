@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from drf_extra_fields.fields import DateRangeField
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -21,6 +22,8 @@ class TvSeriesListCreatePositiveTest(APITestCase):
         cls.user_1, cls.user_2, cls.user_3 = cls.users
 
     def setUp(self) -> None:
+        #  Series list responses are cached.
+        cache.clear()
         self.series = initial_data.create_tvseries(self.users)
         self.series_1, self.series_2 = self.series
         initial_data.create_images_instances((self.series_1, ))
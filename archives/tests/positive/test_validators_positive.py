@@ -2,6 +2,7 @@ import datetime
 import json
 import os
 import unittest
+from unittest import mock
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -9,7 +10,7 @@ from django.utils import timezone
 from psycopg2.extras import DateRange
 from rest_framework.test import APISimpleTestCase
 
-from archives.helpers import validators
+from archives.helpers import image_uploads, validators
 
 
 class validatorsPositiveTest(APISimpleTestCase):
@@ -87,6 +88,20 @@ class validatorsPositiveTest(APISimpleTestCase):
                     with self.assertRaises(ValidationError):
                         validator(value)
 
+    def test_IsImageValidator_streamed_upload(self):
+        """
+        Check that image type of streamed upload sniffed while it was received is used and file is
+        not read once again.
+        """
+        validator = validators.IsImageValidator()
+        file = image_uploads.StreamedImageUpload('test.jpg', 'image/jpeg', 0, None)
+        file.image_type = 'jpeg'
+
+        with mock.patch.object(validators.imghdr, 'what') as what:
+            validator(file)
+
+        what.assert_not_called()
+
     @unittest.expectedFailure
     def test_DateRangeValidator(self):
         """
@@ -1,26 +1,31 @@
 import functools
-from typing import Sequence, Tuple
+import re
+from typing import Dict, Sequence, Tuple
 
 import guardian.models
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
-from django.core.files.base import ContentFile
+from django.contrib.postgres.search import SearchHeadline, SearchQuery
 from django.core.files.uploadedfile import UploadedFile
-from django.db import connection
-from django.db.models import Count, F, Prefetch, Q, Subquery, Sum, Window, base, functions
+from django.db import transaction
+from django.db.models import F, Prefetch, Q, Subquery, Window, base, functions
 from django.db.utils import ProgrammingError
 from django.shortcuts import get_object_or_404
 from rest_framework import decorators, exceptions, generics, mixins, parsers, permissions, \
     status, viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework_extensions.cache.decorators import cache_response
+from rest_framework_extensions.etag.decorators import etag
 from rest_framework_extensions.mixins import DetailSerializerMixin
 
 import archives.filters
 import archives.models
 import archives.permissions
 import archives.serializers
-from archives.helpers import language_codes
+import archives.tasks
+from archives import key_constructors
+from archives.helpers import fts_queries, image_uploads, language_codes
 from series import constants, error_codes, pagination
 from series.helpers import custom_functions, view_mixins
 
@@ -46,10 +51,10 @@ class TvSeriesBase(generics.GenericAPIView):
             'group',
             queryset=archives.models.GroupingModel.objects.all().select_related('to_series')
         )
-        # Annotations for seasons and episodes.
+        # Annotations for seasons and episodes from denormalized statistics (Null for empty series).
         annotations = dict(
-            seasons_cnt=functions.NullIf(Count('seasons'), 0),
-            episodes_cnt=Sum('seasons__number_of_episodes'),
+            seasons_cnt=F('statistics__seasons_cnt'),
+            episodes_cnt=F('statistics__episodes_cnt'),
         )
         self.queryset = self.model.objects.all(). \
             annotate(**annotations). \
@@ -72,6 +77,14 @@ class TvSeriesDetailView(generics.RetrieveUpdateDestroyAPIView, TvSeriesBase):
     ]
     lookup_url_kwarg = 'series_pk'
     serializer_class = archives.serializers.TvSeriesDetailSerializer
+    object_cache_key_func = key_constructors.TvSeriesDetailKeyConstructor()
+    object_etag_func = object_cache_key_func
+    object_cache_timeout = constants.TIMEOUTS['tvseriesmodel']
+
+    @etag(object_etag_func)
+    @cache_response(key_func=object_cache_key_func, timeout=object_cache_timeout)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -83,7 +96,7 @@ class TvSeriesDetailView(generics.RetrieveUpdateDestroyAPIView, TvSeriesBase):
 
 
 class TvSeriesListCreateView(generics.ListCreateAPIView, TvSeriesBase):
-    pagination_class = pagination.FasterLimitOffsetPagination
+    pagination_class = pagination.SwitchablePagination
     serializer_class = archives.serializers.TvSeriesSerializer
     filterset_class = archives.filters.TvSeriesListCreateViewFilter
     ordering = ('pk',)
@@ -94,12 +107,22 @@ class TvSeriesListCreateView(generics.ListCreateAPIView, TvSeriesBase):
         'entry_author__last_name',
     )
     search_fields = ['^name', '%name', '*name', ]
+    list_cache_key_func = key_constructors.TvSeriesListKeyConstructor()
+    list_etag_func = list_cache_key_func
+    list_cache_timeout = constants.TIMEOUTS['tvseriesmodel']
+
+    @etag(list_etag_func)
+    @cache_response(key_func=list_cache_key_func, timeout=list_cache_timeout)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 
 class FileUploadDeleteView(mixins.DestroyModelMixin, generics.CreateAPIView):
     """
     Api for uploading and deleting images for TvSeries.
     Filename should be with extension, for example 'picture.jpg'.
+    Big files can be uploaded in chunks with 'Content-Range: bytes <start>-<end>/<total>' header.
+    Each but last chunk gets 202 response with 'Range' header of received bytes.
     """
     parser_classes = (parsers.FileUploadParser,)
     permission_classes = (
@@ -130,27 +153,40 @@ class FileUploadDeleteView(mixins.DestroyModelMixin, generics.CreateAPIView):
 
         return context
 
-    def get_file(self, request: Request) -> ContentFile:
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        #  Upload handlers are set after authentication as resumable upload is identified by user.
+        #  Object permissions are checked before any chunk is received, as chunks but last one are
+        #  answered right after they are stored.
+        if request.method == 'POST':
+            self.get_object()
+            request._request.upload_handlers = [
+                image_uploads.StreamingImageUploadHandler(
+                    request._request,
+                    upload_id=f'{request.user.pk}:{self.kwargs["series_pk"]}:{self.kwargs["filename"]}',
+                ), ]
+
+    def get_file(self, request: Request) -> UploadedFile:
         """
-        Fetches file stream from request and transforms it into actual file object.
+        Fetches file uploaded by 'StreamingImageUploadHandler' from request.
         """
         try:
-            in_memory_uploaded_file = request.data['file']
-            assert isinstance(in_memory_uploaded_file, UploadedFile)
+            uploaded_file = request.data['file']
+            assert isinstance(uploaded_file, UploadedFile)
         except (KeyError, AssertionError) as err:
             raise exceptions.ValidationError(*error_codes.NOT_A_BINARY) from err
 
-        try:
-            image_file = ContentFile(
-                in_memory_uploaded_file.read(),
-                name=self.kwargs['filename']
-            )
-        finally:
-            in_memory_uploaded_file.close()
-
-        return image_file
+        return uploaded_file
 
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data.get('file'), image_uploads.IncompleteUpload):
+            received, total = request.data['file']
+            return Response(
+                data={'received': received, 'total': total},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Range': f'bytes=0-{received - 1}'},
+            )
+
         request.data['image'] = self.get_file(request)
 
         return super().create(request, *args, **kwargs)
@@ -199,6 +235,7 @@ class SeasonsViewSet(
     serializer_class = archives.serializers.SeasonsSerializer
     serializer_detail_class = archives.serializers.DetailSeasonSerializer
     model = serializer_class.Meta.model
+    pagination_class = pagination.SwitchablePagination
     filterset_class = archives.filters.SeasonsFilterSet
     ordering = ('_order',)
     ordering_fields = (
@@ -218,6 +255,7 @@ class SeasonsViewSet(
             'update',
             'partial_update',
             'add_subtitle',
+            'subtitle_job',
             'delete_subtitle',
         ),
         non_safe_methods_permissions,
@@ -264,16 +302,36 @@ class SeasonsViewSet(
     @decorators.action(detail=True, methods=['post'], )
     def add_subtitle(self, request, *args, **kwargs):
         """
-        Creates subtitle entry in DB connected with current season.
+        Accepts subtitles file of current season for ingestion in Celery worker. Returns ingestion job
+        which status can be polled.
         """
         serializer = archives.serializers.SubtitlesUploadSerializer(
             data=request.data,
-            context={'season': self.get_object()},
+            context={'season': self.get_object(), 'request': request, },
+        )
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+        transaction.on_commit(functools.partial(archives.tasks.ingest_subtitles.delay, job.pk))
+
+        job_data = archives.serializers.SubtitleIngestionJobSerializer(job, context={'request': request}).data
+        return Response(job_data, status=status.HTTP_202_ACCEPTED, headers={'Location': job_data['url']})
+
+    @decorators.action(
+        detail=True,
+        methods=['get'],
+        url_path=r'subtitle_jobs/(?P<job_id>\d+)',
+    )
+    def subtitle_job(self, request, *args, **kwargs):
+        """
+        Shows status of subtitles ingestion job.
+        """
+        job = get_object_or_404(
+            self.get_object().subtitle_jobs.select_related('season').defer('raw'),
+            pk=kwargs['job_id'],
         )
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
+        serializer = archives.serializers.SubtitleIngestionJobSerializer(job, context={'request': request})
 
-        return Response(status=status.HTTP_201_CREATED)
+        return Response(serializer.data)
 
     @decorators.action(
         detail=True,
@@ -303,7 +361,7 @@ class UserObjectPermissionView(mixins.CreateModelMixin,
     serializer_class = archives.serializers.ManagePermissionsSerializer
     perm_model = serializer_class.Meta.model
     permission_code = constants.DEFAULT_OBJECT_LEVEL_PERMISSION_CODE
-    pagination_class = pagination.FasterLimitOffsetPagination
+    pagination_class = pagination.SwitchablePagination
     filterset_class = archives.filters.UserObjectPermissionFilterSet
     ordering = ('content_type__model',)
     ordering_fields = (
@@ -359,7 +417,37 @@ class FTSListViewSet(DetailSerializerMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = archives.serializers.FTSSerializer
     serializer_detail_class = archives.serializers.FTSDetailSerializer
     model = serializer_class.Meta.model
+    pagination_class = pagination.TopKSwitchablePagination
     default_search_configuration = 'simple'
+    list_cache_key_func = key_constructors.FTSListKeyConstructor()
+    list_cache_timeout = constants.TIMEOUTS['subtitles']
+    suggestions_cache_key_func = key_constructors.FTSSuggestionsKeyConstructor()
+
+    @cache_response(key_func=list_cache_key_func, timeout=list_cache_timeout)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @decorators.action(detail=False, methods=['get'], )
+    @cache_response(key_func=suggestions_cache_key_func, timeout=list_cache_timeout)
+    def suggestions(self, request, *args, **kwargs):
+        """
+        Shows completions and typo corrections of the last word of search text taken from vocabulary
+        of subtitles lexemes with their document frequencies.
+        """
+        search, language_code, _ = self.validate_query_params()
+        words = re.findall(r'\w+', search.lower())
+        term = words[-1] if words else ''
+        configs = None if language_code is None else [self.model.objects.get_search_configuration(language_code)]
+        limit = settings.FTS_SUGGESTIONS_LIMIT
+        lexemes = archives.models.SubtitleLexeme.objects
+
+        serializer = archives.serializers.FTSSuggestionsSerializer(
+            instance={
+                'term': term,
+                'completions': lexemes.completions(term, configs)[:limit] if term else [],
+                'corrections': lexemes.corrections(term, configs)[:limit] if term else [],
+            })
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @functools.lru_cache(maxsize=1)
     def validate_query_params(self) -> Tuple[str, str, str]:
@@ -390,18 +478,28 @@ class FTSListViewSet(DetailSerializerMixin, viewsets.ReadOnlyModelViewSet):
         # noinspection PyUnboundLocalVariable
         return search, language_code, search_type
 
+    @functools.lru_cache(maxsize=1)
+    def analyze_search(self) -> Dict[str, fts_queries.QueryAnalysis]:
+        """
+        Returns {config: analysis} of search text for each FTS configuration search runs with.
+        """
+        search, language_code, search_type = self.validate_query_params()
+        if language_code is not None:
+            configs = [self.model.objects.get_search_configuration(language_code)]
+        else:
+            configs = self.model.objects.search_configurations()
+
+        try:
+            return fts_queries.analyze(search, search_type, configs)
+        except ProgrammingError as err:
+            raise exceptions.ValidationError(
+                {'query_parameters': error_codes.WRONG_RAW_SEARCH.message},
+                code=error_codes.WRONG_RAW_SEARCH.code,
+            ) from err
+
     def get_queryset(self):
         search, language_code, search_type = self.validate_query_params()
-        search_query = SearchQuery(
-            search,
-            config=F('search_configuration'),
-            search_type=search_type,
-        )
-        fts_condition = Q(full_text=F('search_query'))
-        language_condition = Q(language=language_code)
-        condition = fts_condition & language_condition if language_code is not None else fts_condition
         subtitles_deferred_fields_fields = (
-            'text',
             'full_text',
             'search_configuration',
         )
@@ -412,78 +510,79 @@ class FTSListViewSet(DetailSerializerMixin, viewsets.ReadOnlyModelViewSet):
                 'series',
                 'season_number',
             ), )
-        search_rank = SearchRank(
-            F('full_text'),
-            search_query,
-            cover_density=True,
-            normalization=32,
-        )
         # Rank like 1,2,3 instead of 0.9, 0.76, 0.044, etc
         positional_rank = Window(
             expression=functions.RowNumber(),
-            order_by=search_rank.desc(),
+            order_by=F('search_rank').desc(),
         )
 
-        self.queryset = self.model.objects.annotate(
-            search_query=search_query,
-            positional_rank=positional_rank,
-        ).filter(
-            condition,
+        self.queryset = self.model.objects.full_text_search(
+            search,
+            search_type,
+            language_code,
         ).select_related(
             'season',
             'season__series',
         ).defer(
             *subtitles_deferred_fields_fields,
             *season_deferred_fields,
-        ).order_by(
-            'positional_rank',
         )
+        #  Top-k pagination ranks only limited number of candidates and sets positional rank itself.
+        if not self.paginator.is_keyset_requested(self.request):
+            self.queryset = self.queryset.annotate(
+                positional_rank=positional_rank,
+            ).order_by(
+                'positional_rank',
+            )
 
         return super().get_queryset()
 
     @property
     def queryset_detail(self):
         search, language_code, search_type = self.validate_query_params()
+        #  Cues of one subtitles are few, therefore per row tsquery is fine here.
         search_query = SearchQuery(
             search,
-            config=F('search_configuration'),
+            config=F('subtitle__search_configuration'),
             search_type=search_type,
         )
         subtitles_deferred_fields = custom_functions.get_model_fields_subset(
             model=archives.models.Subtitles,
             fields_to_remove=('id',)
         )
-        self.queryset = self.model.objects.annotate(
+        #  Headlines are made only from short matching cues instead of whole episode text.
+        matching_cues = archives.models.SubtitleCue.objects.filter(
+            full_text=search_query,
+        ).annotate(
             headline=SearchHeadline(
                 expression=F('text'),
                 query=search_query,
-                config=F('search_configuration'),
-                max_words=25,
-                min_words=15,
-                short_word=3,
-                max_fragments=10,
-            )).defer(*subtitles_deferred_fields)
+                config=F('subtitle__search_configuration'),
+                highlight_all=True,
+            )).only(
+            'subtitle_id',
+            'number',
+            'start_ms',
+            'end_ms',
+        ).order_by(
+            'number',
+        )
+        self.queryset = self.model.objects.prefetch_related(
+            Prefetch('cues', queryset=matching_cues, to_attr='matching_cues'),
+        ).defer(*subtitles_deferred_fields)
 
         return self.queryset
 
     def get_paginated_response(self, data):
         """
         If response returns zero found objects - we check whether or not search words combination makes
-        any sense or only consist of stop words and such.
+        any sense or only consist of stop words and such. Search is already analyzed for cache key.
         """
-        search, language_code, search_type = self.validate_query_params()
+        _, language_code, _ = self.validate_query_params()
 
         if not data and language_code:
-            config = self.model.objects.get_search_configuration(language_code)
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    f"""
-                    SELECT numnode({SearchQuery.SEARCH_TYPES[search_type]}('{config}', '{search}'))
-                    """
-                )
-                [numnode] = cursor.fetchone()
-
-            if numnode == 0:
+            [analysis] = self.analyze_search().values()
+            if analysis.numnode == 0:
                 raise exceptions.ValidationError(
                     *error_codes.WRONG_SEARCH_QUERY
                 )
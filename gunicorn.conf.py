@@ -35,6 +35,12 @@ if settings.DEBUG:
 reload_engine = 'inotify'
 
 
+def post_worker_init(worker):
+    #  Workers share image hash index, so it is built once and worker only subscribes on its changes.
+    from archives.models import ImageModel
+    ImageModel.stored_image_hash.warm_up()
+
+
 def worker_int(worker):
     worker.log.info("worker received INT or QUIT signal")
 
@@ -2,7 +2,9 @@ from __future__ import absolute_import, unicode_literals
 
 import os
 
-from celery import Celery
+from celery import Celery, signals
+
+from series import request_context
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'series.settings')
@@ -29,4 +31,35 @@ def debug_task(self):
 
 @app.task
 def delete_file(path: str) -> None:
-    os.remove(path)
\ No newline at end of file
+    os.remove(path)
+
+
+#  Context managers binding request user to context of currently running tasks, keyed by task id.
+_task_contexts = {}
+
+
+@signals.before_task_publish.connect
+def propagate_request_user(headers: dict, **kwargs) -> None:
+    """
+    Passes current request user to the task in message headers.
+    """
+    user_id = request_context.get_current_user_id()
+    if user_id is not None:
+        headers.setdefault(request_context.USER_ID_HEADER, user_id)
+
+
+@signals.task_prerun.connect
+def bind_request_user(task_id: str, task, **kwargs) -> None:
+    """
+    Binds request user received in message headers to the task context.
+    """
+    context = request_context.bind(user_id=getattr(task.request, request_context.USER_ID_HEADER, None))
+    context.__enter__()
+    _task_contexts[task_id] = context
+
+
+@signals.task_postrun.connect
+def unbind_request_user(task_id: str, **kwargs) -> None:
+    context = _task_contexts.pop(task_id, None)
+    if context is not None:
+        context.__exit__(None, None, None)
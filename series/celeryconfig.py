@@ -39,6 +39,22 @@ beat_schedule = {
     'delete_old_ip_blacklist_entries': {
         'task': 'administration.tasks.delete_non_active_blacklisted_ips',
         'schedule': crontab(hour=17, minute=5),
-    }
+    },
+    'create_changelog_partitions': {
+        'task': 'administration.tasks.create_changelog_partitions',
+        'schedule': crontab(hour=17, minute=6),
+    },
+    'archive_old_changelog_partitions': {
+        'task': 'administration.tasks.archive_old_changelog_partitions',
+        'schedule': crontab(hour=17, minute=7, day_of_month=1),
+    },
+    'delete_stale_image_upload_parts': {
+        'task': 'archives.tasks.delete_stale_image_upload_parts',
+        'schedule': crontab(hour=17, minute=8),
+    },
+    'process_pending_images': {
+        'task': 'archives.tasks.process_pending_images',
+        'schedule': crontab(hour=17, minute=9),
+    },
 }
 
@@ -10,6 +10,9 @@ TIMEOUTS = {
     'default': 60 * 60,
     'statuslog': 60 * 60,
     'entrieschangelog': 60 * 60,
+    'tvseriesmodel': 60 * 60,
+    'subtitles': 60 * 60,
+    'fts_query_analysis': 24 * 60 * 60,
 }
 
 IP_BLACKLIST_CACHE_KEY = 'blacklist'
@@ -296,3 +296,39 @@ WRONG_SEARCH_QUERY = exc_msg(
     'Your search query consists only of stop words. Please try to construct it in more meaningful way.',
     'wrong_search_query',
 )
+INVALID_CURSOR = exc_msg(
+    'Invalid cursor.',
+    'invalid_cursor',
+)
+KEYSET_ORDERING = exc_msg(
+    'Cursor pagination supports only ordering by plain model fields.',
+    'keyset_ordering',
+)
+FILE_TOO_LARGE = exc_msg(
+    'Uploaded file exceeds maximum allowed size.',
+    'file_too_large',
+)
+WRONG_CONTENT_RANGE = exc_msg(
+    'Content-Range header should be "bytes <start>-<end>/<total>" and match the size of the chunk.',
+    'wrong_content_range',
+)
+WRONG_UPLOAD_OFFSET = exc_msg(
+    'Chunk does not start where already received part of the upload ends.',
+    'wrong_upload_offset',
+)
+SUBTITLE_ENCODING_UNDETECTED = exc_msg(
+    'Subtitles file encoding can not be detected.',
+    'subtitle_encoding_undetected',
+)
+EPISODE_NUMBER_UNDETECTED = exc_msg(
+    'Episode number can not be derived from file name.',
+    'episode_number_undetected',
+)
+SUBTITLES_ALREADY_EXIST = exc_msg(
+    'Subtitles of this episode and language already exist.',
+    'subtitles_already_exist',
+)
+SUBTITLE_INGESTION_FAILED = exc_msg(
+    'Subtitles ingestion failed unexpectedly.',
+    'subtitle_ingestion_failed',
+)
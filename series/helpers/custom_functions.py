@@ -1,21 +1,15 @@
 import datetime
-import functools
 import inspect
-import os
 from typing import Callable, Container, Iterable, Optional, Tuple, Union
 
 import more_itertools
 import numpy
-from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q, QuerySet
 from django.db.models.base import ModelBase
 from psycopg2.extras import DateRange
 from rest_framework.response import Response
 
-import archives.models
-from series import error_codes
-
 
 def check_code_inside(func: Callable, code: [Container, Iterable]) -> bool:
     """
@@ -113,81 +107,6 @@ def get_model_fields_subset(
     return fields
 
 
-def clean_garbage_in_folder(path: str = settings.MEDIA_ROOT_FULL_PATH) -> None:
-    """
-    Removes files and sub-folders in chosen folder. Also cleans ImageModel from entries
-    that leads to non-existent files.
-    """
-    assert path == settings.MEDIA_ROOT_FULL_PATH, 'Temporary assertion.'
-    assert os.path.exists(path) and os.path.isdir(path), error_codes.WRONG_PATH.message
-    assert not settings.IM_IN_TEST_MODE, error_codes.NOT_IN_TESTS.message
-
-    #  Full path to MEDIA_ROOT.
-    media_root_partial = functools.partial(os.path.join, settings.BASE_DIR, settings.MEDIA_ROOT)
-
-    #  Container with all files in MEDIA ROOT.
-    media_root_files = set()
-
-    for (dirpath, dirnames, filenames) in os.walk(path):
-        for file in filenames:
-            file_path = os.path.join(dirpath, file)  # full path here
-            file_path = os.path.normpath(file_path)
-            media_root_files.add(file_path)
-
-    db_files = set()
-    images_to_delete = []
-
-    #  All alive file path in ImageModel.
-    images_in_db = archives.models.ImageModel.objects.all().values_list('image', flat=True)
-    for image in images_in_db:
-        image_path = media_root_partial(image)
-        image_path = os.path.normpath(image_path)
-
-        #  If image file path is dead -delete image entry.
-        if not os.path.exists(image_path):
-            images_to_delete.append(image)
-        else:
-            db_files.add(image_path)
-
-    deleted_model_instances_count, _ = archives.models.ImageModel.objects.filter(
-        image__in=images_to_delete).delete()
-
-    #  Files in MEDIA_ROOT that are not present in ImageModel and should be deleted.
-    files_to_delete = media_root_files - db_files
-
-    assert len(media_root_files) == (len(db_files) + len(files_to_delete)),\
-        'Something went really wrong!'
-
-    errors_in_delete = []
-
-    for file in files_to_delete:
-        try:
-            os.remove(file)
-        except (PermissionError, OSError):
-            errors_in_delete.append(file)
-
-    folders_counter = 0
-
-    #  Delete all empty folders.
-    for (dirpath, dirnames, filenames) in os.walk(path):
-        for folder in dirnames:
-            folder_path = os.path.join(dirpath, folder)
-            if os.path.isdir(folder_path) and not os.listdir(folder_path):
-                os.rmdir(folder_path)
-                folders_counter += 1
-
-    print(
-        f'Total files - {len(media_root_files)}',
-        f'Files in DB - {len(db_files)}',
-        f'Deleted - {len(files_to_delete)} files',
-        f'Deleted - {folders_counter} empty folders.',
-        f'Deleted - {deleted_model_instances_count} empty model instances.',
-        f'{len(errors_in_delete)} errors happened during file deletion process.'
-        f' Filenames are --{errors_in_delete}',
-        sep='\n'
-    )
-
-
 def available_range(
         outer_range: DateRange,
         *inner_ranges: DateRange,
@@ -1,7 +1,11 @@
 from django.contrib.postgres.fields import HStoreField
 from django.db import models
+from django.db.models.expressions import Col
 from django.db.models.functions import Length
 
+from archives.helpers.custom_fields import ImageHashField
+from archives.helpers.image_hash_index import flip_masks, hash_to_int
+
 
 @HStoreField.register_lookup
 class CheckEpisodes(models.Transform):
@@ -97,5 +101,50 @@ class Masklen(models.Transform):
 models.CharField.register_lookup(Length)
 
 
+@ImageHashField.register_lookup
+class HammingLessThan(models.Lookup):
+    """
+    Image hash has Hamming distance less than given one to given hash.
+    image_hash__hamming_lt=(image_hash, 10)
+    Compared by '<field name>_bits' BIGINT column, based on function in archives migration 0074:
+
+    CREATE OR REPLACE FUNCTION hamming_distance(BIGINT, BIGINT) RETURNS INTEGER AS
+    $hamming_distance$
+        SELECT length(replace(($1 # $2)::BIT(64)::TEXT, '0', ''));
+    $hamming_distance$
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+    Rows are prefiltered by indexes on 16 bit chunks of the hash, as if distance is less than d,
+    then at least one chunk differs in no more than (d - 1) // 4 bits.
+    """
+    lookup_name = 'hamming_lt'
+    prepare_rhs = False
+    chunks = 4
+    chunk_bits = 16
+
+    def get_prep_lookup(self):
+        image_hash, distance = self.rhs
+        assert distance >= 1, 'Distance should be positive integer.'
+        return hash_to_int(image_hash), distance
+
+    def as_sql(self, qn, connection):
+        bits_field = self.lhs.target.model._meta.get_field(f'{self.lhs.target.name}_bits')
+        lhs, lhs_params = qn.compile(Col(self.lhs.alias, bits_field))
+        value, distance = self.rhs
+
+        masks = flip_masks(self.chunk_bits, (distance - 1) // self.chunks)
+        chunk_mask = (1 << self.chunk_bits) - 1
+        conditions, params = [], []
+        for chunk in range(self.chunks):
+            shift = chunk * self.chunk_bits
+            conditions.append(f'(({lhs} >> {shift}) & {chunk_mask}) = ANY(%s::BIGINT[])')
+            params += [*lhs_params, [((value >> shift) & chunk_mask) ^ mask for mask in masks]]
+
+        #  Unsigned hash is stored as signed BIGINT.
+        signed_value = value - (1 << 64) if value >= (1 << 63) else value
+        sql = f'(({" OR ".join(conditions)}) AND hamming_distance({lhs}, %s) < %s)'
+        return sql, [*params, *lhs_params, signed_value, distance]
+
+
 
 
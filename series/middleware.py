@@ -15,7 +15,7 @@ from django.http import HttpRequest, JsonResponse
 from rest_framework import status, throttling
 
 import administration.models
-from series import constants
+from series import constants, request_context
 
 
 class IpBlackListMiddleware:
@@ -129,3 +129,17 @@ class IpBlackListMiddleware:
                 result = pipe.execute()
 
                 return any(result)
+
+
+class RequestContextMiddleware:
+    """
+    Makes current request available via 'series.request_context' anywhere down the call stack,
+    for example in signal handlers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_context.bind(request=request):
+            return self.get_response(request)
@@ -1,6 +1,39 @@
+import base64
+import binascii
+import datetime
 import functools
+import json
+import operator
+from collections import OrderedDict
+from typing import Any, List, NamedTuple, Optional, Tuple
 
-from rest_framework.pagination import LimitOffsetPagination
+from django.conf import settings
+from django.contrib.postgres.fields import RangeField
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Model, Q, QuerySet
+from django.db.models.fields import Field
+from rest_framework import exceptions
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from administration.encoders import CustomEncoder
+from series import error_codes
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Returns planner estimate of the number of rows in queryset instead of an exact count.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        [[plan]] = cursor.fetchone()
+
+    return int(plan['Plan']['Plan Rows'])
 
 
 class FasterLimitOffsetPagination(LimitOffsetPagination):
@@ -12,3 +45,389 @@ class FasterLimitOffsetPagination(LimitOffsetPagination):
         """
         return len(queryset)
 
+
+class CursorEncoder(CustomEncoder):
+    """
+    Keeps full microseconds precision of datetime as cursor values are compared for equality.
+    """
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class OrderingKey(NamedTuple):
+    """
+    One member of keyset ordering.
+    """
+    path: str
+    field: Field
+    descending: bool
+    nulls_last: bool
+
+    def inverted(self) -> 'OrderingKey':
+        """
+        Same key but in opposite direction. Used to seek backwards.
+        """
+        return self._replace(descending=not self.descending, nulls_last=not self.nulls_last)
+
+    @property
+    def expression(self):
+        """
+        Ordering expression for queryset 'order_by'.
+        """
+        order = F(self.path).desc if self.descending else F(self.path).asc
+        return order(nulls_last=True) if self.nulls_last else order(nulls_first=True)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination. Works with any ordering applied to queryset by 'OrderingFilter' or
+    with view 'ordering' attribute. Primary key is always added as a last ordering member in order
+    to make ordering stable. Cursor is opaque base64 encoded last seen row ordering values.
+    Nulls are always placed in the end of the ordering.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    approximate_total_query_param = 'approximate_total'
+    invalid_cursor_message = error_codes.INVALID_CURSOR.message
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_ordering_keys(queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.approximate_total = self.get_approximate_total(queryset, request)
+
+        is_reversed = self.cursor is not None and self.cursor['reverse']
+        keys = [key.inverted() for key in self.keys] if is_reversed else self.keys
+
+        queryset = queryset.order_by(*(key.expression for key in keys))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_seek_condition(keys, self.cursor['values']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_following_page = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if is_reversed:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following_page
+        else:
+            self.has_next, self.has_previous = has_following_page, self.cursor is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        response_data = [
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ]
+        if self.approximate_total is not None:
+            response_data.append(('approximate_total', self.approximate_total))
+        response_data.append(('results', data))
+
+        return Response(OrderedDict(response_data))
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_ordering_keys(self, queryset: QuerySet, view) -> List[OrderingKey]:
+        """
+        Converts queryset (or view) ordering to a list of ordering keys with pk tie-breaker at the end.
+        """
+        ordering = queryset.query.order_by or getattr(view, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        model = queryset.model
+        pk_name = model._meta.pk.name
+        keys = []
+
+        for member in ordering:
+            if not isinstance(member, str):
+                raise exceptions.ValidationError(*error_codes.KEYSET_ORDERING)
+            descending = member.startswith('-')
+            path = member.lstrip('-')
+            if path == 'pk':
+                path = pk_name
+            keys.append(OrderingKey(path, self.resolve_field(model, path), descending, True))
+
+        if pk_name not in (key.path for key in keys):
+            descending = keys[0].descending if keys else False
+            keys.append(OrderingKey(pk_name, model._meta.pk, descending, True))
+
+        return keys
+
+    @staticmethod
+    def resolve_field(model: Model, path: str) -> Field:
+        """
+        Resolves model field by lookup path like 'entry_author__last_name'.
+        """
+        *relations, field_name = path.split('__')
+        try:
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            return model._meta.get_field(field_name)
+        except (FieldDoesNotExist, AttributeError) as err:
+            raise exceptions.ValidationError(*error_codes.KEYSET_ORDERING) from err
+
+    @staticmethod
+    def get_seek_condition(keys: List[OrderingKey], values: List[Any]) -> Q:
+        """
+        Builds row comparison condition '(k1, k2, ..., kn) > (v1, v2, ..., vn)' respecting direction
+        and nulls position of each key.
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... OR (k1 = v1 AND ... AND kn > vn)
+        """
+        conditions = []
+        equal_so_far = Q()
+
+        for key, value in zip(keys, values):
+            if value is None:
+                after = Q(pk__in=()) if key.nulls_last else Q(**{f'{key.path}__isnull': False})
+                equal = Q(**{f'{key.path}__isnull': True})
+            else:
+                lookup = 'lt' if key.descending else 'gt'
+                after = Q(**{f'{key.path}__{lookup}': value})
+                if key.nulls_last and key.field.null:
+                    after |= Q(**{f'{key.path}__isnull': True})
+                equal = Q(**{key.path: value})
+
+            conditions.append(equal_so_far & after)
+            equal_so_far &= equal
+
+        return functools.reduce(operator.or_, conditions)
+
+    @staticmethod
+    def get_instance_value(instance: Model, path: str) -> Any:
+        """
+        Fetches value from instance by lookup path like 'entry_author__last_name'.
+        """
+        return functools.reduce(
+            lambda obj, attr: getattr(obj, attr, None) if obj is not None else None,
+            path.split('__'),
+            instance,
+        )
+
+    def get_ordering_signature(self) -> str:
+        return ','.join(('-' if key.descending else '') + key.path for key in self.keys)
+
+    def encode_cursor(self, instance: Model, reverse: bool) -> str:
+        """
+        Encodes ordering values of given instance into opaque cursor and builds url with it.
+        """
+        payload = {
+            'o': self.get_ordering_signature(),
+            'v': [self.get_instance_value(instance, key.path) for key in self.keys],
+            'r': reverse,
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, cls=CursorEncoder, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request: Request) -> Optional[dict]:
+        """
+        Decodes cursor from query params. Returns None if cursor is not provided.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            signature, values, reverse = payload['o'], payload['v'], bool(payload['r'])
+            assert signature == self.get_ordering_signature() and len(values) == len(self.keys)
+            values = [self.decode_value(key.field, value) for key, value in zip(self.keys, values)]
+        except (TypeError, ValueError, KeyError, AssertionError, binascii.Error, UnicodeError) as err:
+            raise exceptions.NotFound(self.invalid_cursor_message) from err
+
+        return {'values': values, 'reverse': reverse}
+
+    @staticmethod
+    def decode_value(field: Field, value: Any) -> Any:
+        """
+        Converts JSON primitive back to python value using model field.
+        """
+        if value is None:
+            return None
+        if isinstance(field, RangeField):
+            if value.get('empty'):
+                return field.range_type(empty=True)
+            lower, upper = (
+                field.base_field.to_python(bound) if bound is not None else None
+                for bound in (value['lower'], value['upper'])
+            )
+            return field.range_type(lower, upper, value['bounds'])
+
+        return field.to_python(value)
+
+    def get_approximate_total(self, queryset: QuerySet, request: Request) -> Optional[int]:
+        """
+        Returns planner rows estimate instead of an exact count if requested in query params.
+        """
+        if request.query_params.get(self.approximate_total_query_param) not in ('true', 'True', '1'):
+            return None
+
+        return estimate_count(queryset)
+
+    def get_schema_fields(self, view):
+        return []
+
+
+class SwitchablePagination(FasterLimitOffsetPagination):
+    """
+    Limit-offset pagination by default. Switches to keyset pagination when '?pagination=cursor' or
+    'cursor' query parameter are present in request. Allows clients to migrate on keyset pagination
+    gradually.
+    """
+    switch_query_param = 'pagination'
+    switch_query_value = 'cursor'
+    keyset_pagination_class = KeysetPagination
+
+    keyset_paginator = None
+
+    def is_keyset_requested(self, request: Request) -> bool:
+        return request.query_params.get(self.switch_query_param) == self.switch_query_value or \
+            self.keyset_pagination_class.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_requested(request):
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+
+
+class TopKPagination(BasePagination):
+    """
+    Pagination of search results by relevance which doesn't rank every match. At most
+    'max_candidates' matches are retrieved by index in physical order, only them are ranked by
+    'rank_field' annotation and paginated by (rank, pk) keyset. Continuation token is opaque base64
+    encoded last seen rank, pk and position. Instead of count planner estimate of the number of all
+    matches is returned. Therefore cost of any page doesn't depend on how many rows match.
+    """
+    cursor_query_param = 'token'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    rank_field = 'search_rank'
+    position_field = 'positional_rank'
+    max_candidates = None
+    invalid_cursor_message = error_codes.INVALID_CURSOR.message
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.token = self.decode_token(request)
+        queryset = queryset.order_by()
+        self.approximate_count = estimate_count(queryset)
+
+        max_candidates = self.max_candidates or settings.FTS_TOP_K_CANDIDATES
+        candidates = queryset.values('pk')[:max_candidates]
+        queryset = queryset.filter(pk__in=candidates).order_by(F(self.rank_field).desc(), '-pk')
+
+        position = 0
+        if self.token is not None:
+            rank, pk, position = self.token
+            queryset = queryset.filter(
+                Q(**{f'{self.rank_field}__lt': rank}) | Q(**{self.rank_field: rank, 'pk__lt': pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        for position, instance in enumerate(self.page, start=position + 1):
+            setattr(instance, self.position_field, position)
+        self.position = position
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('approximate_count', self.approximate_count),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(
+                [getattr(last, self.rank_field), last.pk, self.position],
+                separators=(',', ':'),
+            ).encode('utf-8')
+        ).decode('ascii')
+
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_token(self, request: Request) -> Optional[Tuple[float, int, int]]:
+        """
+        Decodes continuation token from query params. Returns None if token is not provided.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            rank, pk, position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return float(rank), int(pk), int(position)
+        except (TypeError, ValueError, binascii.Error, UnicodeError) as err:
+            raise exceptions.NotFound(self.invalid_cursor_message) from err
+
+    def get_schema_fields(self, view):
+        return []
+
+
+class TopKSwitchablePagination(SwitchablePagination):
+    """
+    Limit-offset pagination by default. Switches to top-k pagination when '?pagination=top' or
+    'token' query parameter are present in request.
+    """
+    switch_query_value = 'top'
+    keyset_pagination_class = TopKPagination
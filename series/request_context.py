@@ -0,0 +1,45 @@
+import contextlib
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.http import HttpRequest
+
+#  Name of Celery message header used to pass request user to tasks.
+USER_ID_HEADER = 'request_user_id'
+
+_current_request: ContextVar[Optional[HttpRequest]] = ContextVar('current_request', default=None)
+_current_user_id: ContextVar[Optional[int]] = ContextVar('current_user_id', default=None)
+
+
+def get_current_request() -> Optional[HttpRequest]:
+    """
+    Returns request currently being processed or None if called outside of request-response cycle.
+    """
+    return _current_request.get()
+
+
+def get_current_user_id() -> Optional[int]:
+    """
+    Returns pk of authenticated user of current request or pk of user passed to current Celery task.
+    User is read from request lazily as DRF authenticates user inside of a view.
+    """
+    request = _current_request.get()
+    if request is not None:
+        user = getattr(request, 'user', None)
+        return user.pk if user is not None and user.is_authenticated else None
+
+    return _current_user_id.get()
+
+
+@contextlib.contextmanager
+def bind(request: Optional[HttpRequest] = None, user_id: Optional[int] = None) -> Iterator[None]:
+    """
+    Binds request or user pk to current context for the duration of the block.
+    """
+    request_token = _current_request.set(request)
+    user_id_token = _current_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        _current_request.reset(request_token)
+        _current_user_id.reset(user_id_token)
@@ -2,6 +2,7 @@
 
 import os
 import socket
+import tempfile
 from datetime import timedelta
 
 from dotenv import load_dotenv
@@ -73,6 +74,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'series.middleware.RequestContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -321,6 +323,7 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 #  Scope throttling cache.
 SCOPE_THROTTLING_CACHE = 'throttling'
 BLACKLIST_CACHE = 'blacklist'
+IMAGE_HASH_INDEX_CACHE = 'image_hash_index'
 
 #  Test messaging broker keys:
 VALIDATOR_SWITCH_OFF_KEY = 'switch_off_in_tests'
@@ -355,6 +358,12 @@ CACHES = {
         'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/12',
         'OPTIONS': CACHE_OPTIONS,
+    },
+    #  Near-duplicate image hash index shared by all processes.
+    IMAGE_HASH_INDEX_CACHE: {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/11',
+        'OPTIONS': CACHE_OPTIONS,
     }, }
 
 #  Guardian.
@@ -409,6 +418,10 @@ LOGGING = {
             'propagate': True,
             'level': 'WARNING',
         },
+        'archives.helpers.fts_dictionaries': {
+            'handlers': ['file', 'console', ],
+            'level': 'INFO',
+        },
         # 'django.db.backends': {
         #     'handlers': ['console'],
         #     'level': 'DEBUG',
@@ -440,6 +453,64 @@ REST_FRAMEWORK_EXTENSIONS = {
     'DEFAULT_CACHE_ERRORS': False,
     'DEFAULT_KEY_CONSTRUCTOR_MEMOIZE_FOR_REQUEST': True,
 }
+#  How 'EntriesChangeLog' entries are written: 'on_commit' - in one batch on transaction commit,
+#  'celery' - batch is written by Celery task, 'immediate' - at once (used in tests as test case
+#  transactions are never committed).
+CHANGELOG_WRITE_MODE = 'on_commit'
+#  How 'EntriesChangeLog' states are stored: 'full' - full state in each entry, 'delta' - only changed
+#  fields, with full state (keyframe) in every CHANGELOG_KEYFRAME_INTERVAL entry of an object.
+CHANGELOG_STORAGE_MODE = 'full'
+CHANGELOG_KEYFRAME_INTERVAL = 10
+#  'EntriesChangeLog' table is partitioned by months. Partitions are created this number of months
+#  ahead, partitions older than CHANGELOG_RETENTION_MONTHS are exported to CHANGELOG_ARCHIVE_DIR
+#  as gzip compressed csv files and dropped.
+CHANGELOG_PARTITIONS_AHEAD = 3
+CHANGELOG_RETENTION_MONTHS = 24
+CHANGELOG_ARCHIVE_DIR = os.path.join(BASE_DIR, 'changelog_archive')
+#  Uploaded images are streamed to temporary files. Part files of resumable (chunked) uploads are
+#  kept in IMAGE_UPLOAD_PARTS_DIR and deleted if not updated for IMAGE_UPLOAD_PART_TIMEOUT seconds.
+IMAGE_UPLOAD_MAX_SIZE = 20 * 2 ** 20
+IMAGE_UPLOAD_PARTS_DIR = os.path.join(tempfile.gettempdir(), 'series_image_uploads')
+IMAGE_UPLOAD_PART_TIMEOUT = 60 * 60 * 24
+#  Resized copies of uploaded images made by 'process_image' Celery task. Size is a bounding box,
+#  None keeps original size. If IMAGE_HASH_OFF_REQUEST, image hash is made by this task as well
+#  instead of on save.
+IMAGE_DERIVATIVES = {
+    'thumbnail': {'size': (200, 300), 'format': 'JPEG', 'options': {'quality': 80}},
+    'medium': {'size': (600, 900), 'format': 'JPEG', 'options': {'quality': 85}},
+    'webp': {'size': None, 'format': 'WEBP', 'options': {'quality': 80}},
+}
+IMAGE_HASH_OFF_REQUEST = False
+#  'path' - images are stored by series name and season number, 'content' - by sha256 digest of their
+#  content in IMAGE_CONTENT_DIR of MEDIA_ROOT. Content addressed file is shared by images with the same
+#  content and deleted once last of them is deleted.
+IMAGE_STORAGE_MODE = 'path'
+IMAGE_CONTENT_DIR = 'content'
+#  Media root garbage collector checks files and images in batches of MEDIA_GC_BATCH_SIZE, deletes files
+#  in MEDIA_GC_WORKERS threads and keeps files modified during last MEDIA_GC_GRACE_PERIOD seconds.
+MEDIA_GC_BATCH_SIZE = 1000
+MEDIA_GC_WORKERS = 8
+MEDIA_GC_GRACE_PERIOD = 60 * 60
+#  Bulk image re-hashing reads images in batches of IMAGE_REHASH_BATCH_SIZE and hashes them in
+#  IMAGE_REHASH_WORKERS processes (threads if run by Celery worker).
+IMAGE_REHASH_BATCH_SIZE = 500
+IMAGE_REHASH_WORKERS = os.cpu_count() or 1
+#  Subtitles archives are parsed in SUBTITLE_IMPORT_WORKERS processes.
+SUBTITLE_IMPORT_WORKERS = os.cpu_count() or 1
+#  Dictionaries of FTS_WARM_UP_CONFIGURATIONS are loaded by each new DB connection right away if
+#  FTS_WARM_UP_ENABLED. FTS_SHARED_DICTIONARIES - {configuration: (hunspell dictionary, dictionary file,
+#  stop words)} to replace by 'shared_ispell' dictionaries with 'fts_dictionaries --install-shared' command.
+FTS_WARM_UP_ENABLED = True
+FTS_WARM_UP_CONFIGURATIONS = ('english_hunspell', 'russian_hunspell', 'french_hunspell', )
+FTS_SHARED_DICTIONARIES = {
+    'english_hunspell': ('english_hunspell', 'en_us', 'english'),
+    'russian_hunspell': ('russian_hunspell', 'ru_ru', 'russian'),
+    'french_hunspell': ('french_hunspell', 'fr', 'french'),
+}
+#  Top-k FTS pagination ranks at most FTS_TOP_K_CANDIDATES matches.
+FTS_TOP_K_CANDIDATES = 1000
+#  FTS suggestions endpoint returns at most FTS_SUGGESTIONS_LIMIT completions and corrections each.
+FTS_SUGGESTIONS_LIMIT = 10
 #  White-noise settings.
 #  http://whitenoise.evans.io/en/stable/django.html#whitenoise-makes-my-tests-run-slow
 if IM_IN_TEST_MODE:
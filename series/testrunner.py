@@ -35,6 +35,9 @@ class MyTestSuiteRunner(DiscoverRunner):
         #  Add flag 'IM_IN_TEST_MODE' into settings.
         super().setup_test_environment(**kwargs)
         settings.IM_IN_TEST_MODE = True
+        #  Test case transactions are never committed, so changelog buffers would never be flushed.
+        self.original_changelog_write_mode = settings.CHANGELOG_WRITE_MODE
+        settings.CHANGELOG_WRITE_MODE = 'immediate'
         #  Move 'MEDIA_ROOT' into temporary folder.
         self.temp_dir = tempfile.mkdtemp()
         settings.MEDIA_ROOT = self.temp_dir
@@ -49,6 +52,7 @@ class MyTestSuiteRunner(DiscoverRunner):
     def teardown_test_environment(self, **kwargs):
         super().teardown_test_environment(**kwargs)
         settings.IM_IN_TEST_MODE = False
+        settings.CHANGELOG_WRITE_MODE = self.original_changelog_write_mode
         settings.MEDIA_ROOT = self.original_media_root
 
         try:
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from archives.tests.data import initial_data
+from series import error_codes
+from users.helpers import create_test_users
+
+
+class KeysetPaginationNegativeTest(APITestCase):
+    """
+    Negative test on keyset pagination.
+    archives/tvseries/ GET.
+    """
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        cls.series = initial_data.create_tvseries(cls.users)
+
+    def setUp(self) -> None:
+        #  Series list responses are cached.
+        cache.clear()
+        self.client.force_authenticate(user=self.user_1)
+
+    def test_garbage_cursor(self):
+        """
+        Check that malformed cursor results in 404 response.
+        """
+        response = self.client.get(reverse('tvseries'), data={'cursor': 'garbage'}, format='json')
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            response.data['detail'],
+            error_codes.INVALID_CURSOR.message,
+        )
+
+    def test_cursor_from_another_ordering(self):
+        """
+        Check that cursor issued for one ordering is not accepted with another ordering.
+        """
+        response = self.client.get(
+            reverse('tvseries'),
+            data={'pagination': 'cursor', 'limit': 1, 'ordering': 'name'},
+            format='json',
+        )
+        response = self.client.get(
+            response.data['next'].replace('ordering=name', 'ordering=rating'),
+            format='json',
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
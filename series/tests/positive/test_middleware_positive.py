@@ -1,5 +1,6 @@
 import ipaddress
 import random
+from types import SimpleNamespace
 
 import django_redis
 from django.conf import settings
@@ -12,9 +13,11 @@ from rest_framework.test import APIRequestFactory, APITestCase
 import administration.models
 from administration.helpers.initial_data import generate_blacklist_ips, \
     generate_random_ip4, generate_random_ip6
-from series import constants
+from series import constants, request_context
+from series.celery import bind_request_user, propagate_request_user, unbind_request_user
 from series.helpers.test_helpers import TestHelpers
-from series.middleware import IpBlackListMiddleware
+from series.middleware import IpBlackListMiddleware, RequestContextMiddleware
+from users.helpers import create_test_users
 
 
 class IpBlackListMiddlewarePositiveTest(TestHelpers, APITestCase):
@@ -170,3 +173,51 @@ class IpBlackListMiddlewarePositiveTest(TestHelpers, APITestCase):
         with self.assertNumQueries(0):
             IpBlackListMiddleware(get_response=SessionMiddleware)(self.request_ip4)
 
+
+class RequestContextMiddlewarePositiveTest(APITestCase):
+    """
+    Positive test on 'RequestContextMiddleware' and request user propagation to Celery tasks.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_1, *rest = create_test_users.create_users()
+
+    def setUp(self) -> None:
+        self.request = APIRequestFactory().get('/')
+        self.request.user = self.user_1
+
+    def test_request_bound_during_response(self):
+        """
+        Check that request and its user are available in context only while response is being produced.
+        """
+        def get_response(request):
+            return request_context.get_current_request(), request_context.get_current_user_id()
+
+        self.assertTupleEqual(
+            RequestContextMiddleware(get_response)(self.request),
+            (self.request, self.user_1.pk),
+        )
+        self.assertIsNone(
+            request_context.get_current_request()
+        )
+
+    def test_celery_headers(self):
+        """
+        Check that request user is passed to Celery task in headers and bound to task context.
+        """
+        headers = {}
+        with request_context.bind(request=self.request):
+            propagate_request_user(headers=headers)
+
+        task = SimpleNamespace(request=SimpleNamespace(**headers))
+        bind_request_user(task_id='1', task=task)
+        self.assertEqual(
+            request_context.get_current_user_id(),
+            self.user_1.pk,
+        )
+
+        unbind_request_user(task_id='1')
+        self.assertIsNone(
+            request_context.get_current_user_id()
+        )
@@ -0,0 +1,144 @@
+import datetime
+
+from django.core.cache import cache
+from psycopg2.extras import DateRange
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+import archives.models
+from users.helpers import create_test_users
+
+
+class KeysetPaginationPositiveTest(APITestCase):
+    """
+    Positive test on keyset pagination switched on by query parameter.
+    archives/tvseries/ GET.
+    """
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_test_users.create_users()
+        cls.user_1, cls.user_2, cls.user_3 = cls.users
+
+        #  Ratings repeat on purpose to check tie-breaking on pk. Some ratings are None.
+        cls.series = archives.models.TvSeriesModel.objects.bulk_create([
+            archives.models.TvSeriesModel(
+                entry_author=cls.user_1,
+                name=f'series {num}',
+                imdb_url=f'https://www.imdb.com/title/tt{num}/',
+                rating=(num % 4) or None,
+                translation_years=DateRange(
+                    datetime.date(2000 + num, 1, 1),
+                    datetime.date(2001 + num, 1, 1),
+                )) for num in range(11)
+        ])
+
+    def setUp(self) -> None:
+        #  Series list responses are cached.
+        cache.clear()
+        self.client.force_authenticate(user=self.user_1)
+
+    def walk_pages(self, data: dict) -> list:
+        """
+        Walks through all pages following 'next' links and returns list of pks.
+        """
+        pks = []
+        response = self.client.get(reverse('tvseries'), data=data, format='json')
+
+        while True:
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK,
+            )
+            pks += [entry['pk'] for entry in response.data['results']]
+            if response.data['next'] is None:
+                return pks
+            response = self.client.get(response.data['next'], format='json')
+
+    def test_forward_walk_with_nulls_and_ties(self):
+        """
+        Check that walking forward through all pages returns every entry exactly once in proper order.
+        """
+        expected = [
+            series.pk for series in sorted(
+                self.series,
+                key=lambda s: (s.rating is None, -(s.rating or 0), -s.pk),
+            )]
+        pks = self.walk_pages({'pagination': 'cursor', 'limit': 3, 'ordering': '-rating'})
+
+        self.assertListEqual(
+            pks,
+            expected,
+        )
+
+    def test_ordering_fields(self):
+        """
+        Check that keyset pagination works with each of ordering fields.
+        """
+        sort_keys = {
+            'name': lambda s: (s.name, s.pk),
+            'translation_years': lambda s: (s.translation_years.lower, s.pk),
+        }
+        for ordering, sort_key in sort_keys.items():
+            for descending in (False, True):
+                with self.subTest(ordering=ordering, descending=descending):
+                    pks = self.walk_pages({
+                        'pagination': 'cursor',
+                        'limit': 4,
+                        'ordering': f'-{ordering}' if descending else ordering,
+                    })
+
+                    self.assertListEqual(
+                        pks,
+                        [series.pk for series in sorted(self.series, key=sort_key, reverse=descending)],
+                    )
+
+    def test_previous_link(self):
+        """
+        Check that 'previous' link returns exactly previous page.
+        """
+        data = {'pagination': 'cursor', 'limit': 3, 'ordering': 'name'}
+        first_page = self.client.get(reverse('tvseries'), data=data, format='json')
+        second_page = self.client.get(first_page.data['next'], format='json')
+        back_to_first_page = self.client.get(second_page.data['previous'], format='json')
+
+        self.assertIsNone(
+            first_page.data['previous'],
+        )
+        self.assertListEqual(
+            [entry['pk'] for entry in back_to_first_page.data['results']],
+            [entry['pk'] for entry in first_page.data['results']],
+        )
+
+    def test_approximate_total(self):
+        """
+        Check that approximate total is shown only when requested.
+        """
+        data = {'pagination': 'cursor'}
+        response = self.client.get(reverse('tvseries'), data=data, format='json')
+
+        self.assertNotIn(
+            'approximate_total',
+            response.data,
+        )
+
+        data['approximate_total'] = 'true'
+        response = self.client.get(reverse('tvseries'), data=data, format='json')
+
+        self.assertIsInstance(
+            response.data['approximate_total'],
+            int,
+        )
+
+    def test_limit_offset_by_default(self):
+        """
+        Check that limit-offset pagination is used if keyset pagination is not requested.
+        """
+        response = self.client.get(reverse('tvseries'), data=None, format='json')
+
+        self.assertEqual(
+            response.data['count'],
+            len(self.series),
+        )
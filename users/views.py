@@ -7,7 +7,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ValidationError
-from django.db.models import F, IntegerField, Prefetch, Q, QuerySet, Subquery, Value, Window, functions
+from django.db.models import F, IntegerField, OuterRef, Prefetch, Q, QuerySet, Subquery, Value, functions
 from django.db.models.base import ModelBase
 from django.http.request import HttpRequest
 from django.utils.functional import cached_property
@@ -19,6 +19,7 @@ from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework_simplejwt import settings as simplejwt_settings, views as simplejwt_views
 
+import administration.database_functions
 import administration.serielizers
 import archives.models
 import users.database_functions
@@ -320,7 +321,7 @@ class UserOperationsHistoryView(simplejwt_views.generics.ListAPIView):
     """
     serializer_class = administration.serielizers.UserHistorySerializer
     model = serializer_class.Meta.model
-    pagination_class = pagination.FasterLimitOffsetPagination
+    pagination_class = pagination.SwitchablePagination
     filterset_class = users.filters.UserOperationsHistoryFilter
     ordering = ('-access_time',)
     ordering_fields = (
@@ -330,15 +331,28 @@ class UserOperationsHistoryView(simplejwt_views.generics.ListAPIView):
         'access_time',
     )
 
+    def get_history_scope(self) -> Q:
+        """
+        Condition that limits entries among which previous state of an object is searched.
+        """
+        return Q(user=self.request.user)
+
     def get_queryset(self):
-        prev_val = Window(
-            expression=functions.Lag('state'),
-            partition_by=('content_type_id', 'object_id'),
-            order_by=F('access_time').asc(),
+        #  Correlated subquery instead of 'Lag' window as window is computed after 'WHERE' clause,
+        #  therefore it would lose previous states on keyset pagination pages boundaries.
+        #  Backed by index on ('content_type', 'object_id', 'access_time').
+        prev_val = Subquery(
+            self.model.objects.filter(
+                self.get_history_scope(),
+                Q(access_time__lt=OuterRef('access_time')) |
+                Q(access_time=OuterRef('access_time'), pk__lt=OuterRef('pk')),
+                content_type_id=OuterRef('content_type_id'),
+                object_id=OuterRef('object_id'),
+            ).order_by('-access_time', '-pk').with_full_state().values('full_state')[:1]
         )
         self.queryset = self.model.objects.filter(user=self.request.user). \
             select_related('content_type').annotate(
-            diff=users.database_functions.JSONDiff(prev_val, 'state')
+            diff=users.database_functions.JSONDiff(prev_val, administration.database_functions.FullState())
         )
         return super().get_queryset()
 
@@ -353,6 +367,12 @@ class UserOwnedObjectsOperationsHistoryView(UserOperationsHistoryView):
         '@full_name',
     )
 
+    def get_history_scope(self) -> Q:
+        """
+        All entries of an owned object are visible to it's owner.
+        """
+        return Q()
+
     def get_queryset(self):
         deferred_fields = custom_functions.get_model_fields_subset(
             model=get_user_model(),